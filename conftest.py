@@ -1,7 +1,16 @@
 import pytest
 
+from silver.api.response_cache import get_response_cache
 from silver.fixtures.pytest_fixtures import *  # NOQA
 
 
 pytest.register_assert_rewrite('silver.tests.api.specs.document_entry')
 pytest.register_assert_rewrite('silver.tests.api.specs.utils')
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    # the cached responses would outlive the test data they were made of
+    cache = get_response_cache()
+    if cache is not None:
+        cache.clear()
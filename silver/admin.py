@@ -14,15 +14,11 @@
 
 from __future__ import absolute_import, unicode_literals
 
-import errno
 import logging
-import os
 from collections import OrderedDict, defaultdict
 from datetime import date
 from decimal import Decimal
 
-import requests
-from PyPDF2 import PdfFileReader, PdfFileMerger
 from dal import autocomplete
 from django.contrib.admin.utils import model_ngettext
 from django_fsm import TransitionNotAllowed
@@ -37,15 +33,15 @@ from django.contrib.admin.actions import delete_selected as delete_selected_
 from django.contrib.admin.models import LogEntry, CHANGE
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.db import transaction as db_transaction
 from django.db.models import BLANK_CHOICE_DASH, F, Value, fields
 from django.db.models.functions import ExtractYear, ExtractMonth, Concat
 from django.forms import ChoiceField
-from django.http import HttpResponse
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.encoding import force_str
-from django.utils.html import escape, conditional_escape
+from django.utils.html import escape, conditional_escape, format_html
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 
@@ -54,10 +50,12 @@ from silver.models import (
     Plan, MeteredFeature, Subscription, Customer, Provider,
     MeteredFeatureUnitsLog, Invoice, DocumentEntry,
     ProductCode, Proforma, BillingLog, BillingDocumentBase,
-    Transaction, PaymentMethod, Discount
+    Transaction, PaymentMethod, Discount, DocumentsExport
 )
 from silver.models.bonuses import Bonus
+from silver.models.documents.export import MAX_PDF_EXPORT_DOCUMENTS
 from silver.payment_processors.mixins import PaymentProcessorTypes
+from silver.tasks import export_documents
 from silver.utils.admin import get_admin_url
 from silver.utils.international import currencies
 from silver.utils.payments import get_payment_url
@@ -962,8 +960,8 @@ class BillingDocumentAdmin(ModelAdmin):
               'transaction_xe_date', ('state', 'is_storno'), 'total', 'get_related_document')
     readonly_fields = ('state', 'total', 'get_related_document', 'is_storno')
     inlines = [DocumentEntryInline]
-    actions = ['issue', 'pay', 'cancel', 'clone', 'download_selected_documents',
-               'mark_pdf_for_generation']
+    actions = ['issue', 'pay', 'cancel', 'clone', 'export_selected_documents_as_pdf',
+               'export_selected_documents_as_zip', 'mark_pdf_for_generation']
 
     def get_queryset(self, request):
         return super(BillingDocumentAdmin, self).get_queryset(request) \
@@ -1125,70 +1123,43 @@ class BillingDocumentAdmin(ModelAdmin):
     transactions.allow_tags = True
     transactions.admin_order_field = '_total_in_transaction_currency'
 
-    def _download_pdf(self, url, base_path):
-        local_file_path = os.path.join(base_path, 'billing-temp-document.pdf')
-        response = requests.get(url)
-        response.encoding = 'utf-8'
+    def _export_selected_documents(self, request, queryset, export_format):
+        document_ids = list(queryset.filter(
+            state__in=[BillingDocumentBase.STATES.ISSUED,
+                       BillingDocumentBase.STATES.CANCELED,
+                       BillingDocumentBase.STATES.PAID]
+        ).order_by('id').values_list('id', flat=True))
 
-        with open(local_file_path, 'wb') as out_file:
-            content = response.content
-            pdf_header_pos = content.find(b'%PDF-')
-            if pdf_header_pos > 0:
-                content = content[pdf_header_pos:]
-            out_file.write(content)
-            out_file.flush()
+        if (export_format == DocumentsExport.FORMATS.PDF and
+                len(document_ids) > MAX_PDF_EXPORT_DOCUMENTS):
+            self.message_user(
+                request,
+                'At most {} documents can be exported as a merged PDF. Export them as ZIP '
+                'instead.'.format(MAX_PDF_EXPORT_DOCUMENTS),
+                level=messages.ERROR
+            )
+            return
 
-        return local_file_path
+        export = DocumentsExport.objects.create(export_format=export_format,
+                                                document_ids=document_ids)
 
-    def download_selected_documents(self, request, queryset):
-        # NOTE (important): this works only if the pdf is not stored on local
-        # disk as it is fetched via HTTP
-        now = timezone.now()
+        db_transaction.on_commit(lambda: export_documents.delay(export.id))
 
-        queryset = queryset.filter(
-            state__in=[BillingDocumentBase.STATES.ISSUED,
-                       BillingDocumentBase.STATES.CANCELED,
-                       BillingDocumentBase.STATES.PAID]
-        )
+        self.message_user(request, mark_safe(
+            'The export of {count} document(s) has been scheduled. It will be available '
+            'for download at {url}.'.format(count=len(document_ids),
+                                            url=get_admin_url(export, text='this link'))
+        ))
 
-        base_path = '/tmp'
-        merger = PdfFileMerger()
-        for document in queryset:
-            if document.pdf:
-                local_file_path = self._download_pdf(document.pdf.url, base_path)
-                try:
-                    reader = PdfFileReader(open(local_file_path, 'rb'))
-                    merger.append(reader)
-                    logging_ctx = {
-                        'number': document.series_number,
-                        'status': 'ok'
-                    }
-                except Exception as e:
-                    logging_ctx = {
-                        'number': document.series_number,
-                        'status': 'failed',
-                        'error': e
-                    }
-
-                logger.debug('Admin aggregate PDF generation: %s', logging_ctx)
-
-                try:
-                    os.remove(local_file_path)
-                except OSError as e:
-                    if e.errno != errno.ENOENT:
-                        raise
-
-        response = HttpResponse(content_type='application/pdf')
-        filename = 'Billing-Documents-{now}.pdf'.format(now=now)
-        content_disposition = 'attachment; filename="{fn}'.format(fn=filename)
-        response['Content-Disposition'] = content_disposition
-
-        merger.write(response)
-        merger.close()
-
-        return response
-
-    download_selected_documents.short_description = 'Download selected documents'
+    def export_selected_documents_as_pdf(self, request, queryset):
+        self._export_selected_documents(request, queryset, DocumentsExport.FORMATS.PDF)
+
+    export_selected_documents_as_pdf.short_description = 'Export selected documents as PDF'
+
+    def export_selected_documents_as_zip(self, request, queryset):
+        self._export_selected_documents(request, queryset, DocumentsExport.FORMATS.ZIP)
+
+    export_selected_documents_as_zip.short_description = 'Export selected documents as ZIP'
 
     def get_related_document(self, obj):
         return obj.related_document.admin_change_url if obj.related_document else None
@@ -1572,6 +1543,27 @@ class PaymentMethodAdmin(ModelAdmin):
                      'customer__company']
 
 
+class DocumentsExportAdmin(ModelAdmin):
+    list_display = ('__str__', 'export_format', 'state', 'exported_count', 'failed_count',
+                    'created_at', 'finished_at', 'download')
+    list_filter = ('export_format', 'state')
+    readonly_fields = ('export_format', 'state', 'exported_count', 'failed_count',
+                       'created_at', 'finished_at', 'download')
+    exclude = ('document_ids', )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def download(self, obj):
+        if not obj.url:
+            return None
+
+        return format_html('<a href="{}">Download</a>', obj.url)
+
+
 class MeteredFeatureAdmin(ModelAdmin):
     list_display = ["__str__", "product_code"]
     search_fields = ["name", "unit", "product_code__value"]
@@ -1590,3 +1582,4 @@ site.register(Discount, DiscountAdmin)
 site.register(Bonus, BonusAdmin)
 site.register(ProductCode)
 site.register(MeteredFeature, MeteredFeatureAdmin)
+site.register(DocumentsExport, DocumentsExportAdmin)
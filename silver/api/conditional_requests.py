@@ -0,0 +1,141 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+HTTP conditional requests.
+
+The GET responses carry an `ETag` (and, when known, a `Last-Modified`) header, and the requests
+made with the matching `If-None-Match` (or `If-Modified-Since`) header are answered with an
+empty 304 Not Modified response, so the clients polling for changes only pay for the changes.
+"""
+
+from __future__ import absolute_import
+
+import hashlib
+import json
+from calendar import timegm
+
+from django.utils.cache import get_conditional_response
+from django.utils.encoding import force_str
+from django.utils.http import http_date
+
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ConditionalRequestsViewMixin(object):
+    """
+    Computes the validators of the GET responses from the `last_modified_field` of the requested
+    objects, without serializing them: from the object itself for the detail views, and from the
+    page's objects and links for the list views (which don't get a Last-Modified header, since
+    the objects removed from a page don't leave a modification time behind).
+
+    The views whose representation changes without the `last_modified_field` being updated (e.g.
+    depending on the current date) set it to None, in which case the ETag is computed from the
+    serialized data, which only saves the bandwidth. The same goes for the requests expanding
+    related objects (see SparseFieldsetsViewMixin), whose changes aren't tracked by the
+    `last_modified_field` of the requested objects.
+    """
+
+    last_modified_field = 'updated_at'
+
+    def uses_content_etag(self):
+        if not self.last_modified_field:
+            return True
+
+        get_expanded_fields = getattr(self, 'get_expanded_fields', None)
+        return bool(get_expanded_fields and get_expanded_fields())
+
+    def is_detail_request(self):
+        return (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+
+    def get_validators_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+
+        if self.is_detail_request():
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+        return queryset
+
+    def get_etag(self, *version):
+        # the representation also depends on the URL (pagination, filters, sparse fieldsets)
+        # and on the renderer
+        request = self.request
+        parts = [request.build_absolute_uri(), request.accepted_media_type] + list(version)
+
+        return '"%s"' % hashlib.md5(
+            ' '.join(force_str(part) for part in parts).encode('utf-8')
+        ).hexdigest()
+
+    def get_validators(self):
+        queryset = self.get_validators_queryset()
+
+        try:
+            if self.is_detail_request():
+                last_modified = queryset.values_list(self.last_modified_field, flat=True).first()
+                if last_modified is None:
+                    return None, None
+
+                return self.get_etag(last_modified.isoformat()), last_modified
+
+            # dicts, since the cursor paginators read the ordering fields' values by name
+            versions = queryset.values('id', self.last_modified_field)
+            page = self.paginate_queryset(versions)
+        except (TypeError, ValueError):
+            return None, None
+
+        if page is None:
+            return self.get_etag([sorted(version.items()) for version in versions]), None
+
+        # the pagination links (and counts) are part of the response as well
+        headers = sorted(self.get_paginated_response([]).items())
+
+        return self.get_etag([sorted(version.items()) for version in page], headers), None
+
+    def get_content_etag(self, response):
+        if response.status_code != status.HTTP_200_OK:
+            return None
+
+        return self.get_etag(json.dumps(response.data, cls=JSONEncoder, sort_keys=True),
+                             response.get('Link'))
+
+    def get(self, request, *args, **kwargs):
+        response = None
+        if self.uses_content_etag():
+            response = super(ConditionalRequestsViewMixin, self).get(request, *args, **kwargs)
+            etag, last_modified = self.get_content_etag(response), None
+        else:
+            etag, last_modified = self.get_validators()
+
+        if etag is None:
+            return response or super(ConditionalRequestsViewMixin, self).get(request, *args,
+                                                                             **kwargs)
+
+        last_modified_timestamp = (timegm(last_modified.utctimetuple())
+                                   if last_modified else None)
+        conditional_response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified_timestamp
+        )
+        if conditional_response is not None:
+            response = conditional_response
+        elif response is None:
+            response = super(ConditionalRequestsViewMixin, self).get(request, *args, **kwargs)
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            if last_modified_timestamp is not None:
+                response['Last-Modified'] = http_date(last_modified_timestamp)
+
+        return response
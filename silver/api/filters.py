@@ -25,11 +25,14 @@ except ImportError:
     _df_version = 1.1
 
 
-from django_filters import FilterSet, CharFilter, BooleanFilter, DateFilter, NumberFilter
+from django_filters import (
+    FilterSet, CharFilter, BooleanFilter, DateFilter, NumberFilter, IsoDateTimeFilter
+)
 
 from silver.models import (MeteredFeature, Subscription, Customer, Provider,
                            Plan, Invoice, Proforma, Transaction, PaymentMethod,
-                           BillingDocumentBase, Bonus, Discount)
+                           BillingDocumentBase, Bonus, Discount, MeteredFeatureUnitsLog,
+                           Change)
 
 if _df_version >= 2:
     class MultipleCharFilter(BaseInFilter, CharFilter):
@@ -62,6 +65,16 @@ class SubscriptionFilter(FilterSet):
         fields = ['plan', 'reference', 'state']
 
 
+class MFUnitsLogFilter(FilterSet):
+    start_datetime = IsoDateTimeFilter(field_name='start_datetime', lookup_expr='gte')
+    end_datetime = IsoDateTimeFilter(field_name='end_datetime', lookup_expr='lte')
+    annotation = MultipleCharFilter(field_name='annotation')
+
+    class Meta:
+        model = MeteredFeatureUnitsLog
+        fields = ['start_datetime', 'end_datetime', 'annotation']
+
+
 class CustomerFilter(FilterSet):
     active = BooleanFilter(field_name='is_active', lookup_expr='iexact')
     email = CharFilter(field_name='email', lookup_expr='icontains')
@@ -236,3 +249,12 @@ class PaymentMethodFilter(FilterSet):
     class Meta:
         model = PaymentMethod
         fields = ['processor', 'canceled', 'verified']
+
+
+class ChangeFilter(FilterSet):
+    resource = MultipleCharFilter(field_name='resource')
+    action = MultipleCharFilter(field_name='action')
+
+    class Meta:
+        model = Change
+        fields = ('resource', 'action')
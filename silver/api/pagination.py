@@ -14,7 +14,9 @@
 
 from __future__ import absolute_import
 
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import (BasePagination, PageNumberPagination, CursorPagination,
+                                       _positive_int)
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 from rest_framework.utils.urls import replace_query_param, remove_query_param
@@ -63,3 +65,143 @@ class LinkHeaderPagination(PageNumberPagination):
         headers = {'Link': link} if link else {}
 
         return Response(data, headers=headers)
+
+
+class LinkHeaderCursorPagination(CursorPagination):
+    """
+    Cursor based pagination, exposing the next and previous pages through the Link header
+    like LinkHeaderPagination does. Pages are fetched by seeking on the ordering fields, so
+    neither a COUNT(*) nor an OFFSET scan over the whole collection is needed.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 30
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('id', )
+
+    def get_paginated_response(self, data):
+        next_url = self.get_next_link()
+        previous_url = self.get_previous_link()
+
+        links = []
+        if next_url is not None:
+            links.append('<{next_url}>; rel="next"'.format(next_url=next_url))
+        if previous_url is not None:
+            links.append('<{previous_url}>; rel="prev"'.format(previous_url=previous_url))
+
+        headers = {'Link': ', '.join(links)} if links else {}
+
+        return Response(data, headers=headers)
+
+
+class KeysetCursorPagination(LinkHeaderCursorPagination):
+    """
+    Cursor pagination over the unique, indexed `id` column. The ordering requested through the
+    `ordering` query parameter is ignored, since the pages can only be seeked on `id`.
+    """
+
+    ordering = ('-id', )
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+
+class LargeCollectionPagination(LinkHeaderPagination):
+    """
+    Page number pagination for the collections which can grow large (billing documents,
+    transactions). The clients walking through the whole collection can switch to cursor
+    pagination, through `?pagination=cursor`, which doesn't count the objects (unless
+    `?count=true` is given as well, in which case the count is returned in the
+    `X-Total-Count` header) and whose pages cost the same no matter how deep they are.
+    """
+
+    pagination_query_param = 'pagination'
+    count_query_param = 'count'
+    cursor_pagination_class = KeysetCursorPagination
+
+    cursor_paginator = None
+    count = None
+
+    def uses_cursor(self, request):
+        return (request.query_params.get(self.pagination_query_param) == 'cursor' or
+                self.cursor_pagination_class.cursor_query_param in request.query_params)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.uses_cursor(request):
+            return super(LargeCollectionPagination, self).paginate_queryset(
+                queryset, request, view=view
+            )
+
+        self.request = request
+        self.cursor_paginator = self.cursor_pagination_class()
+
+        if request.query_params.get(self.count_query_param) in ('true', '1'):
+            self.count = queryset.count()
+
+        return self.cursor_paginator.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is None:
+            return super(LargeCollectionPagination, self).get_paginated_response(data)
+
+        response = self.cursor_paginator.get_paginated_response(data)
+        if self.count is not None:
+            response['X-Total-Count'] = str(self.count)
+
+        return response
+
+
+class SincePagination(BasePagination):
+    """
+    Pagination for the append-only collections, whose pages are made of the objects following
+    the one whose id is given through the `since` query parameter. The Link header always holds
+    the next page, which is where the clients resume from once they went through the objects.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 30
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    since_query_param = 'since'
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(request.query_params[self.page_size_query_param],
+                                 strict=True, cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_since(self, request):
+        try:
+            return _positive_int(request.query_params.get(self.since_query_param, 0))
+        except ValueError:
+            raise ValidationError({self.since_query_param: 'A positive integer is required.'})
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.since = self.get_since(request)
+        self.page = list(
+            queryset.filter(id__gt=self.since).order_by('id')[:self.get_page_size(request)]
+        )
+
+        return self.page
+
+    def get_next_link(self):
+        since = self.page[-1].id if self.page else self.since
+        return replace_query_param(self.request.build_absolute_uri(), self.since_query_param,
+                                   since)
+
+    def get_paginated_response(self, data):
+        return Response(data, headers={
+            'Link': '<{next_url}>; rel="next"'.format(next_url=self.get_next_link())
+        })
+
+
+class MFUnitsLogPagination(LinkHeaderCursorPagination):
+    """
+    The logs are paginated by their (unique) ids, which follow the order they were logged in.
+    The cursors are made of the first ordering field only, so ordering by the (non unique)
+    `start_datetime` would page through the logs sharing it by offset, skipping or repeating
+    them as logs are added concurrently.
+    """
+
+    max_page_size = 1000
@@ -0,0 +1,177 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Response caching for the read-mostly endpoints (plans, metered features, providers, product
+codes and payment processors).
+
+The rendered GET responses are stored in the cache selected through the
+`SILVER_RESPONSE_CACHE` setting (none, unless set), under keys made of the current versions
+of the models (or settings) they are made of. Saving or deleting such an object gives its model
+a new version, so the responses made of the old one aren't read anymore and expire on their
+own. The cache hits don't touch the database.
+
+The versions are stored in the same cache, so it has to be shared between all of Silver's
+processes, otherwise they would keep serving the responses invalidated by the others.
+"""
+
+from __future__ import absolute_import
+
+import hashlib
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction as db_transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.http import HttpResponse
+from django.utils.encoding import force_str
+
+from rest_framework import status
+
+
+# The models and settings the cached responses can be made of.
+CACHE_DEPENDENCIES = frozenset([
+    'silver.Plan', 'silver.MeteredFeature', 'silver.Provider', 'silver.ProductCode',
+    'PAYMENT_PROCESSORS',
+])
+
+DEFAULT_CACHE_TIMEOUT = 300
+
+
+def get_response_cache():
+    alias = getattr(settings, 'SILVER_RESPONSE_CACHE', None)
+    return caches[alias] if alias else None
+
+
+def _version_key(dependency):
+    return 'silver:response-version:%s' % dependency
+
+
+def get_versions(cache, dependencies):
+    keys = [_version_key(dependency) for dependency in dependencies]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # a random version, so that the responses cached under an evicted version don't
+            # come back to life
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def _set_new_version(dependency):
+    cache = get_response_cache()
+    if cache is not None:
+        cache.set(_version_key(dependency), uuid.uuid4().hex, timeout=None)
+
+
+def invalidate(dependency):
+    if dependency not in CACHE_DEPENDENCIES:
+        return
+
+    _set_new_version(dependency)
+    # once more after the commit, since the responses cached in the meantime were made of
+    # the data which wasn't committed yet
+    db_transaction.on_commit(lambda: _set_new_version(dependency))
+
+
+def invalidate_model_responses(sender, **kwargs):
+    invalidate(sender._meta.label)
+
+
+def invalidate_relation_responses(sender, instance, model, **kwargs):
+    invalidate(instance._meta.label)
+    invalidate(model._meta.label)
+
+
+def invalidate_setting_responses(setting, **kwargs):
+    invalidate(setting)
+
+
+def connect_receivers():
+    """
+    Connects the receivers invalidating the cached responses to the signals sent for the
+    models the responses are made of (and their many-to-many relations). Called once the apps
+    are ready.
+    """
+    for dependency in CACHE_DEPENDENCIES:
+        if '.' not in dependency:
+            continue
+
+        model = apps.get_model(dependency)
+        post_save.connect(invalidate_model_responses, sender=model,
+                          dispatch_uid='silver-response-cache-save-%s' % dependency)
+        post_delete.connect(invalidate_model_responses, sender=model,
+                            dispatch_uid='silver-response-cache-delete-%s' % dependency)
+
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+            m2m_changed.connect(invalidate_relation_responses, sender=through,
+                                dispatch_uid='silver-response-cache-m2m-%s' % through._meta.label)
+
+    setting_changed.connect(invalidate_setting_responses,
+                            dispatch_uid='silver-response-cache-setting')
+
+
+class CachedResponseViewMixin(object):
+    """
+    Serves the GET requests from the response cache. The `cache_dependencies` are the models
+    (as app labels) and settings which the responses are made of, all of which need to be listed
+    in CACHE_DEPENDENCIES.
+    """
+
+    cache_dependencies = ()
+
+    def get_response_cache_key(self, cache):
+        request = self.request
+        parts = ([request.build_absolute_uri(), request.accepted_media_type] +
+                 get_versions(cache, self.cache_dependencies))
+
+        return 'silver:response:%s' % hashlib.md5(
+            ' '.join(force_str(part) for part in parts).encode('utf-8')
+        ).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        cache = get_response_cache()
+        if cache is None:
+            return super(CachedResponseViewMixin, self).get(request, *args, **kwargs)
+
+        key = self.get_response_cache_key(cache)
+        cached_response = cache.get(key)
+        if cached_response is not None:
+            content, headers = cached_response
+
+            response = HttpResponse(content)
+            for header, value in headers:
+                response[header] = value
+
+            return response
+
+        response = super(CachedResponseViewMixin, self).get(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+        timeout = getattr(settings, 'SILVER_RESPONSE_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT)
+
+        def cache_response(response):
+            cache.set(key, (response.content, list(response.items())), timeout=timeout)
+
+        response.add_post_render_callback(cache_response)
+
+        return response
@@ -21,10 +21,12 @@ from rest_framework.relations import HyperlinkedRelatedField
 
 from silver.api.serializers.common import CustomerUrl
 from silver.api.serializers.subscriptions_serializers import SubscriptionUrl
+from silver.api.sparse_fieldsets import SparseFieldsetsSerializerMixin
 from silver.models import Provider, Customer
 
 
-class ProviderSerializer(serializers.HyperlinkedModelSerializer):
+class ProviderSerializer(SparseFieldsetsSerializerMixin,
+                         serializers.HyperlinkedModelSerializer):
     meta = JSONField(required=False)
 
     class Meta:
@@ -75,7 +77,8 @@ class ProviderUrl(HyperlinkedRelatedField):
         return False
 
 
-class CustomerSerializer(serializers.HyperlinkedModelSerializer):
+class CustomerSerializer(SparseFieldsetsSerializerMixin,
+                         serializers.HyperlinkedModelSerializer):
     subscriptions = SubscriptionUrl(view_name='subscription-detail', many=True,
                                     read_only=True)
     payment_methods = serializers.HyperlinkedIdentityField(
@@ -97,3 +100,7 @@ class CustomerSerializer(serializers.HyperlinkedModelSerializer):
                   'sales_tax_number', 'sales_tax_name', 'sales_tax_percent',
                   'consolidated_billing', 'subscriptions', 'payment_methods',
                   'transactions', 'meta')
+
+    prefetched_fields = {
+        'subscriptions': ('subscriptions', ),
+    }
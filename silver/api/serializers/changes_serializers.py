@@ -0,0 +1,35 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+from rest_framework import serializers
+
+from silver.models import Change
+
+
+class ChangeSerializer(serializers.ModelSerializer):
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Change
+        fields = read_only_fields = ('id', 'resource', 'object_id', 'action', 'url',
+                                     'created_at')
+
+    def get_url(self, change):
+        if not change.path:
+            return None
+
+        request = self.context.get('request')
+        return request.build_absolute_uri(change.path) if request else change.path
@@ -21,6 +21,7 @@ from rest_framework.reverse import reverse
 from rest_framework.relations import HyperlinkedRelatedField
 
 from silver.api.serializers.product_codes_serializer import ProductCodeRelatedField
+from silver.api.sparse_fieldsets import SparseFieldsetsSerializerMixin
 from silver.models import MeteredFeature
 
 
@@ -47,7 +48,7 @@ class PaymentMethodTransactionsUrl(serializers.HyperlinkedIdentityField):
                             request=request, format=format)
 
 
-class MeteredFeatureSerializer(serializers.ModelSerializer):
+class MeteredFeatureSerializer(SparseFieldsetsSerializerMixin, serializers.ModelSerializer):
     product_code = ProductCodeRelatedField()
 
     class Meta:
@@ -15,12 +15,16 @@
 from __future__ import absolute_import
 
 from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch, Q
 from rest_framework import serializers
 from rest_framework.fields import JSONField, DecimalField
 
 from silver.api.serializers.common import CustomerUrl, PDFUrl
 from silver.api.serializers.transaction_serializers import TransactionSerializer
-from silver.models import DocumentEntry, Customer, Invoice, Proforma, BillingDocumentBase
+from silver.api.sparse_fieldsets import SparseFieldsetsSerializerMixin
+from silver.models import (
+    DocumentEntry, Customer, Invoice, Proforma, BillingDocumentBase, Transaction
+)
 from silver.utils.serializers import AutoCleanSerializerMixin
 
 
@@ -46,6 +50,124 @@ class DocumentEntrySerializer(AutoCleanSerializerMixin,
         }
 
 
+def clean_document_entry(entry):
+    # the document is known to exist and the entries have no unique fields besides their
+    # ids, so the entries are cleaned without querying the database
+    entry.full_clean(exclude=['invoice', 'proforma'], validate_unique=False)
+
+
+def build_document_entries(document, entries_data):
+    """
+    Builds the cleaned entries of the document out of the validated entries data, ready to be
+    inserted at once through bulk_create.
+    """
+
+    entries = []
+    for entry_data in entries_data:
+        entry = DocumentEntry(**entry_data)
+        setattr(entry, document.kind, document)
+        clean_document_entry(entry)
+
+        entries.append(entry)
+
+    return entries
+
+
+class DocumentEntryUpsertSerializer(DocumentEntrySerializer):
+    """
+    An entry which is created, or which replaces the document's entry with the given id.
+    """
+
+    id = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        # the id is checked against the document's entries, not by the model's validation
+        entry_id = attrs.pop('id', None)
+
+        attrs = super(DocumentEntryUpsertSerializer, self).validate(attrs)
+        if entry_id is not None:
+            attrs['id'] = entry_id
+
+        return attrs
+
+
+class DocumentEntriesSerializer(serializers.Serializer):
+    """
+    Creates, replaces and deletes many entries of a draft document at once. All the entries are
+    validated before any of them is written, and they are written through a single bulk insert,
+    bulk update and delete each.
+    """
+
+    entries = DocumentEntryUpsertSerializer(many=True, required=False)
+    delete = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    def get_document_entries(self):
+        if not hasattr(self, '_document_entries'):
+            self._document_entries = {
+                entry.pk: entry for entry in
+                DocumentEntry.objects.filter(**{self.instance.kind: self.instance})
+            }
+
+        return self._document_entries
+
+    def validate(self, attrs):
+        replaced_ids = [entry['id'] for entry in attrs.get('entries', []) if 'id' in entry]
+        deleted_ids = attrs.get('delete', [])
+
+        referenced_ids = replaced_ids + deleted_ids
+        if len(set(referenced_ids)) != len(referenced_ids):
+            raise serializers.ValidationError(
+                "An entry can be replaced or deleted only once per request."
+            )
+
+        unknown_ids = sorted(set(referenced_ids) - set(self.get_document_entries()))
+        if unknown_ids:
+            raise serializers.ValidationError(
+                "The {kind} has no entries with the ids: {ids}.".format(
+                    kind=self.instance.kind, ids=', '.join(str(pk) for pk in unknown_ids)
+                )
+            )
+
+        return attrs
+
+    def update(self, document, validated_data):
+        document_entries = self.get_document_entries()
+
+        created_entries_data = []
+        replaced_entries = []
+        replaced_fields = set()
+        for entry_data in validated_data.get('entries', []):
+            entry_id = entry_data.pop('id', None)
+            if entry_id is None:
+                created_entries_data.append(entry_data)
+                continue
+
+            entry = document_entries[entry_id]
+            for field, value in entry_data.items():
+                setattr(entry, field, value)
+            clean_document_entry(entry)
+
+            replaced_entries.append(entry)
+            replaced_fields.update(entry_data)
+
+        deleted_ids = validated_data.get('delete', [])
+        if deleted_ids:
+            DocumentEntry.objects.filter(pk__in=deleted_ids).delete()
+
+        if replaced_entries:
+            DocumentEntry.objects.bulk_update(replaced_entries, sorted(replaced_fields))
+
+        if created_entries_data:
+            DocumentEntry.objects.bulk_create(
+                build_document_entries(document, created_entries_data)
+            )
+
+        # the document is touched once, for all of its changed entries
+        BillingDocumentBase.objects.touch([document])
+
+        return document
+
+
 class DocumentUrl(serializers.HyperlinkedIdentityField):
     def __init__(self, proforma_view_name, invoice_view_name, *args, **kwargs):
         # the view_name is required on HIF init, but we only know what it will
@@ -73,7 +195,41 @@ class DocumentUrl(serializers.HyperlinkedIdentityField):
                             request=request, format=format)
 
 
-class DocumentSerializer(serializers.HyperlinkedModelSerializer):
+def prefetch_documents_transactions(documents):
+    """
+    Fetches the transactions of the given invoices and proformas, along with their payment
+    methods, through a single query (instead of a query per related name), and stores them in
+    the documents' `prefetched_transactions`.
+    """
+
+    documents_kinds = {document.pk: document.kind for document in documents}
+    documents_transactions = {document.pk: [] for document in documents}
+
+    transactions = Transaction.objects.filter(
+        Q(invoice__in=documents_kinds.keys()) | Q(proforma__in=documents_kinds.keys())
+    ).select_related('payment_method')
+
+    for transaction in transactions:
+        if documents_kinds.get(transaction.invoice_id) == 'invoice':
+            documents_transactions[transaction.invoice_id].append(transaction)
+        if documents_kinds.get(transaction.proforma_id) == 'proforma':
+            documents_transactions[transaction.proforma_id].append(transaction)
+
+    for document in documents:
+        document.prefetched_transactions = documents_transactions[document.pk]
+
+
+class DocumentListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        documents = list(data)
+        if documents and 'transactions' in self.child.fields:
+            prefetch_documents_transactions(documents)
+
+        return super(DocumentListSerializer, self).to_representation(documents)
+
+
+class DocumentSerializer(SparseFieldsetsSerializerMixin,
+                         serializers.HyperlinkedModelSerializer):
     """
         A read-only serializers for Proformas and Invoices
     """
@@ -86,7 +242,9 @@ class DocumentSerializer(serializers.HyperlinkedModelSerializer):
     transactions = serializers.SerializerMethodField()
 
     def get_transactions(self, document):
-        if document.kind == 'invoice':
+        if hasattr(document, 'prefetched_transactions'):
+            transactions = document.prefetched_transactions
+        elif document.kind == 'invoice':
             transactions = document.invoice_transactions.all()
         elif document.kind == 'proforma':
             transactions = document.proforma_transactions.all()
@@ -109,9 +267,25 @@ class DocumentSerializer(serializers.HyperlinkedModelSerializer):
                   'transaction_currency', 'currency', 'state', 'total',
                   'total_in_transaction_currency', 'pdf_url', 'transactions')
         read_only_fields = fields
-
-
-class InvoiceSerializer(AutoCleanSerializerMixin,
+        # the transactions of the listed documents are fetched by the list serializer
+        list_serializer_class = DocumentListSerializer
+
+    related_fields = {
+        'customer': ('customer', ),
+        'pdf_url': ('pdf', ),
+        'transactions': ('customer', 'provider'),
+    }
+    prefetched_fields = {
+        'total': ('invoice_entries', 'proforma_entries'),
+        'total_in_transaction_currency': ('invoice_entries', 'proforma_entries'),
+    }
+    expandable_fields = {
+        'customer': 'silver.api.serializers.billing_entities_serializers.CustomerSerializer',
+        'provider': 'silver.api.serializers.billing_entities_serializers.ProviderSerializer',
+    }
+
+
+class InvoiceSerializer(SparseFieldsetsSerializerMixin, AutoCleanSerializerMixin,
                         serializers.HyperlinkedModelSerializer):
     invoice_entries = DocumentEntrySerializer(many=True, required=False)
     pdf_url = PDFUrl(view_name='pdf', source='*', read_only=True)
@@ -144,6 +318,26 @@ class InvoiceSerializer(AutoCleanSerializerMixin,
             'proforma': {'source': 'related_document', 'view_name': 'proforma-detail'}
         }
 
+    related_fields = {
+        'customer': ('customer', ),
+        'pdf_url': ('pdf', ),
+        'transactions': ('provider', ),
+    }
+    prefetched_fields = {
+        'invoice_entries': ('invoice_entries__product_code', ),
+        'transactions': (Prefetch(
+            'invoice_transactions',
+            queryset=Transaction.objects.select_related('payment_method__customer')
+        ), ),
+        'total': ('invoice_entries', ),
+        'total_in_transaction_currency': ('invoice_entries', ),
+    }
+    deferred_fields = ('archived_customer', 'archived_provider')
+    expandable_fields = {
+        'customer': 'silver.api.serializers.billing_entities_serializers.CustomerSerializer',
+        'provider': 'silver.api.serializers.billing_entities_serializers.ProviderSerializer',
+    }
+
     def create(self, validated_data):
         entries = validated_data.pop('invoice_entries', [])
 
@@ -151,13 +345,7 @@ class InvoiceSerializer(AutoCleanSerializerMixin,
         invoice = Invoice.objects.create(**validated_data)
 
         # Add the invoice entries
-        for entry in entries:
-            entry_dict = dict()
-            entry_dict['invoice'] = invoice
-            for field in entry.items():
-                entry_dict[field[0]] = field[1]
-
-            DocumentEntry.objects.create(**entry_dict)
+        DocumentEntry.objects.bulk_create(build_document_entries(invoice, entries))
 
         return invoice
 
@@ -195,7 +383,7 @@ class InvoiceSerializer(AutoCleanSerializerMixin,
         return data
 
 
-class ProformaSerializer(AutoCleanSerializerMixin,
+class ProformaSerializer(SparseFieldsetsSerializerMixin, AutoCleanSerializerMixin,
                          serializers.HyperlinkedModelSerializer):
     proforma_entries = DocumentEntrySerializer(many=True, required=False)
     pdf_url = PDFUrl(view_name='pdf', source='*', read_only=True)
@@ -221,18 +409,33 @@ class ProformaSerializer(AutoCleanSerializerMixin,
             'invoice': {'source': 'related_document', 'view_name': 'invoice-detail'},
         }
 
+    related_fields = {
+        'customer': ('customer', ),
+        'pdf_url': ('pdf', ),
+        'transactions': ('provider', ),
+    }
+    prefetched_fields = {
+        'proforma_entries': ('proforma_entries__product_code', ),
+        'transactions': (Prefetch(
+            'proforma_transactions',
+            queryset=Transaction.objects.select_related('payment_method__customer',
+                                                        'invoice__provider')
+        ), ),
+        'total': ('proforma_entries', ),
+        'total_in_transaction_currency': ('proforma_entries', ),
+    }
+    deferred_fields = ('archived_customer', 'archived_provider')
+    expandable_fields = {
+        'customer': 'silver.api.serializers.billing_entities_serializers.CustomerSerializer',
+        'provider': 'silver.api.serializers.billing_entities_serializers.ProviderSerializer',
+    }
+
     def create(self, validated_data):
         entries = validated_data.pop('proforma_entries', [])
 
         proforma = Proforma.objects.create(**validated_data)
 
-        for entry in entries:
-            entry_dict = dict()
-            entry_dict['proforma'] = proforma
-            for field in entry.items():
-                entry_dict[field[0]] = field[1]
-
-            DocumentEntry.objects.create(**entry_dict)
+        DocumentEntry.objects.bulk_create(build_document_entries(proforma, entries))
 
         return proforma
 
@@ -20,6 +20,7 @@ from rest_framework import serializers
 
 from silver import payment_processors
 from silver.api.serializers.common import CustomerUrl, PaymentMethodTransactionsUrl
+from silver.api.sparse_fieldsets import SparseFieldsetsSerializerMixin
 from silver.models import PaymentMethod
 
 
@@ -52,7 +53,8 @@ class PaymentMethodUrl(serializers.HyperlinkedRelatedField):
         return self.queryset.get(id=view_kwargs['payment_method_id'])
 
 
-class PaymentMethodSerializer(serializers.HyperlinkedModelSerializer):
+class PaymentMethodSerializer(SparseFieldsetsSerializerMixin,
+                              serializers.HyperlinkedModelSerializer):
     url = PaymentMethodUrl(view_name='payment-method-detail', source="*",
                            read_only=True)
     transactions = PaymentMethodTransactionsUrl(
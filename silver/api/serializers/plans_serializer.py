@@ -20,10 +20,11 @@ from rest_framework import serializers
 
 from silver.api.serializers.common import MeteredFeatureSerializer
 from silver.api.serializers.product_codes_serializer import ProductCodeRelatedField
+from silver.api.sparse_fieldsets import SparseFieldsetsSerializerMixin
 from silver.models import Provider, Plan, MeteredFeature
 
 
-class PlanSerializer(serializers.HyperlinkedModelSerializer):
+class PlanSerializer(SparseFieldsetsSerializerMixin, serializers.HyperlinkedModelSerializer):
     metered_features = MeteredFeatureSerializer(
         required=False, many=True
     )
@@ -39,6 +40,13 @@ class PlanSerializer(serializers.HyperlinkedModelSerializer):
                   'currency', 'trial_period_days', 'generate_after', 'enabled',
                   'private', 'product_code', 'metered_features', 'provider')
 
+    related_fields = {
+        'product_code': ('product_code', ),
+    }
+    prefetched_fields = {
+        'metered_features': ('metered_features__product_code', ),
+    }
+
     def validate_metered_features(self, value):
         metered_features = []
         for mf_data in value:
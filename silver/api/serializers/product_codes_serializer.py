@@ -18,6 +18,7 @@ from django.core.exceptions import ObjectDoesNotExist
 
 from rest_framework import serializers
 
+from silver.api.sparse_fieldsets import SparseFieldsetsSerializerMixin
 from silver.models import ProductCode
 
 
@@ -35,7 +36,8 @@ class ProductCodeRelatedField(serializers.SlugRelatedField):
             self.fail('invalid')
 
 
-class ProductCodeSerializer(serializers.HyperlinkedModelSerializer):
+class ProductCodeSerializer(SparseFieldsetsSerializerMixin,
+                            serializers.HyperlinkedModelSerializer):
     class Meta:
         model = ProductCode
         fields = ('url', 'value')
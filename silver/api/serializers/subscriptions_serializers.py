@@ -23,7 +23,8 @@ from silver.api.serializers.bonus_serializer import SubscriptionBonusSerializer
 from silver.api.serializers.common import CustomerUrl, MeteredFeatureSerializer
 from silver.api.serializers.discount_serializer import SubscriptionDiscountSerializer
 from silver.api.serializers.plans_serializer import PlanSerializer
-from silver.models import MeteredFeatureUnitsLog, Subscription, Customer
+from silver.api.sparse_fieldsets import SparseFieldsetsSerializerMixin
+from silver.models import Bonus, Discount, MeteredFeatureUnitsLog, Subscription, Customer
 
 
 class MFUnitsLogUrl(serializers.HyperlinkedRelatedField):
@@ -56,6 +57,13 @@ class MFUnitsLogSerializer(serializers.HyperlinkedModelSerializer):
         fields = ('consumed_units', 'start_datetime', 'end_datetime', 'annotation')
 
 
+class MFUnitsLogBucketSerializer(serializers.Serializer):
+    start_datetime = serializers.DateTimeField(read_only=True)
+    end_datetime = serializers.DateTimeField(read_only=True)
+    consumed_units = serializers.DecimalField(max_digits=19, decimal_places=4, read_only=True)
+    logs_count = serializers.IntegerField(read_only=True)
+
+
 class SubscriptionUrl(serializers.HyperlinkedRelatedField):
     def get_url(self, obj, view_name, request, format):
         kwargs = {'customer_pk': obj.customer_id, 'subscription_pk': obj.pk}
@@ -63,7 +71,8 @@ class SubscriptionUrl(serializers.HyperlinkedRelatedField):
                        format=format)
 
 
-class SubscriptionSerializer(serializers.HyperlinkedModelSerializer):
+class SubscriptionSerializer(SparseFieldsetsSerializerMixin,
+                             serializers.HyperlinkedModelSerializer):
     trial_end = serializers.DateField(required=False)
     start_date = serializers.DateField(required=False)
     ended_at = serializers.DateField(read_only=True)
@@ -83,6 +92,18 @@ class SubscriptionSerializer(serializers.HyperlinkedModelSerializer):
         read_only_fields = ('state', 'updateable_buckets')
         extra_kwargs = {'customer': {'lookup_url_kwarg': 'customer_pk'}}
 
+    related_fields = {
+        # the billing cycles fall back to the provider's settings
+        'current_billing_cycle': ('plan__provider', ),
+        'updateable_buckets': ('plan__provider', ),
+        'discounts': ('plan', ),
+        'bonuses': ('plan', ),
+    }
+    prefetched_fields = {
+        'discounts': ('plan__metered_features', ),
+        'bonuses': ('plan__metered_features', ),
+    }
+
     def validate(self, attrs):
         attrs = super(SubscriptionSerializer, self).validate(attrs)
 
@@ -90,13 +111,25 @@ class SubscriptionSerializer(serializers.HyperlinkedModelSerializer):
         instance.clean()
         return attrs
 
+    def _get_applied(self, subscription, model):
+        # The discounts (or bonuses) of all the listed subscriptions are fetched at once, when
+        # serializing the first of them, and kept in the context for the rest of the request.
+        applied = self.context.setdefault('applied_%s' % model._meta.verbose_name_plural, {})
+
+        if subscription.pk not in applied:
+            subscriptions = (self.parent.instance if isinstance(self.parent, serializers.ListSerializer)
+                             else [subscription])
+            applied.update(model.for_subscriptions(subscriptions))
+
+        return applied.get(subscription.pk, [])
+
     def get_discounts(self, subscription):
         context = self.context
         context["subscription"] = subscription
 
         return [
             SubscriptionDiscountSerializer(discount, context=context).data
-            for discount in subscription.applied_discounts
+            for discount in self._get_applied(subscription, Discount)
         ]
 
     def get_bonuses(self, subscription):
@@ -104,7 +137,8 @@ class SubscriptionSerializer(serializers.HyperlinkedModelSerializer):
         context["subscription"] = subscription
 
         return [
-            SubscriptionBonusSerializer(discount, context=context).data for discount in subscription.applied_bonuses
+            SubscriptionBonusSerializer(discount, context=context).data
+            for discount in self._get_applied(subscription, Bonus)
         ]
 
 
@@ -113,3 +147,7 @@ class SubscriptionDetailSerializer(SubscriptionSerializer):
 
     class Meta(SubscriptionSerializer.Meta):
         fields = SubscriptionSerializer.Meta.fields + ('plan',)
+
+    related_fields = dict(SubscriptionSerializer.related_fields, plan=('plan__product_code', ))
+    prefetched_fields = dict(SubscriptionSerializer.prefetched_fields,
+                             plan=('plan__metered_features__product_code', ))
@@ -25,6 +25,7 @@ from rest_framework.settings import api_settings
 from silver.api.serializers.billing_entities_serializers import ProviderUrl
 from silver.api.serializers.common import CustomerUrl
 from silver.api.serializers.payment_methods_serializers import PaymentMethodUrl
+from silver.api.sparse_fieldsets import SparseFieldsetsSerializerMixin
 from silver.models import PaymentMethod, Transaction
 from silver.utils.payments import get_payment_url
 from silver.utils.serializers import AutoCleanSerializerMixin
@@ -34,7 +35,7 @@ class TransactionUrl(serializers.HyperlinkedIdentityField):
     def get_url(self, obj, view_name, request, format):
         lookup_value = getattr(obj, self.lookup_field)
         kwargs = {'transaction_uuid': str(lookup_value),
-                  'customer_pk': obj.customer.pk}
+                  'customer_pk': obj.payment_method.customer_id}
         return self.reverse(view_name, kwargs=kwargs, request=request, format=format)
 
     def get_object(self, view_name, view_args, view_kwargs):
@@ -57,7 +58,7 @@ class TransactionPaymentUrl(serializers.HyperlinkedIdentityField):
             return None
 
 
-class TransactionSerializer(AutoCleanSerializerMixin,
+class TransactionSerializer(SparseFieldsetsSerializerMixin, AutoCleanSerializerMixin,
                             serializers.HyperlinkedModelSerializer):
     payment_method = PaymentMethodUrl(view_name='payment-method-detail',
                                       lookup_field='payment_method',
@@ -89,6 +90,18 @@ class TransactionSerializer(AutoCleanSerializerMixin,
                         'invoice': {'view_name': 'invoice-detail'},
                         'proforma': {'view_name': 'proforma-detail'}}
 
+    related_fields = {
+        'url': ('payment_method', ),
+        'customer': ('payment_method__customer', ),
+        'provider': ('invoice__provider', 'proforma__provider'),
+        'payment_processor': ('payment_method', ),
+        'payment_method': ('payment_method', ),
+    }
+    expandable_fields = {
+        'customer': 'silver.api.serializers.billing_entities_serializers.CustomerSerializer',
+        'provider': 'silver.api.serializers.billing_entities_serializers.ProviderSerializer',
+    }
+
     def validate(self, attrs):
         attrs = super(TransactionSerializer, self).validate(attrs)
 
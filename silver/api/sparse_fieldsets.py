@@ -0,0 +1,160 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Sparse fieldsets and field expansion.
+
+The clients can ask for some of a resource's fields only, through the `fields` query parameter
+(e.g. `?fields=id,state,total`), and for some related resources to be embedded instead of
+being linked, through the `expand` query parameter (e.g. `?expand=customer`). Both take comma
+separated field names and apply to the GET (and HEAD) requests.
+
+The related objects read by the selected fields are fetched along with the resources, so the
+dropped fields don't cost any joins or queries.
+"""
+
+from __future__ import absolute_import
+
+from collections import OrderedDict
+
+from django.utils.module_loading import import_string
+
+from rest_framework.permissions import SAFE_METHODS
+
+
+FIELDS_QUERY_PARAM = 'fields'
+EXPAND_QUERY_PARAM = 'expand'
+
+
+def _parse_fields(value):
+    return [field.strip() for field in value.split(',') if field.strip()]
+
+
+class SparseFieldsetsSerializerMixin(object):
+    """
+    Lets a serializer output only the `fields` and embed the `expand` related objects, both
+    given as keyword arguments. The serializers describe how their fields are fetched through:
+
+        - related_fields: maps the fields to the lookups passed to select_related.
+        - prefetched_fields: maps the fields to the lookups (or Prefetch objects) passed to
+          prefetch_related.
+        - deferred_fields: the (costly to load) model fields which are deferred when their
+          serializer field isn't selected.
+        - expandable_fields: maps the fields which can be expanded to the dotted paths of the
+          serializers embedding them.
+    """
+
+    related_fields = {}
+    prefetched_fields = {}
+    deferred_fields = ()
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        self.selected_fields = kwargs.pop('fields', None)
+        self.expanded_fields = kwargs.pop('expand', None) or ()
+
+        super(SparseFieldsetsSerializerMixin, self).__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super(SparseFieldsetsSerializerMixin, self).get_fields()
+
+        for field_name in self.expanded_fields:
+            if field_name not in self.expandable_fields or field_name not in fields:
+                continue
+
+            source = fields[field_name].source
+            serializer_class = import_string(self.expandable_fields[field_name])
+            fields[field_name] = serializer_class(
+                read_only=True, **({'source': source} if source and source != field_name else {})
+            )
+
+        if self.selected_fields is not None:
+            fields = OrderedDict(
+                (field_name, field) for field_name, field in fields.items()
+                if field_name in self.selected_fields
+            )
+
+        return fields
+
+    @classmethod
+    def prepare_queryset(cls, queryset, fields=None):
+        """
+        Fetches the related objects needed to serialize the given `fields` (defaulting to all
+        of them) along with the objects, so that serializing a list of objects costs a constant
+        number of queries.
+        """
+
+        if fields is None:
+            fields = cls.Meta.fields
+
+        related_lookups = set()
+        prefetch_lookups = set()
+        for field in fields:
+            related_lookups.update(cls.related_fields.get(field, ()))
+            prefetch_lookups.update(cls.prefetched_fields.get(field, ()))
+
+        if related_lookups:
+            queryset = queryset.select_related(*sorted(related_lookups))
+
+        if prefetch_lookups:
+            queryset = queryset.prefetch_related(*sorted(
+                prefetch_lookups, key=lambda lookup: getattr(lookup, 'prefetch_to', lookup)
+            ))
+
+        deferred_fields = [field for field in cls.deferred_fields if field not in fields]
+        if deferred_fields:
+            queryset = queryset.defer(*deferred_fields)
+
+        return queryset
+
+
+class SparseFieldsetsViewMixin(object):
+    """
+    Passes the fields selected through the query parameters to the view's serializer, and
+    prepares the view's queryset for serializing them.
+    """
+
+    def get_selected_fields(self):
+        if self.request.method not in SAFE_METHODS:
+            return None
+
+        fields = self.request.query_params.get(FIELDS_QUERY_PARAM)
+        return _parse_fields(fields) if fields else None
+
+    def get_expanded_fields(self):
+        if self.request.method not in SAFE_METHODS:
+            return ()
+
+        return _parse_fields(self.request.query_params.get(EXPAND_QUERY_PARAM, ''))
+
+    def _supports_sparse_fieldsets(self):
+        return issubclass(self.get_serializer_class(), SparseFieldsetsSerializerMixin)
+
+    def get_serializer(self, *args, **kwargs):
+        if self._supports_sparse_fieldsets():
+            kwargs.setdefault('fields', self.get_selected_fields())
+            kwargs.setdefault('expand', self.get_expanded_fields())
+
+        return super(SparseFieldsetsViewMixin, self).get_serializer(*args, **kwargs)
+
+    def prepare_queryset(self, queryset):
+        if not self._supports_sparse_fieldsets():
+            return queryset
+
+        return self.get_serializer_class().prepare_queryset(queryset, self.get_selected_fields())
+
+    def filter_queryset(self, queryset):
+        queryset = super(SparseFieldsetsViewMixin, self).filter_queryset(queryset)
+
+        return self.prepare_queryset(queryset)
@@ -18,7 +18,7 @@ from django.conf.urls import re_path
 
 from silver import views as silver_views
 from silver.api.views import billing_entities_views, bonus_views, documents_views, payment_method_views, \
-    plan_views, product_code_views, subscription_views, transaction_views, discount_views
+    plan_views, product_code_views, subscription_views, transaction_views, discount_views, changes_views
 
 urlpatterns = [
     re_path(r'^customers/$',
@@ -88,10 +88,14 @@ urlpatterns = [
 
     re_path(r'^invoices/$',
             documents_views.InvoiceListCreate.as_view(), name='invoice-list'),
+    re_path(r'^invoices/state/$',
+            documents_views.InvoicesStateHandler.as_view(), name='invoices-state'),
     re_path(r'^invoices/(?P<pk>[0-9]+)/$',
             documents_views.InvoiceRetrieveUpdate.as_view(), name='invoice-detail'),
     re_path(r'^invoices/(?P<document_pk>[0-9]+)/entries/$',
             documents_views.InvoiceEntryCreate.as_view(), name='invoice-entry-create'),
+    re_path(r'^invoices/(?P<document_pk>[0-9]+)/entries/bulk/$',
+            documents_views.InvoiceEntriesBulkUpdate.as_view(), name='invoice-entries-bulk'),
     re_path(r'^invoices/(?P<document_pk>[0-9]+)/entries/(?P<entry_pk>[0-9]+)/$',
             documents_views.InvoiceEntryUpdateDestroy.as_view(), name='invoice-entry-update'),
     re_path(r'^invoices/(?P<pk>[0-9]+)/state/$',
@@ -101,10 +105,14 @@ urlpatterns = [
 
     re_path(r'^proformas/$',
             documents_views.ProformaListCreate.as_view(), name='proforma-list'),
+    re_path(r'^proformas/state/$',
+            documents_views.ProformasStateHandler.as_view(), name='proformas-state'),
     re_path(r'^proformas/(?P<pk>[0-9]+)/$',
             documents_views.ProformaRetrieveUpdate.as_view(), name='proforma-detail'),
     re_path(r'^proformas/(?P<document_pk>[0-9]+)/entries/$',
             documents_views.ProformaEntryCreate.as_view(), name='proforma-entry-create'),
+    re_path(r'^proformas/(?P<document_pk>[0-9]+)/entries/bulk/$',
+            documents_views.ProformaEntriesBulkUpdate.as_view(), name='proforma-entries-bulk'),
     re_path(r'^proformas/(?P<document_pk>[0-9]+)/entries/(?P<entry_pk>[0-9]+)/$',
             documents_views.ProformaEntryUpdateDestroy.as_view(),
             name='proforma-entry-update'),
@@ -119,5 +127,8 @@ urlpatterns = [
             documents_views.PDFRetrieve.as_view(),
             name='pdf'),
     re_path(r'^documents/$',
-            documents_views.DocumentList.as_view(), name='document-list')
+            documents_views.DocumentList.as_view(), name='document-list'),
+
+    re_path(r'^changes/$',
+            changes_views.ChangeList.as_view(), name='change-list'),
 ]
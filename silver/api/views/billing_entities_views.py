@@ -20,14 +20,18 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, permissions
 from rest_framework_bulk import ListBulkCreateAPIView
 
+from silver.api.conditional_requests import ConditionalRequestsViewMixin
 from silver.api.filters import CustomerFilter, ProviderFilter
+from silver.api.response_cache import CachedResponseViewMixin
 from silver.api.serializers.billing_entities_serializers import (
     CustomerSerializer, ProviderSerializer
 )
+from silver.api.sparse_fieldsets import SparseFieldsetsViewMixin
 from silver.models import Customer, Provider
 
 
-class CustomerList(generics.ListCreateAPIView):
+class CustomerList(ConditionalRequestsViewMixin, SparseFieldsetsViewMixin,
+                   generics.ListCreateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = CustomerSerializer
     queryset = Customer.objects.all()
@@ -35,28 +39,35 @@ class CustomerList(generics.ListCreateAPIView):
     filterset_class = CustomerFilter
 
 
-class CustomerDetail(generics.RetrieveUpdateDestroyAPIView):
+class CustomerDetail(ConditionalRequestsViewMixin, SparseFieldsetsViewMixin,
+                     generics.RetrieveUpdateDestroyAPIView):
     def get_object(self):
         pk = self.kwargs.get('customer_pk', None)
         try:
-            return Customer.objects.get(pk=pk)
+            return self.prepare_queryset(Customer.objects.all()).get(pk=pk)
         except (TypeError, ValueError, Customer.DoesNotExist):
             raise Http404
 
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = CustomerSerializer
     model = Customer
+    queryset = Customer.objects.all()
+    lookup_url_kwarg = 'customer_pk'
 
 
-class ProviderListCreate(ListBulkCreateAPIView):
+class ProviderListCreate(CachedResponseViewMixin, SparseFieldsetsViewMixin,
+                         ListBulkCreateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
+    cache_dependencies = ('silver.Provider', )
     serializer_class = ProviderSerializer
     queryset = Provider.objects.all()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ProviderFilter
 
 
-class ProviderRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
+class ProviderRetrieveUpdateDestroy(CachedResponseViewMixin, SparseFieldsetsViewMixin,
+                                    generics.RetrieveUpdateDestroyAPIView):
     permission_classes = (permissions.IsAuthenticated,)
+    cache_dependencies = ('silver.Provider', )
     serializer_class = ProviderSerializer
     queryset = Provider.objects.all()
@@ -0,0 +1,50 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+from datetime import timedelta
+
+from django_filters.rest_framework import DjangoFilterBackend
+
+from django.conf import settings
+from django.utils import timezone
+
+from rest_framework import generics, permissions
+
+from silver.api.filters import ChangeFilter
+from silver.api.pagination import SincePagination
+from silver.api.serializers.changes_serializers import ChangeSerializer
+from silver.models import Change
+
+
+DEFAULT_CHANGES_FEED_LAG = 5
+
+
+class ChangeList(generics.ListAPIView):
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = ChangeSerializer
+    queryset = Change.objects.all()
+    pagination_class = SincePagination
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = ChangeFilter
+
+    def get_queryset(self):
+        # the changes inserted by concurrent transactions can become visible out of their ids'
+        # order, so the most recent ones are held back until the earlier ones had time to commit
+        lag = getattr(settings, 'SILVER_CHANGES_FEED_LAG', DEFAULT_CHANGES_FEED_LAG)
+
+        return super(ChangeList, self).get_queryset().filter(
+            created_at__lte=timezone.now() - timedelta(seconds=lag)
+        )
@@ -14,11 +14,13 @@
 
 from __future__ import absolute_import
 
-from django_filters.rest_framework import DjangoFilterBackend
+import logging
 
-import django
+from django_filters.rest_framework import DjangoFilterBackend
+from django_fsm import ConcurrentTransition, TransitionNotAllowed
 
-from django.db.models import Q
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.http import HttpResponseRedirect
 
 from rest_framework import generics, permissions, filters, status
@@ -26,24 +28,32 @@ from rest_framework.generics import get_object_or_404, ListAPIView
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from silver.api.conditional_requests import ConditionalRequestsViewMixin
 from silver.api.filters import InvoiceFilter, ProformaFilter, BillingDocumentFilter
+from silver.api.pagination import LargeCollectionPagination
 from silver.api.serializers.documents_serializers import (
-    InvoiceSerializer, DocumentEntrySerializer, ProformaSerializer, DocumentSerializer
+    InvoiceSerializer, DocumentEntrySerializer, ProformaSerializer, DocumentSerializer,
+    DocumentEntriesSerializer
 )
+from silver.api.sparse_fieldsets import SparseFieldsetsViewMixin
 from silver.models import Invoice, BillingDocumentBase, DocumentEntry, Proforma, PDF
 
 
-class InvoiceListCreate(generics.ListCreateAPIView):
+logger = logging.getLogger(__name__)
+
+
+class InvoiceListCreate(ConditionalRequestsViewMixin, SparseFieldsetsViewMixin,
+                        generics.ListCreateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = InvoiceSerializer
-    queryset = Invoice.objects.all()\
-        .select_related('related_document')\
-        .prefetch_related('invoice_transactions')
+    queryset = Invoice.objects.all()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = InvoiceFilter
+    pagination_class = LargeCollectionPagination
 
 
-class InvoiceRetrieveUpdate(generics.RetrieveUpdateAPIView):
+class InvoiceRetrieveUpdate(ConditionalRequestsViewMixin, SparseFieldsetsViewMixin,
+                            generics.RetrieveUpdateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = InvoiceSerializer
     queryset = Invoice.objects.all()
@@ -82,6 +92,7 @@ class DocEntryCreate(generics.CreateAPIView):
             # foreign key to either an invoice or a proforma
             extra_context = {model_name.lower(): document}
             serializer.save(**extra_context)
+            BillingDocumentBase.objects.touch([document])
 
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -125,6 +136,7 @@ class DocEntryUpdateDestroy(APIView):
 
         if serializer.is_valid(raise_exception=True):
             serializer.save()
+            BillingDocumentBase.objects.touch([document])
             return Response(serializer.data)
 
     def delete(self, request, *args, **kwargs):
@@ -144,6 +156,7 @@ class DocEntryUpdateDestroy(APIView):
         searched_fields = {model_name.lower(): document, 'pk': entry_pk}
         entry = get_object_or_404(DocumentEntry, **searched_fields)
         entry.delete()
+        BillingDocumentBase.objects.touch([document])
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -174,6 +187,52 @@ class InvoiceEntryUpdateDestroy(DocEntryUpdateDestroy):
         return "Invoice"
 
 
+class DocEntriesBulkUpdate(APIView):
+    def post(self, request, *args, **kwargs):
+        doc_pk = kwargs.get('document_pk')
+        Model = self.get_model()
+        model_name = self.get_model_name()
+
+        with transaction.atomic():
+            # the document can't be issued while its entries are being written
+            document = Model.objects.filter(pk=doc_pk).select_for_update().first()
+            if document is None:
+                msg = "{model} not found".format(model=model_name)
+                return Response({"detail": msg}, status=status.HTTP_404_NOT_FOUND)
+
+            if document.state != BillingDocumentBase.STATES.DRAFT:
+                msg = "{model} entries can be changed only when the {model_lower} is"\
+                      " in draft state.".format(model=model_name,
+                                                model_lower=model_name.lower())
+                return Response({"detail": msg}, status=status.HTTP_403_FORBIDDEN)
+
+            serializer = DocumentEntriesSerializer(document, data=request.data,
+                                                   context={'request': request})
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        entries = DocumentEntry.objects.filter(**{document.kind: document})\
+                                       .select_related('product_code').order_by('pk')
+        return Response(DocumentEntrySerializer(entries, many=True,
+                                                context={'request': request}).data)
+
+    def get_model(self):
+        raise NotImplementedError
+
+    def get_model_name(self):
+        raise NotImplementedError
+
+
+class InvoiceEntriesBulkUpdate(DocEntriesBulkUpdate):
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_model(self):
+        return Invoice
+
+    def get_model_name(self):
+        return "Invoice"
+
+
 class InvoiceStateHandler(APIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = InvoiceSerializer
@@ -224,17 +283,18 @@ class InvoiceStateHandler(APIView):
         return Response(serializer.data)
 
 
-class ProformaListCreate(generics.ListCreateAPIView):
+class ProformaListCreate(ConditionalRequestsViewMixin, SparseFieldsetsViewMixin,
+                         generics.ListCreateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = ProformaSerializer
-    queryset = Proforma.objects.all()\
-        .select_related('related_document')\
-        .prefetch_related('proforma_transactions')
+    queryset = Proforma.objects.all()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ProformaFilter
+    pagination_class = LargeCollectionPagination
 
 
-class ProformaRetrieveUpdate(generics.RetrieveUpdateAPIView):
+class ProformaRetrieveUpdate(ConditionalRequestsViewMixin, SparseFieldsetsViewMixin,
+                             generics.RetrieveUpdateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = ProformaSerializer
     queryset = Proforma.objects.all()
@@ -309,6 +369,16 @@ class ProformaInvoiceRetrieveCreate(APIView):
         return Response(serializer.data)
 
 
+class ProformaEntriesBulkUpdate(DocEntriesBulkUpdate):
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_model(self):
+        return Proforma
+
+    def get_model_name(self):
+        return "Proforma"
+
+
 class ProformaStateHandler(APIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = ProformaSerializer
@@ -359,29 +429,156 @@ class ProformaStateHandler(APIView):
         return Response(serializer.data)
 
 
-class DocumentList(ListAPIView):
+class DocumentsStateHandler(APIView):
+    """
+    Transitions many documents to the same state. The documents are processed in chunks, each
+    within a transaction, and are locked in the order of their ids, so that concurrent requests
+    can't deadlock. A document failing its transition doesn't stop the others from being
+    transitioned, and the outcome of each document is returned.
+    """
+
+    chunk_size = 100
+    max_documents = 10000
+
+    # maps the target states to the transition methods, to the states they can be made from
+    # and to the (optional) request fields passed to them
+    transitions = {
+        BillingDocumentBase.STATES.ISSUED: ('issue', BillingDocumentBase.STATES.DRAFT,
+                                            ('issue_date', 'due_date')),
+        BillingDocumentBase.STATES.PAID: ('pay', BillingDocumentBase.STATES.ISSUED,
+                                          ('paid_date', )),
+        BillingDocumentBase.STATES.CANCELED: ('cancel', BillingDocumentBase.STATES.ISSUED,
+                                              ('cancel_date', )),
+    }
+
+    def get_model(self):
+        raise NotImplementedError
+
+    def get_model_name(self):
+        raise NotImplementedError
+
+    def get_ids(self, request):
+        ids = request.data.get('ids', None)
+        if not isinstance(ids, list) or not ids:
+            return None
+
+        try:
+            return sorted(set(int(pk) for pk in ids))
+        except (TypeError, ValueError):
+            return None
+
+    def transition(self, document, state, params):
+        method_name, source_state, param_names = self.transitions[state]
+        if document.state != source_state:
+            return "{model} can be {state} only if it is in {source_state} state.".format(
+                model=self.get_model_name(), state=state, source_state=source_state
+            )
+
+        try:
+            # a savepoint, so that a failed transition is rolled back on its own
+            with transaction.atomic():
+                getattr(document, method_name)(**{
+                    param: params[param] for param in param_names if params.get(param)
+                })
+        except (TransitionNotAllowed, ConcurrentTransition, ValidationError) as error:
+            detail = '; '.join(getattr(error, 'messages', [str(error)]))
+        except Exception:
+            logger.exception("Couldn't transition %s with pk %d to %s." %
+                             (self.get_model_name().lower(), document.pk, state))
+            detail = "{model} couldn't be {state}.".format(model=self.get_model_name(),
+                                                           state=state)
+        else:
+            return None
+
+        # the state is changed before the document is saved, so it has to be read back
+        document.refresh_from_db(fields=['state'])
+
+        return detail
+
+    def put(self, request, *args, **kwargs):
+        Model = self.get_model()
+
+        state = request.data.get('state', None)
+        if not state:
+            msg = "You have to provide a value for the state field."
+            return Response({"detail": msg}, status=status.HTTP_400_BAD_REQUEST)
+        if state not in self.transitions:
+            return Response({"detail": "Illegal state value."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        ids = self.get_ids(request)
+        if ids is None:
+            msg = "You have to provide a list of {model} ids.".format(
+                model=self.get_model_name().lower()
+            )
+            return Response({"detail": msg}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.max_documents:
+            msg = "At most {count} documents can be transitioned at once.".format(
+                count=self.max_documents
+            )
+            return Response({"detail": msg}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = []
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start:start + self.chunk_size]
+
+            with transaction.atomic():
+                documents = {
+                    document.pk: document for document in
+                    Model.objects.filter(pk__in=chunk).order_by('pk')
+                                 .select_for_update()
+                }
+
+                for pk in chunk:
+                    document = documents.get(pk)
+                    if document is None:
+                        error = "{model} not found".format(model=self.get_model_name())
+                    else:
+                        error = self.transition(document, state, request.data)
+
+                    result = {'id': pk, 'success': error is None}
+                    if document is not None:
+                        result['state'] = document.state
+                    if error is not None:
+                        result['detail'] = error
+
+                    results.append(result)
+
+        return Response({'results': results})
+
+
+class InvoicesStateHandler(DocumentsStateHandler):
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_model(self):
+        return Invoice
+
+    def get_model_name(self):
+        return "Invoice"
+
+
+class ProformasStateHandler(DocumentsStateHandler):
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_model(self):
+        return Proforma
+
+    def get_model_name(self):
+        return "Proforma"
+
+
+class DocumentList(ConditionalRequestsViewMixin, SparseFieldsetsViewMixin, ListAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = DocumentSerializer
     filterset_class = BillingDocumentFilter
     filter_backends = (filters.OrderingFilter, DjangoFilterBackend)
     ordering_fields = ('due_date', )
     ordering = ('-due_date', '-number')
+    pagination_class = LargeCollectionPagination
 
     def get_queryset(self):
-        django_version = django.get_version().split('.')
-        if django_version[0] == '1' and int(django_version[1]) < 11:
-            return BillingDocumentBase.objects.filter(
-                Q(kind='invoice') | Q(kind='proforma', related_document=None)
-            ).select_related('customer', 'provider', 'pdf')
-
-        invoices = BillingDocumentBase.objects \
-            .filter(kind='invoice') \
-            .prefetch_related('invoice_transactions__payment_method')
-        proformas = BillingDocumentBase.objects \
-            .filter(kind='proforma', related_document=None) \
-            .prefetch_related('proforma_transactions__payment_method')
-
-        return (invoices | proformas).select_related('customer', 'provider', 'pdf')
+        # the documents' related documents aren't serialized, so they aren't joined either
+        return BillingDocumentBase.objects.select_related(None).listed()
 
 
 class PDFRetrieve(generics.RetrieveAPIView):
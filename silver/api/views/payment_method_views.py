@@ -25,13 +25,16 @@ from rest_framework.views import APIView
 
 from silver import payment_processors
 from silver.api.filters import PaymentMethodFilter
+from silver.api.response_cache import CachedResponseViewMixin
 from silver.api.serializers.payment_methods_serializers import (PaymentProcessorSerializer,
                                                                 PaymentMethodSerializer)
+from silver.api.sparse_fieldsets import SparseFieldsetsViewMixin
 from silver.models import PaymentMethod, Customer
 
 
-class PaymentProcessorList(ListAPIView):
+class PaymentProcessorList(CachedResponseViewMixin, ListAPIView):
     permission_classes = (permissions.IsAuthenticated,)
+    cache_dependencies = ('PAYMENT_PROCESSORS', )
     serializer_class = PaymentProcessorSerializer
     ordering = ('-name', )
 
@@ -39,8 +42,9 @@ class PaymentProcessorList(ListAPIView):
         return payment_processors.get_all_instances()
 
 
-class PaymentProcessorDetail(RetrieveAPIView):
+class PaymentProcessorDetail(CachedResponseViewMixin, RetrieveAPIView):
     permission_classes = (permissions.IsAuthenticated,)
+    cache_dependencies = ('PAYMENT_PROCESSORS', )
     serializer_class = PaymentProcessorSerializer
     ordering = ('-name', )
 
@@ -52,7 +56,7 @@ class PaymentProcessorDetail(RetrieveAPIView):
             raise Http404
 
 
-class PaymentMethodList(ListCreateAPIView):
+class PaymentMethodList(SparseFieldsetsViewMixin, ListCreateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = PaymentMethodSerializer
     filter_backends = (DjangoFilterBackend,)
@@ -81,7 +85,7 @@ class PaymentMethodList(ListCreateAPIView):
         serializer.save(customer=customer)
 
 
-class PaymentMethodDetail(RetrieveUpdateAPIView):
+class PaymentMethodDetail(SparseFieldsetsViewMixin, RetrieveUpdateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = PaymentMethodSerializer
 
@@ -90,7 +94,7 @@ class PaymentMethodDetail(RetrieveUpdateAPIView):
         customer_pk = self.kwargs.get('customer_pk')
 
         return get_object_or_404(
-            PaymentMethod.objects.all().select_subclasses(),
+            self.prepare_queryset(PaymentMethod.objects.all().select_subclasses()),
             id=payment_method_id,
             customer__pk=customer_pk
         )
@@ -22,28 +22,33 @@ from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
 from silver.api.filters import PlanFilter
+from silver.api.response_cache import CachedResponseViewMixin
 from silver.api.serializers.common import MeteredFeatureSerializer
 from silver.api.serializers.plans_serializer import PlanSerializer
+from silver.api.sparse_fieldsets import SparseFieldsetsViewMixin
 from silver.models import Plan, MeteredFeature
 
 
-class PlanList(generics.ListCreateAPIView):
+class PlanList(CachedResponseViewMixin, SparseFieldsetsViewMixin, generics.ListCreateAPIView):
 
     permission_classes = (permissions.IsAuthenticated,)
+    cache_dependencies = ('silver.Plan', 'silver.MeteredFeature', 'silver.ProductCode')
     serializer_class = PlanSerializer
     queryset = Plan.objects.all().prefetch_related('metered_features')
     filter_backends = (DjangoFilterBackend,)
     filterset_class = PlanFilter
 
 
-class PlanDetail(generics.RetrieveDestroyAPIView):
+class PlanDetail(CachedResponseViewMixin, SparseFieldsetsViewMixin,
+                 generics.RetrieveDestroyAPIView):
     permission_classes = (permissions.IsAuthenticated,)
+    cache_dependencies = ('silver.Plan', 'silver.MeteredFeature', 'silver.ProductCode')
     serializer_class = PlanSerializer
     model = Plan
 
     def get_object(self):
         pk = self.kwargs.get('pk', None)
-        return get_object_or_404(Plan, pk=pk)
+        return get_object_or_404(self.prepare_queryset(Plan.objects.all()), pk=pk)
 
     def patch(self, request, *args, **kwargs):
         plan = get_object_or_404(Plan.objects, pk=self.kwargs.get('pk', None))
@@ -63,8 +68,10 @@ class PlanDetail(generics.RetrieveDestroyAPIView):
                         status=status.HTTP_200_OK)
 
 
-class PlanMeteredFeatures(generics.ListAPIView):
+class PlanMeteredFeatures(CachedResponseViewMixin, SparseFieldsetsViewMixin,
+                          generics.ListAPIView):
     permission_classes = (permissions.IsAuthenticated,)
+    cache_dependencies = ('silver.Plan', 'silver.MeteredFeature', 'silver.ProductCode')
     serializer_class = MeteredFeatureSerializer
     model = MeteredFeature
 
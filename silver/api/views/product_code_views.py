@@ -16,17 +16,23 @@ from __future__ import absolute_import
 
 from rest_framework import generics, permissions
 
+from silver.api.response_cache import CachedResponseViewMixin
 from silver.api.serializers.product_codes_serializer import ProductCodeSerializer
+from silver.api.sparse_fieldsets import SparseFieldsetsViewMixin
 from silver.models import ProductCode
 
 
-class ProductCodeListCreate(generics.ListCreateAPIView):
+class ProductCodeListCreate(CachedResponseViewMixin, SparseFieldsetsViewMixin,
+                            generics.ListCreateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
+    cache_dependencies = ('silver.ProductCode', )
     serializer_class = ProductCodeSerializer
     queryset = ProductCode.objects.all()
 
 
-class ProductCodeRetrieveUpdate(generics.RetrieveUpdateAPIView):
+class ProductCodeRetrieveUpdate(CachedResponseViewMixin, SparseFieldsetsViewMixin,
+                                generics.RetrieveUpdateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
+    cache_dependencies = ('silver.ProductCode', )
     serializer_class = ProductCodeSerializer
     queryset = ProductCode.objects.all()
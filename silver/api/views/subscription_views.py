@@ -18,11 +18,13 @@ import datetime
 import logging
 
 from decimal import Decimal
+from itertools import islice
 
 import dateutil
 import dateutil.parser
 
 from annoying.functions import get_object_or_None
+from django.db.models import Case, Count, IntegerField, Sum, Value, When
 from django.utils.dateparse import parse_datetime, parse_date
 from django_filters.rest_framework import DjangoFilterBackend
 
@@ -35,37 +37,49 @@ from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
-from silver.api.filters import MeteredFeaturesFilter, SubscriptionFilter
+from silver.api.conditional_requests import ConditionalRequestsViewMixin
+from silver.api.filters import MeteredFeaturesFilter, SubscriptionFilter, MFUnitsLogFilter
+from silver.api.pagination import MFUnitsLogPagination
+from silver.api.response_cache import CachedResponseViewMixin
 from silver.api.serializers.common import MeteredFeatureSerializer
 from silver.api.serializers.subscriptions_serializers import SubscriptionSerializer, \
-    SubscriptionDetailSerializer, MFUnitsLogSerializer
+    SubscriptionDetailSerializer, MFUnitsLogSerializer, MFUnitsLogBucketSerializer
+from silver.api.sparse_fieldsets import SparseFieldsetsViewMixin
 from silver.models import MeteredFeature, Subscription, MeteredFeatureUnitsLog
 
 
 logger = logging.getLogger(__name__)
 
+MAX_AGGREGATED_BUCKETS = 366
 
-class MeteredFeatureList(generics.ListCreateAPIView):
+
+class MeteredFeatureList(CachedResponseViewMixin, SparseFieldsetsViewMixin,
+                         generics.ListCreateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
+    cache_dependencies = ('silver.MeteredFeature', 'silver.ProductCode')
     serializer_class = MeteredFeatureSerializer
     queryset = MeteredFeature.objects.all()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = MeteredFeaturesFilter
 
 
-class MeteredFeatureDetail(generics.RetrieveAPIView):
+class MeteredFeatureDetail(SparseFieldsetsViewMixin, generics.RetrieveAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = MeteredFeatureSerializer
     model = MeteredFeature
 
     def get_object(self):
         customer_pk = self.kwargs.get('pk', None)
-        return get_object_or_404(MeteredFeature, pk=customer_pk)
+        return get_object_or_404(self.prepare_queryset(MeteredFeature.objects.all()),
+                                 pk=customer_pk)
 
 
-class SubscriptionList(generics.ListCreateAPIView):
+class SubscriptionList(ConditionalRequestsViewMixin, SparseFieldsetsViewMixin,
+                       generics.ListCreateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = SubscriptionSerializer
+    # the subscriptions' billing cycles, discounts and bonuses change with the current date
+    last_modified_field = None
     filter_backends = (DjangoFilterBackend,)
     filterset_class = SubscriptionFilter
 
@@ -83,21 +97,17 @@ class SubscriptionList(generics.ListCreateAPIView):
         return super(SubscriptionList, self).post(request, *args, **kwargs)
 
 
-class SubscriptionDetail(generics.RetrieveUpdateAPIView):
+class SubscriptionDetail(ConditionalRequestsViewMixin, SparseFieldsetsViewMixin,
+                         generics.RetrieveUpdateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = SubscriptionDetailSerializer
+    last_modified_field = None
 
     def get_object(self):
         customer_pk = self.kwargs.get('customer_pk', None)
         subscription_pk = self.kwargs.get('subscription_pk', None)
         return get_object_or_404(
-            Subscription.objects.all()
-            .select_related(
-                "plan__product_code",
-            )
-            .prefetch_related(
-                "plan__metered_features__product_code",
-            ),
+            self.prepare_queryset(Subscription.objects.all()),
             customer__id=customer_pk,
             pk=subscription_pk,
         )
@@ -231,15 +241,16 @@ class SubscriptionReactivate(APIView):
                             status=status.HTTP_200_OK)
 
 
-class MeteredFeatureUnitsLogDetail(APIView):
+class MeteredFeatureUnitsLogDetail(generics.GenericAPIView):
     permission_classes = (permissions.IsAuthenticated,)
-    paginate_by = None
+    serializer_class = MFUnitsLogSerializer
+    pagination_class = MFUnitsLogPagination
 
     def get(self, request, format=None, **kwargs):
         subscription_pk = kwargs.get('subscription_pk', None)
         mf_product_code = kwargs.get('mf_product_code', None)
 
-        subscription = Subscription.objects.get(pk=subscription_pk)
+        subscription = get_object_or_404(Subscription, pk=subscription_pk)
 
         metered_feature = get_object_or_404(
             subscription.plan.metered_features,
@@ -248,12 +259,78 @@ class MeteredFeatureUnitsLogDetail(APIView):
 
         logs = MeteredFeatureUnitsLog.objects.filter(
             metered_feature=metered_feature.pk,
-            subscription=subscription_pk)
+            subscription=subscription_pk
+        )
+
+        filterset = MFUnitsLogFilter(request.query_params, queryset=logs, request=request)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        logs = filterset.qs
+
+        if request.query_params.get('aggregate') == 'buckets':
+            return self._get_buckets_totals(subscription, logs, filterset.form.cleaned_data)
+
+        page = self.paginate_queryset(logs)
+        serializer = self.get_serializer(page, many=True)
 
-        serializer = MFUnitsLogSerializer(
-            logs, many=True, context={'request': request}
+        return self.get_paginated_response(serializer.data)
+
+    def _get_buckets_totals(self, subscription, logs, filters):
+        if filters.get('start_datetime'):
+            start_date = filters['start_datetime'].date()
+        elif subscription.start_date:
+            start_date = subscription.start_date
+        else:
+            return Response([])
+
+        end_date = (filters.get('end_datetime') or timezone.now()).date()
+
+        buckets = list(islice(subscription.metered_features_buckets(start_date, end_date),
+                              MAX_AGGREGATED_BUCKETS + 1))
+        if len(buckets) > MAX_AGGREGATED_BUCKETS:
+            return Response(
+                {'detail': 'The interval spans over more than %d buckets. Please use the '
+                           'start_datetime and end_datetime filters to narrow it down.'
+                           % MAX_AGGREGATED_BUCKETS},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not buckets:
+            return Response([])
+
+        buckets = [
+            {
+                'start_datetime': datetime.datetime.combine(
+                    bucket_start_date, datetime.time.min, tzinfo=timezone.utc
+                ),
+                'end_datetime': datetime.datetime.combine(
+                    bucket_end_date, datetime.time.max, tzinfo=timezone.utc
+                ).replace(microsecond=0),
+            }
+            for bucket_start_date, bucket_end_date in buckets
+        ]
+
+        # The logs are assigned to their bucket and summed up by the database
+        bucket_index = Case(
+            *[When(start_datetime__gte=bucket['start_datetime'],
+                   end_datetime__lte=bucket['end_datetime'],
+                   then=Value(index))
+              for index, bucket in enumerate(buckets)],
+            output_field=IntegerField()
         )
-        return Response(serializer.data)
+        totals = {
+            row['bucket']: row for row in
+            logs.annotate(bucket=bucket_index).values('bucket').annotate(
+                consumed_units=Sum('consumed_units'), logs_count=Count('id')
+            ).order_by()
+        }
+
+        for index, bucket in enumerate(buckets):
+            bucket_totals = totals.get(index, {})
+            bucket['consumed_units'] = bucket_totals.get('consumed_units') or Decimal(0)
+            bucket['logs_count'] = bucket_totals.get('logs_count', 0)
+
+        return Response(MFUnitsLogBucketSerializer(buckets, many=True).data)
 
     def patch(self, request, *args, **kwargs):
         mf_product_code = self.kwargs.get('mf_product_code', None)
@@ -27,15 +27,18 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from silver.api.filters import TransactionFilter
+from silver.api.pagination import LargeCollectionPagination
 from silver.api.serializers.transaction_serializers import TransactionSerializer
+from silver.api.sparse_fieldsets import SparseFieldsetsViewMixin
 from silver.models import PaymentMethod, Transaction
 
 
-class TransactionList(ListCreateAPIView):
+class TransactionList(SparseFieldsetsViewMixin, ListCreateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = TransactionSerializer
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TransactionFilter
+    pagination_class = LargeCollectionPagination
 
     def get_queryset(self):
         customer_pk = self.kwargs.get('customer_pk', None)
@@ -64,7 +67,7 @@ class TransactionList(ListCreateAPIView):
             serializer.save()
 
 
-class TransactionDetail(RetrieveUpdateAPIView):
+class TransactionDetail(SparseFieldsetsViewMixin, RetrieveUpdateAPIView):
     permission_classes = (permissions.AllowAny,)
     serializer_class = TransactionSerializer
     http_method_names = ('get', 'patch', 'head', 'options')
@@ -76,7 +79,7 @@ class TransactionDetail(RetrieveUpdateAPIView):
         except ValueError:
             raise Http404
 
-        return get_object_or_404(Transaction, uuid=uuid)
+        return get_object_or_404(self.prepare_queryset(Transaction.objects.all()), uuid=uuid)
 
 
 class TransactionAction(APIView):
@@ -26,7 +26,8 @@ from typing import Tuple, Dict, List, Union, Optional
 from django.utils import timezone
 
 from silver.models import (
-    Customer, Subscription, Proforma, Invoice, Provider, BillingLog, DocumentEntry, Plan
+    Customer, Subscription, Proforma, Invoice, Provider, BillingLog, DocumentEntry, Plan,
+    BillingDocumentBase
 )
 from silver.models.bonuses import Bonus
 from silver.models.discounts import Discount
@@ -437,8 +438,7 @@ class DocumentsGenerator(object):
                 document.delete()
                 continue
 
-            if provider.default_document_state == Provider.DEFAULT_DOC_STATE.ISSUED:
-                document.issue()
+            self._finish_document(document, provider)
 
     def _generate_for_user_without_consolidated_billing(
         self, customer, billing_date, generate_datetime=None, only_entry_type=None
@@ -468,8 +468,7 @@ class DocumentsGenerator(object):
                 document.delete()
                 continue
 
-            if provider.default_document_state == Provider.DEFAULT_DOC_STATE.ISSUED:
-                document.issue()
+            self._finish_document(document, provider)
 
     def _generate_for_single_subscription(
         self, subscription, billing_date, generate_datetime=None,only_entry_type=None
@@ -508,8 +507,17 @@ class DocumentsGenerator(object):
 
         self._create_discount_entries(**kwargs)
 
+        self._finish_document(document, provider)
+
+    def _finish_document(self, document, provider):
+        """
+        Issues the generated document, if its provider issues the documents by default, or else
+        marks it as updated, once for all of its entries (which don't touch it on their own).
+        """
         if provider.default_document_state == Provider.DEFAULT_DOC_STATE.ISSUED:
             document.issue()
+        else:
+            BillingDocumentBase.objects.touch([document])
 
     def add_subscription_cycles_to_document(
         self, billing_date, metered_features_billed_up_to, plan_billed_up_to, subscription, generate_datetime=None,
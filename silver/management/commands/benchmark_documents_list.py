@@ -0,0 +1,127 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from silver.api.views.documents_views import DocumentList
+from silver.models import BillingDocumentBase, Customer, Provider
+
+
+class Command(BaseCommand):
+    help = ('Times the documents list endpoint on synthetic billing documents. The documents '
+            'are created within a transaction which is rolled back at the end.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents',
+                            action='store', dest='documents', type=int, default=100000,
+                            help='The number of synthetic documents (half of them invoices).')
+        parser.add_argument('--customers',
+                            action='store', dest='customers', type=int, default=100,
+                            help='The number of customers the documents are spread among.')
+        parser.add_argument('--page-size',
+                            action='store', dest='page_size', type=int, default=100,
+                            help='The number of documents per page.')
+        parser.add_argument('--repeat',
+                            action='store', dest='repeat', type=int, default=5,
+                            help='The number of times each request is made.')
+
+    def create_synthetic_documents(self, documents_count, customers_count):
+        provider = Provider.objects.create(name='Bench Mark', company='Benchmark SRL',
+                                           email='bench@example.com', address_1='Street 1',
+                                           city='City', country='RO', invoice_series='BENCH',
+                                           invoice_starting_number=1,
+                                           proforma_starting_number=1)
+        customers = [
+            Customer.objects.create(first_name='Customer', last_name='#%d' % index,
+                                    email='customer%d@example.com' % index,
+                                    address_1='Street 1', city='City', country='RO')
+            for index in range(customers_count)
+        ]
+
+        issue_date = date.today() - timedelta(days=documents_count // 100)
+        documents = []
+        for index in range(documents_count):
+            documents.append(BillingDocumentBase(
+                kind='invoice' if index % 2 else 'proforma',
+                series='BENCH', number=index,
+                customer=customers[index % customers_count], provider=provider,
+                issue_date=issue_date + timedelta(days=index // 100),
+                due_date=issue_date + timedelta(days=index // 100 + 10),
+                currency='USD', transaction_currency='USD', transaction_xe_rate=Decimal('1'),
+                state=BillingDocumentBase.STATES.ISSUED,
+                _total=Decimal('100.00'), _total_in_transaction_currency=Decimal('100.00'),
+            ))
+
+        BillingDocumentBase.objects.bulk_create(documents, batch_size=1000)
+
+        return customers
+
+    # the synthetic requests are made to the default test host
+    @override_settings(ALLOWED_HOSTS=['testserver'])
+    def time_request(self, path, params, repeat):
+        view = DocumentList.as_view()
+        user = get_user_model()(username='benchmark')
+
+        durations = []
+        for _ in range(repeat):
+            request = APIRequestFactory().get(path, params)
+            force_authenticate(request, user=user)
+
+            with CaptureQueriesContext(connection) as captured_queries:
+                started_at = time.perf_counter()
+                view(request).render()
+                durations.append(time.perf_counter() - started_at)
+
+        return min(durations), sum(durations) / len(durations), len(captured_queries)
+
+    def handle(self, *args, **options):
+        path = reverse('document-list')
+        page_size = options['page_size']
+        last_page = max(options['documents'] // page_size, 1)
+
+        with transaction.atomic():
+            started_at = time.perf_counter()
+            customers = self.create_synthetic_documents(options['documents'],
+                                                        options['customers'])
+            self.stdout.write('Created %d documents in %.1fs.' % (
+                options['documents'], time.perf_counter() - started_at
+            ))
+
+            requests = [
+                ('first page', {'page_size': page_size}),
+                ('page %d' % last_page, {'page_size': page_size, 'page': last_page}),
+                ('first cursor page', {'page_size': page_size, 'pagination': 'cursor'}),
+                ('customer filter', {'page_size': page_size, 'customer': customers[0].pk}),
+            ]
+            for name, params in requests:
+                fastest, average, queries_count = self.time_request(path, params,
+                                                                    options['repeat'])
+                self.stdout.write('%s: fastest %.3fs, average %.3fs, %d queries.' % (
+                    name, fastest, average, queries_count
+                ))
+
+            transaction.set_rollback(True)
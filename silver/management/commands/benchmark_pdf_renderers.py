@@ -0,0 +1,109 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import resource
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.loader import get_template
+
+from silver.models import Customer, Provider, DocumentEntry
+from silver.pdf_renderers import load_pdf_renderer, DEFAULT_PDF_RENDERER
+
+
+class Command(BaseCommand):
+    help = 'Compares the PDF renderers on synthetic invoices having many entries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--renderer',
+                            action='append', dest='renderers',
+                            help='The dotted path of a renderer class. It can be given multiple '
+                                 'times. Defaults to the SILVER_PDF_RENDERER renderer.')
+        parser.add_argument('--entries',
+                            action='store', dest='entries', type=int, default=500,
+                            help='The number of entries of each invoice.')
+        parser.add_argument('--documents',
+                            action='store', dest='documents', type=int, default=5,
+                            help='The number of invoices rendered by each renderer.')
+
+    def get_synthetic_invoice_html(self, entries_count):
+        issue_date = date.today()
+        document = {
+            'kind': 'Invoice',
+            'series': 'BENCH',
+            'number': 1,
+            'currency': 'USD',
+            'issue_date': issue_date,
+            'due_date': issue_date + timedelta(days=5),
+            'state': 'issued',
+        }
+        entries = [
+            DocumentEntry(description='Synthetic entry #%d' % index, unit='Hours',
+                          quantity=Decimal(index % 10 + 1), unit_price=Decimal('12.5'),
+                          start_date=issue_date, end_date=issue_date)
+            for index in range(entries_count)
+        ]
+        document['total'] = sum(entry.total for entry in entries)
+
+        billing_entity = dict(name='Bench Mark', company='Benchmark SRL', email='bench@example.com',
+                              address_1='Street 1', city='City', country='RO')
+
+        return get_template('billing_documents/invoice_pdf.html').render({
+            'document': document,
+            'provider': Provider(**billing_entity),
+            'customer': Customer(**billing_entity),
+            'entries': entries,
+            'state': document['state'],
+            'filename': 'benchmark.pdf',
+        }).encode('UTF-8')
+
+    def handle(self, *args, **options):
+        renderers = options['renderers'] or [
+            getattr(settings, 'SILVER_PDF_RENDERER', DEFAULT_PDF_RENDERER)
+        ]
+        html = self.get_synthetic_invoice_html(options['entries'])
+
+        self.stdout.write('Rendering %d invoices with %d entries (%d KB of HTML).' % (
+            options['documents'], options['entries'], len(html) // 1024
+        ))
+
+        for renderer_path in renderers:
+            renderer = load_pdf_renderer(renderer_path)
+
+            durations = []
+            try:
+                for _ in range(options['documents']):
+                    pdf_file_object = BytesIO()
+
+                    started_at = time.perf_counter()
+                    renderer.render(html, pdf_file_object)
+                    durations.append(time.perf_counter() - started_at)
+            finally:
+                renderer.close()
+
+            max_rss = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                          resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+            self.stdout.write(
+                '%s: first %.3fs, average %.3fs, total %.3fs, PDF %d KB, max RSS %d MB.' % (
+                    renderer_path, durations[0], sum(durations) / len(durations),
+                    sum(durations), len(pdf_file_object.getvalue()) // 1024, max_rss // 1024
+                )
+            )
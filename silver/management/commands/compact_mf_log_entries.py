@@ -0,0 +1,50 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import logging
+
+from django.core.management.base import BaseCommand
+
+from silver.models import Subscription
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Collapses the billed metered feature units logs into rollup logs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subscription',
+                            action='store', dest='subscription_id', type=int,
+                            help='The id of the subscription whose logs will be compacted.')
+
+    def handle(self, *args, **options):
+        subscriptions = Subscription.objects.filter(billing_logs__isnull=False).distinct()
+
+        if options['subscription_id']:
+            subscriptions = subscriptions.filter(id=options['subscription_id'])
+
+        archived_count = 0
+        for subscription in subscriptions:
+            try:
+                archived_count += subscription.compact_mf_log_entries()
+            except Exception:
+                logger.error('Encountered exception while compacting the metered feature '
+                             'units logs of subscription with id=%s.', subscription.id,
+                             exc_info=True)
+
+        self.stdout.write('Archived %d metered feature units logs.' % archived_count)
@@ -14,18 +14,11 @@
 
 from __future__ import absolute_import
 
-import logging
-
 from six.moves import map
 
 from django.core.management.base import BaseCommand
 
-from silver import payment_processors
-from silver.models import Transaction
-from silver.payment_processors.mixins import PaymentProcessorTypes
-
-
-logger = logging.getLogger(__name__)
+from silver.transactions_executor import execute_transactions_in_batches
 
 
 def string_to_list(list_as_string):
@@ -43,23 +36,9 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        executable_transactions = Transaction.objects.filter(
-            state=Transaction.States.Initial,
+        executed_count, failed_transaction_ids = execute_transactions_in_batches(
+            options['transactions']
         )
 
-        if options['transactions']:
-            executable_transactions = executable_transactions.filter(
-                pk__in=options['transactions']
-            )
-
-        for transaction in executable_transactions:
-            try:
-                if not transaction.payment_method.verified or transaction.payment_method.canceled:
-                    continue
-                payment_processor = transaction.payment_method.get_payment_processor()
-                if payment_processor.type != PaymentProcessorTypes.Triggered:
-                    continue
-                payment_processor.process_transaction(transaction)
-            except Exception:
-                logger.error('Encountered exception while executing transaction '
-                             'with id=%s.', transaction.id, exc_info=True)
+        self.stdout.write('Executed %d transactions, %d failed.' % (executed_count,
+                                                                    len(failed_transaction_ids)))
@@ -14,18 +14,11 @@
 
 from __future__ import absolute_import
 
-import logging
-
 from six.moves import map
 
 from django.core.management.base import BaseCommand
 
-from silver import payment_processors
-from silver.models import Transaction
-from silver.payment_processors.mixins import PaymentProcessorTypes
-
-
-logger = logging.getLogger(__name__)
+from silver.transactions_executor import fetch_transactions_status_in_batches
 
 
 def string_to_list(list_as_string):
@@ -43,21 +36,9 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        eligible_transactions = Transaction.objects.filter(
-            state=Transaction.States.Pending,
+        updated_count, failed_transaction_ids = fetch_transactions_status_in_batches(
+            options['transactions']
         )
 
-        if options['transactions']:
-            eligible_transactions = eligible_transactions.filter(
-                pk__in=options['transactions']
-            )
-
-        for transaction in eligible_transactions:
-            try:
-                payment_processor = transaction.payment_method.get_payment_processor()
-                if payment_processor.type != PaymentProcessorTypes.Triggered:
-                    continue
-                payment_processor.fetch_transaction_status(transaction)
-            except Exception:
-                logger.error('Encountered exception while updating transaction '
-                             'with id=%s.', transaction.id, exc_info=True)
+        self.stdout.write('Updated %d transactions, %d failed.' % (updated_count,
+                                                                   len(failed_transaction_ids)))
@@ -18,9 +18,11 @@ import logging
 
 from itertools import chain
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
-from silver.models import Invoice, Proforma
+from silver.models import Invoice, Proforma, BillingDocumentBase, PDF
+from silver.pdfs_generator import generate_pdfs_in_process_pool
 
 
 logger = logging.getLogger(__name__)
@@ -29,7 +31,38 @@ logger = logging.getLogger(__name__)
 class Command(BaseCommand):
     help = 'Generates the billing documents (Invoices, Proformas).'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--workers',
+                            action='store', dest='workers', type=int, default=1,
+                            help='The number of processes used to generate the PDFs.')
+        parser.add_argument('--time-limit',
+                            action='store', dest='time_limit', type=int,
+                            default=getattr(settings, 'PDF_GENERATION_TIME_LIMIT', 60),
+                            help='The maximum number of seconds spent generating a PDF, '
+                                 'when using more than one worker.')
+        parser.add_argument('--discard-content-hashes',
+                            action='store_true', dest='discard_content_hashes', default=False,
+                            help='Discards the hashes of the HTML the PDFs were generated from, '
+                                 'so the dirty PDFs are regenerated even if their HTML is '
+                                 'unchanged (e.g. after changing the resources it links to).')
+
     def handle(self, *args, **options):
+        if options['discard_content_hashes']:
+            PDF.objects.exclude(content_hash=None).update(content_hash=None)
+
+        if options['workers'] > 1:
+            dirty_documents = BillingDocumentBase.objects.filter(
+                pdf__dirty__gt=0
+            ).order_by('id').values_list('id', 'kind')
+
+            generated_count, failed_document_ids = generate_pdfs_in_process_pool(
+                list(dirty_documents), workers=options['workers'],
+                time_limit=options['time_limit']
+            )
+            self.stdout.write('Generated %d PDFs, %d failed.' % (generated_count,
+                                                                 len(failed_document_ids)))
+            return
+
         for document in chain(Invoice.objects.filter(pdf__dirty__gt=0),
                               Proforma.objects.filter(pdf__dirty__gt=0)):
             try:
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('silver', '0063_auto_20240807_1247'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meteredfeatureunitslog',
+            index=models.Index(fields=['subscription', 'metered_feature', 'start_datetime', 'end_datetime',
+                                       'consumed_units', 'annotation'],
+                               name='mf_log_usage_range_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meteredfeatureunitslog',
+            index=models.Index(fields=['subscription', 'metered_feature', 'annotation', 'start_datetime'],
+                               name='mf_log_annotation_range_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('silver', '0064_meteredfeatureunitslog_usage_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeteredFeatureUnitsLogArchive',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('log_id', models.IntegerField(help_text='The id of the original units log.')),
+                ('consumed_units', models.DecimalField(decimal_places=4, max_digits=19)),
+                ('start_datetime', models.DateTimeField()),
+                ('end_datetime', models.DateTimeField()),
+                ('annotation', models.CharField(blank=True, max_length=256, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('metered_feature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                                                      related_name='archived_consumed',
+                                                      to='silver.meteredfeature')),
+                ('subscription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                                                   related_name='archived_mf_log_entries',
+                                                   to='silver.subscription')),
+            ],
+        ),
+    ]
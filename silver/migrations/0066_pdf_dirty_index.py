@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('silver', '0065_meteredfeatureunitslogarchive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pdf',
+            name='dirty',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('silver', '0066_pdf_dirty_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pdf',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, help_text='The SHA-256 hash of the HTML the PDF was generated from.', max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='pdf',
+            name='skipped_generations',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='How many times the generation was skipped, because the HTML was unchanged.'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+import uuid
+
+from django.db import migrations, models
+
+import silver.models.documents.export
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('silver', '0067_pdf_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentsExport',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, unique=True)),
+                ('export_format', models.CharField(choices=[('pdf', 'Merged PDF'), ('zip', 'ZIP archive')], default='pdf', max_length=8)),
+                ('state', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=8)),
+                ('document_ids', models.JSONField(default=list)),
+                ('export_file', models.FileField(blank=True, editable=False, null=True, upload_to=silver.models.documents.export.get_export_upload_path)),
+                ('exported_count', models.PositiveIntegerField(default=0)),
+                ('failed_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('silver', '0068_documentsexport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='next_status_poll_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='status_polls_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['state', 'next_status_poll_at'], name='transaction_status_poll_idx'),
+        ),
+    ]
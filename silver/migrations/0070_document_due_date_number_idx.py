@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('silver', '0069_transaction_status_polling'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='billingdocumentbase',
+            index=models.Index(fields=['-due_date', '-number'], name='document_due_date_number_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+import django.utils.timezone
+import silver.utils.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('silver', '0070_document_due_date_number_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='billingdocumentbase',
+            name='updated_at',
+            field=silver.utils.models.AutoDateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='updated_at',
+            field=silver.utils.models.AutoDateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -13,11 +13,16 @@
 # limitations under the License.
 
 from silver.models.billing_entities import Customer, Provider
-from silver.models.documents import Proforma, Invoice, BillingDocumentBase, DocumentEntry, PDF
+from silver.models.documents import (
+    Proforma, Invoice, BillingDocumentBase, DocumentEntry, PDF, DocumentsExport
+)
 from silver.models.plans import Plan, MeteredFeature
 from silver.models.product_codes import ProductCode
-from silver.models.subscriptions import Subscription, MeteredFeatureUnitsLog, BillingLog
+from silver.models.subscriptions import (
+    Subscription, MeteredFeatureUnitsLog, MeteredFeatureUnitsLogArchive, BillingLog
+)
 from silver.models.payment_methods import PaymentMethod
 from silver.models.transactions import Transaction
 from silver.models.discounts import Discount
 from silver.models.bonuses import Bonus
+from silver.models.changes import Change
@@ -20,11 +20,13 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
 from django.utils.html import escape
 from django.utils.safestring import mark_safe
 from django.urls import reverse
 
 from silver.utils.international import currencies
+from silver.utils.models import AutoDateTimeField
 from silver.models.billing_entities.base import BaseBillingEntity
 from silver.validators import validate_reference
 
@@ -76,6 +78,8 @@ class Customer(BaseBillingEntity):
                   "for the customer."
     )
 
+    updated_at = AutoDateTimeField(default=timezone.now)
+
     def __init__(self, *args, **kwargs):
         archived_name = None
         if 'name' in kwargs:
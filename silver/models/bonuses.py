@@ -12,7 +12,7 @@ from django.utils import timezone
 from silver.models import Subscription, Plan, MeteredFeature
 from silver.models.documents.entries import OriginType
 from silver.utils.dates import end_of_interval
-from silver.utils.models import AutoCleanModelMixin
+from silver.utils.models import AutoCleanModelMixin, SubscriptionFiltersMixin
 
 
 class DurationIntervals(models.TextChoices):
@@ -32,7 +32,7 @@ class DocumentEntryBehavior(models.TextChoices):
     APPLY_AS_SEPARATE_ENTRY_PER_ENTRY = "apply_separately_per_entry", "Apply as separate entry, per entry"
 
 
-class Bonus(AutoCleanModelMixin, models.Model):
+class Bonus(SubscriptionFiltersMixin, AutoCleanModelMixin, models.Model):
     TARGET = BonusTarget
     DURATION_INTERVALS = DurationIntervals
     ENTRY_BEHAVIOR = DocumentEntryBehavior
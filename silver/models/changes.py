@@ -0,0 +1,132 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+from model_utils import Choices
+
+
+def _document_path(document):
+    return reverse('%s-detail' % document.kind, kwargs={'pk': document.pk})
+
+
+def _transaction_path(transaction):
+    return reverse('transaction-detail', kwargs={
+        'customer_pk': transaction.payment_method.customer_id,
+        'transaction_uuid': transaction.uuid
+    })
+
+
+def _subscription_path(subscription):
+    return reverse('subscription-detail', kwargs={'customer_pk': subscription.customer_id,
+                                                  'subscription_pk': subscription.pk})
+
+
+# The models whose changes are logged, mapped to their resource name, to the API id of their
+# objects and to the API path of their objects.
+CHANGE_LOGGED_MODELS = {
+    'silver.Invoice': ('invoice', lambda invoice: invoice.pk, _document_path),
+    'silver.Proforma': ('proforma', lambda proforma: proforma.pk, _document_path),
+    'silver.Transaction': ('transaction', lambda transaction: transaction.uuid,
+                           _transaction_path),
+    'silver.Subscription': ('subscription', lambda subscription: subscription.pk,
+                            _subscription_path),
+}
+
+
+class ChangeManager(models.Manager):
+    def build(self, instance, action):
+        resource, get_object_id, get_path = CHANGE_LOGGED_MODELS[instance._meta.label]
+
+        try:
+            path = get_path(instance)
+        except (ObjectDoesNotExist, NoReverseMatch):
+            # e.g. the related objects the path is made of were deleted along with the object
+            path = ''
+
+        return self.model(resource=resource, object_id=str(get_object_id(instance)),
+                          action=action, path=path)
+
+    # The changes are built right away, while the objects' related objects are still around,
+    # but they are inserted (and dated) once the transactions making them commit, which also
+    # leaves the rolled back changes out. The ids are still assigned by concurrent inserts,
+    # which can commit out of order, so the feed holds back the most recent changes (see
+    # `SILVER_CHANGES_FEED_LAG`) instead of relying on the ids becoming visible in order.
+
+    def _insert(self, changes):
+        inserted_at = timezone.now()
+        for change in changes:
+            change.created_at = inserted_at
+
+        self.bulk_create(changes)
+
+    def log(self, instance, action):
+        change = self.build(instance, action)
+
+        transaction.on_commit(lambda: self._insert([change]))
+
+    def log_many(self, instances, action):
+        changes = [self.build(instance, action) for instance in instances]
+
+        transaction.on_commit(lambda: self._insert(changes))
+
+
+class Change(models.Model):
+    """
+    An append-only log of the changes made to the billing documents, transactions and
+    subscriptions, whose ids are the cursors of the (best-effort) change feed.
+    """
+
+    ACTIONS = Choices(
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    resource = models.CharField(max_length=32)
+    object_id = models.CharField(max_length=64)
+    action = models.CharField(choices=ACTIONS, max_length=8)
+    path = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    objects = ChangeManager()
+
+    class Meta:
+        ordering = ('id', )
+
+    def __str__(self):
+        return '%s %s %s' % (self.resource, self.object_id, self.action)
+
+
+@receiver(post_save)
+def log_saved_object_change(sender, instance, created=False, **kwargs):
+    if kwargs.get('raw', False) or sender._meta.label not in CHANGE_LOGGED_MODELS:
+        return
+
+    Change.objects.log(instance, Change.ACTIONS.created if created else Change.ACTIONS.updated)
+
+
+@receiver(post_delete)
+def log_deleted_object_change(sender, instance, **kwargs):
+    if sender._meta.label not in CHANGE_LOGGED_MODELS:
+        return
+
+    Change.objects.log(instance, Change.ACTIONS.deleted)
@@ -29,7 +29,7 @@ from .subscriptions import Subscription
 from .documents.entries import OriginType
 from .fields import field_template_path
 from silver.utils.dates import end_of_interval, DateInterval
-from silver.utils.models import AutoCleanModelMixin
+from silver.utils.models import AutoCleanModelMixin, SubscriptionFiltersMixin
 
 
 class DocumentEntryBehavior(models.TextChoices):
@@ -59,7 +59,7 @@ class DurationIntervals(models.TextChoices):
     YEAR = 'year'
 
 
-class Discount(AutoCleanModelMixin, models.Model):
+class Discount(SubscriptionFiltersMixin, AutoCleanModelMixin, models.Model):
     STACKING_TYPES = DiscountStackingType
     ENTRY_BEHAVIOR = DocumentEntryBehavior
     TARGET = DiscountTarget
@@ -17,3 +17,4 @@ from silver.models.documents.entries import DocumentEntry
 from silver.models.documents.invoice import Invoice
 from silver.models.documents.proforma import Proforma
 from silver.models.documents.pdf import PDF
+from silver.models.documents.export import DocumentsExport
@@ -27,12 +27,13 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.conf import settings
 from django.core.exceptions import ValidationError, NON_FIELD_ERRORS
+from django.core.signals import setting_changed
 from django.core.serializers.json import DjangoJSONEncoder
 from django.urls import reverse
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.db import transaction as db_transaction
-from django.db.models import Max, ForeignKey, F
+from django.db.models import Max, ForeignKey, F, Sum
 from django.template.loader import select_template
 from django.utils import timezone
 from django.utils.encoding import force_str
@@ -43,11 +44,12 @@ from django.utils.module_loading import import_string
 
 from silver.currencies import CurrencyConverter, RateNotFound
 from silver.models.billing_entities import Customer, Provider
+from silver.models.changes import Change
 from silver.models.documents.entries import DocumentEntry
 from silver.models.documents.pdf import PDF
 from silver.utils.decorators import require_transaction_xe_rate
 from silver.utils.international import currencies
-from silver.utils.models import AutoCleanModelMixin
+from silver.utils.models import AutoCleanModelMixin, AutoDateTimeField
 from silver.utils.transition import locking_atomic_transition
 
 _storage = getattr(settings, 'SILVER_DOCUMENT_STORAGE', None)
@@ -59,6 +61,15 @@ PAYMENT_DUE_DAYS = getattr(settings, 'SILVER_DEFAULT_DUE_DAYS', 5)
 
 logger = logging.getLogger(__name__)
 
+# Maps (provider slug, document kind, state) to the template selected for the documents' PDFs
+_pdf_templates = {}
+
+
+@receiver(setting_changed)
+def clear_pdf_templates_cache(setting, **kwargs):
+    if setting == 'TEMPLATES':
+        _pdf_templates.clear()
+
 
 def documents_pdf_path(document, filename):
     path = '{prefix}{company}/{doc_name}/{date}/{filename}'.format(
@@ -90,6 +101,30 @@ class BillingDocumentQuerySet(models.QuerySet):
             due_date__lt=timezone.now().date()
         )
 
+    def touch(self, documents=None):
+        """
+        Marks the documents as updated, for the changes of their related objects, and logs
+        their changes. The documents which are already at hand can be given, instead of being
+        fetched.
+        """
+        if documents is None:
+            documents = list(self.select_related(None).only('pk', 'kind'))
+
+        Change.objects.log_many(documents, Change.ACTIONS.updated)
+
+        return self.filter(pk__in=[document.pk for document in documents]).update(
+            updated_at=timezone.now()
+        )
+
+    def listed(self):
+        """
+        The invoices, along with the proformas which weren't turned into invoices yet, which
+        are listed together as documents.
+        """
+        # filtering the invoiced proformas out (instead of selecting the invoices and the
+        # proformas by kind) lets the database walk an ordering index until a page is filled
+        return self.exclude(kind='proforma', related_document__isnull=False)
+
     def overdue_since_last_month(self):
         return self.filter(
             state=BillingDocumentBase.STATES.ISSUED,
@@ -109,6 +144,18 @@ def get_billing_documents_kinds():
             for subclass in BillingDocumentBase.__subclasses__())
 
 
+# Maps the billing documents kinds to their classes
+_billing_document_classes = {}
+
+
+def get_billing_document_class(kind):
+    if kind not in _billing_document_classes:
+        for subclass in BillingDocumentBase.__subclasses__():
+            _billing_document_classes[subclass.__name__.lower()] = subclass
+
+    return _billing_document_classes.get(kind)
+
+
 class BillingDocumentBase(AutoCleanModelMixin, models.Model):
     objects = BillingDocumentManager.from_queryset(BillingDocumentQuerySet)()
 
@@ -175,6 +222,9 @@ class BillingDocumentBase(AutoCleanModelMixin, models.Model):
 
     is_storno = models.BooleanField(default=False)
 
+    # Also updated when the document's entries, transactions or PDF change
+    updated_at = AutoDateTimeField(default=timezone.now)
+
     _document_entries = None
 
     # These fields are not allowed to change after issuing the document, or be different in DB when
@@ -187,6 +237,9 @@ class BillingDocumentBase(AutoCleanModelMixin, models.Model):
     class Meta:
         unique_together = ('kind', 'provider', 'series', 'number')
         ordering = ('-issue_date', 'series', '-number')
+        indexes = [
+            models.Index(fields=['-due_date', '-number'], name='document_due_date_number_idx'),
+        ]
 
     def __init__(self, *args, **kwargs):
         super(BillingDocumentBase, self).__init__(*args, **kwargs)
@@ -194,9 +247,8 @@ class BillingDocumentBase(AutoCleanModelMixin, models.Model):
         if not self.kind:
             self.kind = self.__class__.__name__.lower()
         else:
-            for subclass in BillingDocumentBase.__subclasses__():
-                if subclass.__name__.lower() == self.kind:
-                    self.__class__ = subclass
+            # this runs for every fetched document, so the kinds' classes are looked up once
+            self.__class__ = get_billing_document_class(self.kind) or self.__class__
 
     def _get_entries(self):
         if not self._document_entries:
@@ -469,14 +521,11 @@ class BillingDocumentBase(AutoCleanModelMixin, models.Model):
         # invoice.issue_date != entry.invoice.issue_date
         #
         # which is obviously false.
-        document_type_name = self.__class__.__name__  # Invoice or Proforma
-        kwargs = {document_type_name.lower(): self}
-        entries = DocumentEntry.objects.filter(**kwargs)
-        for entry in entries:
-            if document_type_name.lower() == 'invoice':
-                entry.invoice = self
-            if document_type_name.lower() == 'proforma':
-                entry.proforma = self
+        #
+        # The entries are taken from the prefetched ones, if available.
+        document_type_name = self.__class__.__name__.lower()  # invoice or proforma
+        for entry in self.entries:
+            setattr(entry, document_type_name, self)
             yield(entry)
 
     def get_template_context(self, state=None):
@@ -494,6 +543,11 @@ class BillingDocumentBase(AutoCleanModelMixin, models.Model):
         }
 
     def get_template(self, state=None):
+        cache_key = (self.provider.slug, self.kind, state)
+        template = _pdf_templates.get(cache_key)
+        if template:
+            return template
+
         provider_state_template = '{provider}/{kind}_{state}_pdf.html'.format(
             kind=self.kind, provider=self.provider.slug, state=state).lower()
         provider_template = '{provider}/{kind}_pdf.html'.format(
@@ -509,7 +563,13 @@ class BillingDocumentBase(AutoCleanModelMixin, models.Model):
         for t in _templates:
             templates.append('billing_documents/' + t)
 
-        return select_template(templates)
+        template = select_template(templates)
+
+        # Templates can be edited while debugging, so they are selected every time
+        if not settings.DEBUG:
+            _pdf_templates[cache_key] = template
+
+        return template
 
     def get_pdf_filename(self):
         return '{doc_type}_{series}-{number}.pdf'.format(
@@ -625,14 +685,13 @@ class BillingDocumentBase(AutoCleanModelMixin, models.Model):
     def amount_to_be_charged_in_transaction_currency(self):
         Transaction = apps.get_model('silver.Transaction')
 
-        return self.total_in_transaction_currency - sum([
-            transaction.amount
-            for transaction in self.transactions.filter(state__in=[
-                Transaction.States.Initial,
-                Transaction.States.Pending,
-                Transaction.States.Settled
-            ])
-        ])
+        charged_amount = self.transactions.filter(state__in=[
+            Transaction.States.Initial,
+            Transaction.States.Pending,
+            Transaction.States.Settled
+        ]).aggregate(amount=Sum('amount'))['amount']
+
+        return self.total_in_transaction_currency - (charged_amount or Decimal('0.00'))
 
 
 def create_transaction_for_document(document):
@@ -689,3 +748,11 @@ def post_document_save(sender, instance, created=False, **kwargs):
 
     # Generate a PDF
     document.mark_for_generation()
+
+
+@receiver(post_save, sender=PDF)
+def touch_pdf_documents(sender, instance, created=False, **kwargs):
+    if created or kwargs.get('raw', False):
+        return
+
+    BillingDocumentBase.objects.filter(pdf=instance).touch()
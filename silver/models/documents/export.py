@@ -0,0 +1,230 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import logging
+import shutil
+import uuid
+import zipfile
+from itertools import islice
+from tempfile import SpooledTemporaryFile, TemporaryFile
+
+from PyPDF2 import PdfFileReader, PdfFileMerger
+
+from django.conf import settings
+from django.core.files import File
+from django.db import models
+from django.db.models import JSONField
+from django.utils import timezone
+
+from silver.models.documents.base import BillingDocumentBase
+from silver.models.documents.pdf import get_storage, PDF_SPOOL_MAX_SIZE
+
+
+logger = logging.getLogger(__name__)
+
+# The merger holds the objects of all the merged pages in memory while writing the merged PDF,
+# so the number of documents exported as a merged PDF is limited. Larger exports should be done
+# as ZIP archives.
+MAX_PDF_EXPORT_DOCUMENTS = getattr(settings, 'SILVER_DOCUMENTS_EXPORT_MAX_PDF_DOCUMENTS', 1000)
+
+# The number of documents whose PDFs are merged (and kept open) at once
+PDF_EXPORT_CHUNK_SIZE = 50
+
+
+class ExportFormats(models.TextChoices):
+    PDF = 'pdf', 'Merged PDF'
+    ZIP = 'zip', 'ZIP archive'
+
+
+class ExportStates(models.TextChoices):
+    PENDING = 'pending'
+    DONE = 'done'
+    FAILED = 'failed'
+
+
+def get_export_upload_path(instance, filename):
+    return '{prefix}exports/{filename}'.format(
+        prefix=getattr(settings, 'SILVER_DOCUMENT_PREFIX', ''), filename=filename
+    )
+
+
+class DocumentsExport(models.Model):
+    """
+    A bundle of billing documents PDFs, built in the background from the PDFs in the documents'
+    storage and uploaded to the same storage.
+    """
+
+    FORMATS = ExportFormats
+    STATES = ExportStates
+
+    uuid = models.UUIDField(default=uuid.uuid4, unique=True)
+    export_format = models.CharField(choices=FORMATS.choices, max_length=8, default=FORMATS.PDF)
+    state = models.CharField(choices=STATES.choices, max_length=8, default=STATES.PENDING,
+                             db_index=True)
+    document_ids = JSONField(default=list)
+    export_file = models.FileField(null=True, blank=True, editable=False,
+                                   storage=get_storage(), upload_to=get_export_upload_path)
+    exported_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ('-created_at', )
+
+    @property
+    def url(self):
+        return self.export_file.url if self.export_file else None
+
+    @property
+    def filename(self):
+        return 'Billing-Documents-{created_at}.{extension}'.format(
+            created_at=self.created_at.strftime('%Y-%m-%d-%H%M%S'),
+            extension=self.export_format
+        )
+
+    def _documents(self):
+        documents = BillingDocumentBase.objects.filter(
+            id__in=self.document_ids
+        ).select_related('pdf').order_by('id')
+
+        # the documents are fetched in chunks, so they're not held in memory at once
+        return documents.iterator(chunk_size=100)
+
+    def _export_failed(self, document, reason=None):
+        self.failed_count += 1
+
+        if reason:
+            logger.error('Could not export the PDF of document with id=%s: %s.',
+                         document.id, reason)
+        else:
+            logger.error('Encountered exception while exporting the PDF of document '
+                         'with id=%s.', document.id, exc_info=True)
+
+    def _has_pdf_file(self, document):
+        if document.pdf and document.pdf.pdf_file:
+            return True
+
+        # e.g. the PDF hasn't been generated yet
+        self._export_failed(document, 'the document has no PDF file')
+        return False
+
+    def _export_zip(self, export_file_object):
+        with zipfile.ZipFile(export_file_object, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for document in self._documents():
+                if not self._has_pdf_file(document):
+                    continue
+
+                try:
+                    # the PDFs keep their storage paths, which are unique, unlike their filenames
+                    with document.pdf.pdf_file.open('rb') as pdf_file, \
+                            archive.open(document.pdf.pdf_file.name, 'w') as archived_file:
+                        shutil.copyfileobj(pdf_file, archived_file)
+                except Exception:
+                    self._export_failed(document)
+                else:
+                    self.exported_count += 1
+
+    def _merge_documents_pdfs(self, documents):
+        """
+        Merges the PDFs of the documents into a new temporary file. The merger reads the pages
+        lazily, so the PDFs are copied from the storage to temporary files which are kept open
+        until the merged file is written.
+        """
+
+        merger = PdfFileMerger()
+        pdf_copies = []
+
+        try:
+            for document in documents:
+                if not self._has_pdf_file(document):
+                    continue
+
+                pdf_copy = TemporaryFile()
+                pdf_copies.append(pdf_copy)
+                try:
+                    with document.pdf.pdf_file.open('rb') as pdf_file:
+                        shutil.copyfileobj(pdf_file, pdf_copy)
+
+                    merger.append(PdfFileReader(pdf_copy))
+                except Exception:
+                    self._export_failed(document)
+                else:
+                    self.exported_count += 1
+
+            merged_file = TemporaryFile()
+            try:
+                merger.write(merged_file)
+            except Exception:
+                merged_file.close()
+                raise
+        finally:
+            merger.close()
+            for pdf_copy in pdf_copies:
+                pdf_copy.close()
+
+        return merged_file
+
+    def _export_pdf(self, export_file_object):
+        if len(self.document_ids) > MAX_PDF_EXPORT_DOCUMENTS:
+            raise ValueError('At most {} documents can be exported as a merged PDF.'.format(
+                MAX_PDF_EXPORT_DOCUMENTS
+            ))
+
+        # The PDFs are merged in chunks, so that the number of open files doesn't grow with the
+        # number of documents, and the chunks are merged into the export file at the end.
+        documents = self._documents()
+        documents_chunks = iter(lambda: list(islice(documents, PDF_EXPORT_CHUNK_SIZE)), [])
+        chunks_files = []
+        merger = PdfFileMerger()
+
+        try:
+            for documents_chunk in documents_chunks:
+                chunks_files.append(self._merge_documents_pdfs(documents_chunk))
+
+            for chunk_file in chunks_files:
+                merger.append(PdfFileReader(chunk_file))
+
+            merger.write(export_file_object)
+        finally:
+            merger.close()
+            for chunk_file in chunks_files:
+                chunk_file.close()
+
+    def export(self):
+        self.exported_count = self.failed_count = 0
+
+        try:
+            with SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE) as export_file_object:
+                if self.export_format == self.FORMATS.ZIP:
+                    self._export_zip(export_file_object)
+                else:
+                    self._export_pdf(export_file_object)
+
+                export_file_object.seek(0)
+                self.export_file.save(self.filename, File(export_file_object), False)
+        except Exception:
+            logger.error('Encountered exception while exporting documents for export with '
+                         'id=%s.', self.id, exc_info=True)
+            self.state = self.STATES.FAILED
+        else:
+            self.state = self.STATES.DONE
+
+        self.finished_at = timezone.now()
+        self.save()
+
+    def __str__(self):
+        return self.filename
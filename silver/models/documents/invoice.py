@@ -136,3 +136,5 @@ def post_invoice_save(sender, instance, created=False, **kwargs):
     if proforma:
         Transaction.objects.filter(proforma=proforma).update(invoice=invoice)
         BillingLog.objects.filter(proforma=proforma).update(invoice=invoice)
+        # the proforma's transactions now point to the invoice as well
+        BillingDocumentBase.objects.touch([proforma])
@@ -14,25 +14,28 @@
 
 from __future__ import absolute_import
 
+import hashlib
 import logging
 import uuid
-from io import BytesIO, SEEK_SET
-
-from xhtml2pdf import pisa
+from io import SEEK_SET
+from tempfile import SpooledTemporaryFile
 
 from django.conf import settings
 from django.db import transaction
 from django.db.models import (
-    Model, FileField, TextField, UUIDField, PositiveIntegerField, F, IntegerField
+    Model, FileField, TextField, UUIDField, PositiveIntegerField, F, IntegerField, CharField
 )
 from django.db.models.functions import Greatest, Cast
 from django.utils.module_loading import import_string
 from django.core.files import File
 
-from silver.utils.pdf import fetch_resources
+from silver.pdf_renderers import get_pdf_renderer, PDFRenderingError
 
 logger = logging.getLogger(__name__)
 
+# PDFs larger than this (in bytes) are spooled to a temporary file instead of being kept in memory
+PDF_SPOOL_MAX_SIZE = getattr(settings, 'SILVER_PDF_SPOOL_MAX_SIZE', 1024 * 1024)
+
 
 def get_storage():
     storage_settings = getattr(settings, 'SILVER_DOCUMENT_STORAGE', None)
@@ -51,49 +54,89 @@ class PDF(Model):
     uuid = UUIDField(default=uuid.uuid4, unique=True)
     pdf_file = FileField(null=True, blank=True, editable=False,
                          storage=get_storage(), upload_to=get_upload_path)
-    dirty = PositiveIntegerField(default=0)
+    dirty = PositiveIntegerField(default=0, db_index=True)
     upload_path = TextField(null=True, blank=True)
+    content_hash = CharField(max_length=64, null=True, blank=True, editable=False,
+                             help_text='The SHA-256 hash of the HTML the PDF was generated from.')
+    skipped_generations = PositiveIntegerField(
+        default=0, editable=False,
+        help_text='How many times the generation was skipped, because the HTML was unchanged.'
+    )
 
     @property
     def url(self):
         return self.pdf_file.url if self.pdf_file else None
 
+    @staticmethod
+    def get_content_hash(html, renderer):
+        """
+        Hashes the HTML along with what else the PDF depends on: the renderer and the
+        `SILVER_PDF_CONTENT_VERSION` setting, which is meant to be changed whenever the
+        resources linked from the HTML (stylesheets, images, fonts) change.
+        """
+
+        content_hash = hashlib.sha256()
+        for part in (renderer.identifier.encode('UTF-8'),
+                     str(getattr(settings, 'SILVER_PDF_CONTENT_VERSION', '')).encode('UTF-8'),
+                     html):
+            content_hash.update(part)
+            content_hash.update(b'\0')
+
+        return content_hash.hexdigest()
+
     def generate(self, template, context, upload=True):
-        html = template.render(context)
-        pdf_file_object = BytesIO()
-        pisa_status = pisa.pisaDocument(
-            src=BytesIO(html.encode("UTF-8")),
-            dest=pdf_file_object,
-            encoding='UTF-8',
-            link_callback=fetch_resources
-        )
-
-        if pisa_status.err:
+        html = template.render(context).encode("UTF-8")
+        renderer = get_pdf_renderer()
+
+        content_hash = self.get_content_hash(html, renderer)
+        if upload and self.pdf_file and content_hash == self.content_hash:
+            # The uploaded PDF has already been generated from the same HTML
+            self.skip_generation()
+            return
+
+        pdf_file_object = SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
+        try:
+            renderer.render(html, pdf_file_object)
+        except PDFRenderingError as error:
+            pdf_file_object.close()
             logger.error(
-                'xhtml2pdf encountered exception during generation of pdf %s: %s',
+                'Encountered exception during generation of pdf %s: %s',
                 context['filename'],
-                pisa_status.err
+                error
             )
             return
 
         if upload:
             self.upload(
                 pdf_file_object=pdf_file_object,
-                filename=context['filename']
+                filename=context['filename'],
+                content_hash=content_hash
             )
 
         return pdf_file_object
 
-    def upload(self, pdf_file_object, filename):
+    def upload(self, pdf_file_object, filename, content_hash=None):
         # the PDF's upload_path attribute needs to be set before calling this method
 
         # set offset to beginning to fix bug with google cloud storage
         pdf_file_object.seek(0, SEEK_SET)
+        # the storage reads the file in chunks, so it's never loaded in memory at once
         django_file = File(pdf_file_object)
         with transaction.atomic():
+            self.content_hash = content_hash
             self.pdf_file.save(filename, django_file, True)
             self.mark_as_clean()
 
+    def skip_generation(self):
+        logger.info('Skipped generation of unchanged pdf %s.', self.id)
+
+        with transaction.atomic():
+            PDF.objects.filter(id=self.id).update(
+                skipped_generations=F('skipped_generations') + 1
+            )
+            self.refresh_from_db(fields=['skipped_generations'])
+            self.mark_as_clean()
+
     def mark_as_dirty(self):
         with transaction.atomic():
             PDF.objects.filter(id=self.id).update(dirty=Greatest(F('dirty') + 1, 1))
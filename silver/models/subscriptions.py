@@ -35,7 +35,9 @@ from model_utils import Choices
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
-from django.db.models.signals import pre_delete
+from django.db import transaction as db_transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.template.loader import render_to_string
 from django.utils import timezone
@@ -71,6 +73,18 @@ class MeteredFeatureUnitsLog(models.Model):
     class Meta:
         unique_together = ('metered_feature', 'subscription', 'start_datetime', 'end_datetime',
                            'annotation')
+        indexes = [
+            # Billing and usage reads filter by subscription and metered feature, followed by a
+            # datetime range. Keeping consumed_units and annotation in the index allows these
+            # lookups to be answered without touching the table rows.
+            models.Index(fields=['subscription', 'metered_feature', 'start_datetime',
+                                 'end_datetime', 'consumed_units', 'annotation'],
+                         name='mf_log_usage_range_idx'),
+            # Used when matching (or extending) an annotated log within a bucket.
+            models.Index(fields=['subscription', 'metered_feature', 'annotation',
+                                 'start_datetime'],
+                         name='mf_log_annotation_range_idx'),
+        ]
 
     def clean(self):
         super(MeteredFeatureUnitsLog, self).clean()
@@ -120,6 +134,39 @@ class MeteredFeatureUnitsLog(models.Model):
         return self.metered_feature.name
 
 
+class MeteredFeatureUnitsLogArchive(models.Model):
+    """
+    Raw metered feature units logs which have been collapsed into a rollup log by
+    `Subscription.compact_mf_log_entries`.
+    """
+
+    log_id = models.IntegerField(help_text='The id of the original units log.')
+    metered_feature = models.ForeignKey('MeteredFeature', related_name='archived_consumed',
+                                        on_delete=models.CASCADE)
+    subscription = models.ForeignKey('Subscription', related_name='archived_mf_log_entries',
+                                     on_delete=models.CASCADE)
+    consumed_units = models.DecimalField(max_digits=19, decimal_places=4)
+    start_datetime = models.DateTimeField()
+    end_datetime = models.DateTimeField()
+    annotation = models.CharField(max_length=256, null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def from_log(cls, log):
+        return cls(
+            log_id=log.id,
+            metered_feature_id=log.metered_feature_id,
+            subscription_id=log.subscription_id,
+            consumed_units=log.consumed_units,
+            start_datetime=log.start_datetime,
+            end_datetime=log.end_datetime,
+            annotation=log.annotation,
+        )
+
+    def __str__(self):
+        return self.metered_feature.name
+
+
 @dataclass
 class OverageInfo:
     extra_consumed_units: Decimal
@@ -504,6 +551,30 @@ class Subscription(models.Model):
 
         return buckets
 
+    def metered_features_buckets(self, start_date, end_date):
+        """
+        Yields the metered features buckets overlapping the given interval, as
+        (start_date, end_date) tuples.
+        """
+
+        if not self.start_date:
+            return
+
+        reference_date = max(start_date, self.start_date)
+        while reference_date <= end_date:
+            bucket_start_date = self.bucket_start_date(reference_date,
+                                                       origin_type=OriginType.MeteredFeature)
+            bucket_end_date = self.bucket_end_date(reference_date,
+                                                   origin_type=OriginType.MeteredFeature)
+
+            if bucket_start_date is None or bucket_end_date is None or \
+                    bucket_end_date < reference_date:
+                return
+
+            yield bucket_start_date, bucket_end_date
+
+            reference_date = bucket_end_date + ONE_DAY
+
     def current_billing_cycle(self):
         if self.state in [self.STATES.ENDED, self.STATES.INACTIVE]:
             return {}
@@ -719,6 +790,93 @@ class Subscription(models.Model):
                        Subscription.STATES.ENDED]
         ).count() == 0
 
+    def compact_mf_log_entries(self):
+        """
+        Collapses the metered feature units logs of the buckets that have already been billed
+        and can no longer be updated into a single rollup log per (metered feature, annotation).
+        The collapsed logs are moved to the MeteredFeatureUnitsLogArchive table.
+
+        :returns: the number of archived logs.
+        :rtype: int
+        """
+
+        if not self.start_date or not self.last_billing_log:
+            return 0
+
+        billed_up_to = self.billed_up_to_dates['metered_features_billed_up_to']
+        billed_up_to_datetime = datetime.combine(
+            billed_up_to, datetime.max.time(), tzinfo=timezone.utc
+        ).replace(microsecond=0)
+
+        first_log_entry = self.mf_log_entries.filter(
+            end_datetime__lte=billed_up_to_datetime
+        ).order_by('start_datetime').first()
+        if not first_log_entry:
+            return 0
+
+        updateable_buckets = self.updateable_buckets()
+
+        archived_count = 0
+        for start_date, end_date in self.metered_features_buckets(
+            first_log_entry.start_datetime.date(), billed_up_to
+        ):
+            if end_date > billed_up_to:
+                break
+
+            if {'start_date': start_date, 'end_date': end_date} not in updateable_buckets:
+                archived_count += self._compact_mf_log_entries_bucket(start_date, end_date)
+
+        return archived_count
+
+    def _compact_mf_log_entries_bucket(self, start_date, end_date):
+        start_datetime = datetime.combine(start_date, datetime.min.time(), tzinfo=timezone.utc)
+        end_datetime = datetime.combine(
+            end_date, datetime.max.time(), tzinfo=timezone.utc
+        ).replace(microsecond=0)
+
+        log_entries = self.mf_log_entries.filter(
+            start_datetime__gte=start_datetime,
+            end_datetime__lte=end_datetime
+        )
+
+        groups = log_entries.values(
+            'metered_feature', 'annotation'
+        ).annotate(count=Count('id')).filter(count__gt=1).order_by()
+
+        archived_count = 0
+        for group in groups:
+            if group['annotation'] is None:
+                annotation_filter = {'annotation__isnull': True}
+            else:
+                annotation_filter = {'annotation': group['annotation']}
+
+            with db_transaction.atomic():
+                logs = list(
+                    log_entries.select_for_update().filter(
+                        metered_feature=group['metered_feature'], **annotation_filter
+                    )
+                )
+                if len(logs) < 2:
+                    continue
+
+                MeteredFeatureUnitsLogArchive.objects.bulk_create(
+                    [MeteredFeatureUnitsLogArchive.from_log(log) for log in logs]
+                )
+                MeteredFeatureUnitsLog.objects.filter(id__in=[log.id for log in logs]).delete()
+
+                MeteredFeatureUnitsLog.objects.create(
+                    metered_feature_id=group['metered_feature'],
+                    subscription=self,
+                    start_datetime=min(log.start_datetime for log in logs),
+                    end_datetime=max(log.end_datetime for log in logs),
+                    consumed_units=sum(log.consumed_units for log in logs),
+                    annotation=group['annotation'],
+                )
+
+            archived_count += len(logs)
+
+        return archived_count
+
     @property
     def applied_discounts(self):
         Discount = apps.get_model('silver.Discount')
@@ -1004,11 +1162,12 @@ class Subscription(models.Model):
 
             unit = self._entry_unit(context)
 
-            qs = self.mf_log_entries.filter(metered_feature=metered_feature,
-                                            start_datetime__gte=start_datetime,
-                                            end_datetime__lte=end_datetime)
-            log = [qs_item.consumed_units for qs_item in qs]
-            total_consumed_units = sum(log)
+            consumed_units = self.mf_log_entries.filter(
+                metered_feature=metered_feature,
+                start_datetime__gte=start_datetime,
+                end_datetime__lte=end_datetime
+            ).values_list('consumed_units', flat=True)
+            total_consumed_units = sum(consumed_units)
 
             mf_bonuses = [bonus for bonus in bonuses if bonus.applies_to_metered_feature(metered_feature)]
 
@@ -1143,16 +1302,17 @@ class Subscription(models.Model):
                                   start_datetime, end_datetime, bonuses=None) -> OverageInfo:
         included_units = extra_proration_fraction * Fraction(metered_feature.included_units or Decimal(0))
 
-        log_entries = self.mf_log_entries.filter(
+        # Only the columns covered by the usage range index are fetched
+        log_entries = list(self.mf_log_entries.filter(
             metered_feature=metered_feature,
             start_datetime__gte=start_datetime,
             end_datetime__lte=end_datetime
-        )
+        ).values_list('consumed_units', 'annotation'))
 
-        consumed_units = [entry.consumed_units for entry in log_entries]
+        consumed_units = [units for units, annotation in log_entries]
         total_consumed_units = reduce(lambda x, y: x + y, consumed_units, 0)
 
-        annotations = list({log_entry.annotation for log_entry in log_entries})
+        annotations = list({annotation for units, annotation in log_entries})
 
         start_date = start_datetime.date()
         end_date = end_datetime.date()
@@ -1420,3 +1580,13 @@ def cancel_billing_documents(sender, instance, **kwargs):
                     }
                 )
                 pass
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def touch_subscription_customer(sender, instance, signal, **kwargs):
+    # the customers list their subscriptions, which only changes when those are added or removed
+    if (signal is post_save and not kwargs['created']) or kwargs.get('raw', False):
+        return
+
+    Customer.objects.filter(pk=instance.customer_id).update(updated_at=timezone.now())
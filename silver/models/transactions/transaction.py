@@ -25,14 +25,14 @@ from django_fsm import FSMField
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models, transaction
-from django.db.models import Q, JSONField
+from django.db.models import JSONField
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.encoding import force_str
 from django.utils.translation import gettext_lazy as _
 
-from silver.models import Invoice, Proforma
+from silver.models import BillingDocumentBase, Invoice, Proforma
 from silver.models.transactions.codes import FAIL_CODES, REFUND_CODES, CANCEL_CODES
 from silver.utils.international import currencies
 from silver.utils.models import AutoDateTimeField, AutoCleanModelMixin
@@ -55,6 +55,11 @@ class Transaction(AutoCleanModelMixin, models.Model):
 
     class Meta:
         ordering = ['-id']
+        indexes = [
+            # used to select the pending transactions whose status is due to be fetched
+            models.Index(fields=['state', 'next_status_poll_at'],
+                         name='transaction_status_poll_idx'),
+        ]
 
     class States:
         Initial = 'initial'
@@ -107,6 +112,9 @@ class Transaction(AutoCleanModelMixin, models.Model):
         null=True, blank=True
     )
 
+    next_status_poll_at = models.DateTimeField(null=True, blank=True, editable=False)
+    status_polls_count = models.PositiveIntegerField(default=0, editable=False)
+
     strict_fields = [amount, currency, payment_method]
 
     @property
@@ -125,6 +133,13 @@ class Transaction(AutoCleanModelMixin, models.Model):
     def process(self):
         pass
 
+    @locking_atomic_transition(field=state, source=States.Pending, target=States.Initial)
+    def revert_processing(self):
+        """
+        Reverts a processed transaction which couldn't be submitted to the payment gateway,
+        so that it gets executed again.
+        """
+
     @locking_atomic_transition(field=state,
                                source=[States.Initial, States.Pending], target=States.Settled)
     def settle(self):
@@ -150,18 +165,39 @@ class Transaction(AutoCleanModelMixin, models.Model):
     @transaction.atomic()
     def save(self, *args, **kwargs):
         if not self.pk:
-            # Creating a new Transaction, so we lock the DB rows for related billing documents and
-            # transactions
-            if self.proforma:
-                Proforma.objects.select_for_update().filter(pk=self.proforma.pk)
-            elif self.invoice:
-                Invoice.objects.select_for_update().filter(pk=self.invoice.pk)
+            # Creating a new Transaction, so the transactions of its billing documents are
+            # created one at a time, which keeps them from overcharging the documents
+            self._lock_documents()
 
-            Transaction.objects.select_for_update().filter(Q(proforma=self.proforma) |
-                                                           Q(invoice=self.invoice))
+            if self.is_cleaned:
+                # The amount was validated before the lock was taken
+                self._validate_amount()
 
         super(Transaction, self).save(*args, **kwargs)
 
+    def _lock_documents(self):
+        """
+        Locks the rows of the transaction's billing document and of its related document, with a
+        single query. Both are locked, because a transaction may be created for either of them.
+        """
+
+        document_ids = set()
+        for document in (self.invoice, self.proforma):
+            if document:
+                document_ids.update([document.pk, document.related_document_id])
+        document_ids.discard(None)
+
+        # The rows are locked in the same order by all the transactions, to avoid deadlocks
+        list(BillingDocumentBase.objects.select_for_update().filter(
+            pk__in=document_ids
+        ).order_by('pk').values_list('pk', flat=True))
+
+    def _validate_amount(self):
+        if self.amount > self.document.amount_to_be_charged_in_transaction_currency:
+            message = "Amount is greater than the amount that should be charged in order " \
+                      "to pay the billing document."
+            raise ValidationError(message)
+
     def clean(self):
         # Validate documents
         document = self.document
@@ -178,7 +214,7 @@ class Transaction(AutoCleanModelMixin, models.Model):
             )
 
         if self.invoice and self.proforma:
-            if self.invoice.related_document != self.proforma:
+            if self.invoice.related_document_id != self.proforma.pk:
                 raise ValidationError('Invoice and proforma are not related.')
         else:
             if self.invoice:
@@ -186,7 +222,7 @@ class Transaction(AutoCleanModelMixin, models.Model):
             else:
                 self.invoice = self.proforma.related_document
 
-        if document.customer != self.customer:
+        if document.customer_id != self.payment_method.customer_id:
             raise ValidationError(
                 'Customer doesn\'t match with the one in documents.'
             )
@@ -214,10 +250,7 @@ class Transaction(AutoCleanModelMixin, models.Model):
                           )
                 raise ValidationError(message)
             if self.amount:
-                if self.amount > self.document.amount_to_be_charged_in_transaction_currency:
-                    message = "Amount is greater than the amount that should be charged in order " \
-                              "to pay the billing document."
-                    raise ValidationError(message)
+                self._validate_amount()
             else:
                 self.amount = self.document.amount_to_be_charged_in_transaction_currency
         else:
@@ -302,6 +335,11 @@ def post_transaction_save(sender, instance, **kwargs):
     if hasattr(transaction, '.cleaned'):
         delattr(transaction, '.cleaned')
 
+    # the documents list their transactions
+    BillingDocumentBase.objects.touch([
+        document for document in (transaction.invoice, transaction.proforma) if document
+    ])
+
     if not getattr(transaction, 'previous_instance', None):
         # we know this instance is freshly made as it doesn't have an old_value
         logger.info('[Models][Transaction]: %s', {
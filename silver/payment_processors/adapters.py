@@ -0,0 +1,112 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+
+from silver.payment_processors.mixins import AsyncProcessorMixin
+
+
+class SyncProcessorAdapter(AsyncProcessorMixin):
+    """
+        Exposes the asyncio interface of a blocking payment processor, by running its
+        methods in a pool of up to `max_workers` threads (by default, the pool size chosen by
+        ThreadPoolExecutor). Any other attribute is looked up on the adapted processor.
+
+        The threads keep their database connections between calls, so the adapter must be
+        closed once it's no longer used.
+    """
+
+    def __init__(self, payment_processor, max_workers=None):
+        self.payment_processor = payment_processor
+        self.max_workers = max_workers
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def __getattr__(self, name):
+        return getattr(self.payment_processor, name)
+
+    def _call(self, method, *args):
+        with self._lock:
+            self._connections.extend(connection for connection in connections.all()
+                                     if connection not in self._connections)
+
+        return method(*args)
+
+    async def _run_in_thread(self, method, *args):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='silver-processor')
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(self._executor, self._call, method, *args)
+
+    def close(self):
+        """
+            Stops the threads and closes their database connections.
+        """
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+            thread_connections, self._connections = self._connections, []
+
+        if executor:
+            executor.shutdown(wait=True)
+
+        for connection in thread_connections:
+            # the connections belong to the (stopped) threads of the pool
+            connection.inc_thread_sharing()
+            try:
+                connection.close()
+            finally:
+                connection.dec_thread_sharing()
+
+    async def execute_transaction_async(self, transaction):
+        return await self._run_in_thread(self.payment_processor.execute_transaction, transaction)
+
+    async def fetch_transaction_status_async(self, transaction):
+        return await self._run_in_thread(self.payment_processor.fetch_transaction_status,
+                                         transaction)
+
+    async def refund_transaction_async(self, transaction, payment_method=None):
+        args = (transaction, payment_method) if payment_method else (transaction, )
+
+        return await self._run_in_thread(self.payment_processor.refund_transaction, *args)
+
+    async def void_transaction_async(self, transaction, payment_method=None):
+        args = (transaction, payment_method) if payment_method else (transaction, )
+
+        return await self._run_in_thread(self.payment_processor.void_transaction, *args)
+
+    def __repr__(self):
+        return repr(self.payment_processor)
+
+    def __str__(self):
+        return str(self.payment_processor)
+
+
+def as_async_processor(payment_processor, max_workers=None):
+    if isinstance(payment_processor, AsyncProcessorMixin):
+        return payment_processor
+
+    return SyncProcessorAdapter(payment_processor, max_workers=max_workers)
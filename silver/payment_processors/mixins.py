@@ -28,6 +28,24 @@ class PaymentProcessorTypes(object):
     Triggered = "triggered"
 
 
+class TransientPaymentProcessorError(Exception):
+    """
+        Raised by the payment processors when a request to the payment gateway failed
+        without any effect (e.g. it was rate limited or the gateway was unreachable),
+        so it is safe to retry it.
+
+        When raised by a batch method (e.g. `execute_transactions`) after some of the
+        transactions have been handled, `results` must map those transactions to their
+        results, so that only the rest of them are retried.
+    """
+
+    def __init__(self, message=None, retry_after=None, results=None):
+        super(TransientPaymentProcessorError, self).__init__(message)
+
+        self.retry_after = retry_after
+        self.results = results or {}
+
+
 class ManualProcessorMixin(object):
     type = PaymentProcessorTypes.Manual
 
@@ -62,6 +80,11 @@ class BaseActionableProcessor(object):
             Makes sure the transaction hasn't been processed before and calls the
             execute_transaction method.
 
+            It's called by the transactions executor for the processors executing the
+            transactions one at a time (`transactions_batch_size` of 1), without the asyncio
+            runner. When it fails with TransientPaymentProcessorError, the transaction is
+            reverted to the initial state before being retried.
+
             :return: True on success, False on failure.
         """
         try:
@@ -73,6 +96,43 @@ class BaseActionableProcessor(object):
 
         return self.execute_transaction(transaction)
 
+    # The maximum number of transactions passed at once to execute_transactions
+    transactions_batch_size = 1
+
+    def execute_transactions(self, transactions):
+        """
+            :param transactions: A list of at most `transactions_batch_size` Silver Transaction
+            objects in pending state, that haven't been executed before.
+
+            Implementation is optional. Payment processors whose gateway accepts batches of
+            transactions can override this method (and `transactions_batch_size`) to create the
+            external transactions in a single request. It's only called by the transactions
+            executor when `transactions_batch_size` is greater than 1, `process_transaction`
+            being called otherwise.
+
+            Warning: Like `execute_transaction`, it should never be called for transactions that
+                     haven't been processed before.
+
+            A TransientPaymentProcessorError is retried for the transactions missing from its
+            `results`, so it must only be raised before those transactions had any effect on
+            the gateway. Implementations which can't guarantee that should raise a different
+            exception instead.
+
+            :return: A dict mapping each transaction to True on success, False on failure.
+        """
+
+        results = {}
+        for transaction in transactions:
+            try:
+                results[transaction] = self.execute_transaction(transaction)
+            except TransientPaymentProcessorError as error:
+                # the transactions executed so far must not be executed again
+                results.update(error.results)
+                error.results = results
+                raise
+
+        return results
+
     def execute_transaction(self, transaction):
         """
             :param transaction: A Silver Transaction object in pending state, that hasn't been
@@ -109,6 +169,32 @@ class BaseActionableProcessor(object):
 
         return True
 
+    # The maximum number of transactions passed at once to fetch_transactions_status
+    transactions_status_batch_size = 1
+
+    def fetch_transactions_status(self, transactions):
+        """
+            Implementation is optional.
+
+            :param transactions: A list of at most `transactions_status_batch_size` pending
+            Silver Transaction objects that belong to this payment processor.
+
+            Payment processors whose gateway offers a bulk status endpoint can override this
+            method (and `transactions_status_batch_size`) to obtain the status of all the given
+            transactions in a single request. By default, `fetch_transaction_status` is called
+            for each transaction.
+
+            The management command and the task with the same name group the pending
+            transactions by payment processor and call this method.
+
+            :return: A dict mapping each transaction to True on success, False on failure.
+        """
+
+        return {
+            transaction: self.fetch_transaction_status(transaction)
+            for transaction in transactions
+        }
+
 
 class AutomaticProcessorMixin(BaseActionableProcessor):
     type = PaymentProcessorTypes.Automatic
@@ -123,3 +209,30 @@ class AutomaticProcessorMixin(BaseActionableProcessor):
 
 class TriggeredProcessorMixin(BaseActionableProcessor):
     type = PaymentProcessorTypes.Triggered
+
+
+class AsyncProcessorMixin(object):
+    """
+        Optional asyncio native interface, for the actionable processors whose gateway
+        client is asynchronous. It lets a single worker process keep many gateway requests
+        in flight, when the transactions are executed or their status is fetched.
+
+        The coroutines mirror the blocking methods with the same name (without the `_async`
+        suffix) and return the same values. Since Django's ORM is synchronous, they must
+        access the database (e.g. to settle or fail a transaction) only through
+        `asgiref.sync.sync_to_async`.
+
+        Blocking processors can be used through `SyncProcessorAdapter` instead.
+    """
+
+    async def execute_transaction_async(self, transaction):
+        raise NotImplementedError
+
+    async def fetch_transaction_status_async(self, transaction):
+        return True
+
+    async def refund_transaction_async(self, transaction, payment_method=None):
+        raise NotImplementedError
+
+    async def void_transaction_async(self, transaction, payment_method=None):
+        raise NotImplementedError
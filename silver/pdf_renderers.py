@@ -0,0 +1,273 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+PDF rendering backends.
+
+A renderer turns the HTML of a billing document into a PDF. The one used by
+`PDF.generate` is selected through the `SILVER_PDF_RENDERER` setting, which
+can be either the dotted path of a renderer class or, like
+`SILVER_DOCUMENT_STORAGE`, a (dotted path, args, kwargs) tuple.
+
+Running this module (`python -m silver.pdf_renderers`) starts a PDF worker,
+speaking the protocol expected by `ProcessPDFRenderer`.
+"""
+
+from __future__ import absolute_import
+
+import logging
+import os
+import struct
+import subprocess
+import sys
+import threading
+from io import BytesIO
+
+from xhtml2pdf import pisa
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from silver.utils.pdf import fetch_resources
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PDF_RENDERER = 'silver.pdf_renderers.PisaPDFRenderer'
+
+_LENGTH = struct.Struct('>Q')
+_STATUS_OK = b'\x00'
+_STATUS_ERROR = b'\x01'
+_COPY_CHUNK_SIZE = 64 * 1024
+
+
+class PDFRenderingError(Exception):
+    pass
+
+
+class BasePDFRenderer(object):
+    @property
+    def identifier(self):
+        """
+        Identifies the renderer's output, which is part of the PDFs' content hashes, so that
+        switching renderers regenerates the PDFs.
+        """
+
+        return '%s.%s' % (self.__class__.__module__, self.__class__.__qualname__)
+
+    def render(self, html, dest):
+        """
+        Writes the PDF rendered from `html` (UTF-8 encoded bytes) to the `dest` file-like object.
+        Raises PDFRenderingError if the PDF couldn't be rendered.
+        """
+
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Releases the resources held by the renderer.
+        """
+
+
+class PisaPDFRenderer(BasePDFRenderer):
+    def render(self, html, dest):
+        pisa_status = pisa.pisaDocument(
+            src=BytesIO(html),
+            dest=dest,
+            encoding='UTF-8',
+            link_callback=fetch_resources
+        )
+
+        if pisa_status.err:
+            raise PDFRenderingError(
+                'xhtml2pdf encountered {} error(s)'.format(pisa_status.err)
+            )
+
+
+class ProcessPDFRenderer(BasePDFRenderer):
+    """
+    Renders the PDFs in a long-lived worker process, which is reused across documents, so the
+    engine's startup cost is paid once and its memory is kept out of the calling process.
+
+    The worker is started with `command` and gets requests on its stdin, each consisting of the
+    length of the HTML (as an 8 bytes big-endian unsigned integer) followed by the HTML. For each
+    request it writes a status byte (0 on success) on its stdout, followed by the length of the
+    payload and the payload itself: the PDF, or the error message. Any engine (a headless browser
+    for example) can be plugged in by wrapping it in a worker speaking this protocol. The default
+    command runs a worker rendering with xhtml2pdf.
+
+    The worker is restarted after `max_documents` documents, to bound its memory growth, and
+    whenever a request fails midway.
+    """
+
+    def __init__(self, command=None, max_documents=None):
+        self.command = command or [sys.executable, '-m', 'silver.pdf_renderers']
+        self.max_documents = max_documents
+
+        self._lock = threading.Lock()
+        self._process = None
+        self._process_pid = None
+        self._rendered_count = 0
+
+    @property
+    def identifier(self):
+        return '%s %s' % (super(ProcessPDFRenderer, self).identifier, ' '.join(self.command))
+
+    def _start(self):
+        self._process = subprocess.Popen(self.command,
+                                         stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._process_pid = os.getpid()
+        self._rendered_count = 0
+
+    def _stop(self):
+        if not self._process:
+            return
+
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except Exception:
+            self._process.kill()
+            self._process.wait()
+
+        self._process = None
+
+    def _ensure_process(self):
+        if self._process and self._process_pid != os.getpid():
+            # The worker was started by the parent of this (forked) process, it can't be shared
+            self._process = None
+
+        if self._process and (
+            self._process.poll() is not None or
+            (self.max_documents and self._rendered_count >= self.max_documents)
+        ):
+            self._stop()
+
+        if not self._process:
+            self._start()
+
+    def _read(self, size):
+        data = self._process.stdout.read(size)
+        if len(data) != size:
+            raise PDFRenderingError('The PDF worker exited unexpectedly.')
+
+        return data
+
+    def _copy(self, size, dest):
+        # the PDF is copied in chunks, so it's never held in memory at once
+        while size:
+            chunk = self._read(min(size, _COPY_CHUNK_SIZE))
+            dest.write(chunk)
+            size -= len(chunk)
+
+    def render(self, html, dest):
+        with self._lock:
+            self._ensure_process()
+
+            try:
+                self._process.stdin.write(_LENGTH.pack(len(html)))
+                self._process.stdin.write(html)
+                self._process.stdin.flush()
+
+                status = self._read(1)
+                size = _LENGTH.unpack(self._read(_LENGTH.size))[0]
+                if status == _STATUS_OK:
+                    self._copy(size, dest)
+                else:
+                    error_message = self._read(size).decode('UTF-8', 'replace')
+            except BaseException as error:
+                # The worker's state is unknown, so it can't be reused
+                self._process.kill()
+                self._stop()
+
+                if isinstance(error, BrokenPipeError):
+                    raise PDFRenderingError('The PDF worker exited unexpectedly.')
+                raise
+
+            self._rendered_count += 1
+
+        if status != _STATUS_OK:
+            raise PDFRenderingError(error_message)
+
+    def close(self):
+        with self._lock:
+            self._stop()
+
+
+def serve(renderer, stdin, stdout):
+    """
+    Renders the PDFs requested on `stdin` using `renderer`, following the ProcessPDFRenderer
+    protocol, until `stdin` is closed.
+    """
+
+    while True:
+        header = stdin.read(_LENGTH.size)
+        if len(header) != _LENGTH.size:
+            return
+
+        html = stdin.read(_LENGTH.unpack(header)[0])
+
+        pdf_file_object = BytesIO()
+        try:
+            renderer.render(html, pdf_file_object)
+        except Exception as error:
+            status, payload = _STATUS_ERROR, str(error).encode('UTF-8')
+        else:
+            status, payload = _STATUS_OK, pdf_file_object.getbuffer()
+
+        stdout.write(status)
+        stdout.write(_LENGTH.pack(len(payload)))
+        stdout.write(payload)
+        stdout.flush()
+
+
+def load_pdf_renderer(renderer_settings):
+    if isinstance(renderer_settings, str):
+        return import_string(renderer_settings)()
+
+    renderer_class = import_string(renderer_settings[0])
+    return renderer_class(*renderer_settings[1], **renderer_settings[2])
+
+
+_renderer = None
+
+
+def get_pdf_renderer():
+    global _renderer
+
+    if _renderer is None:
+        _renderer = load_pdf_renderer(
+            getattr(settings, 'SILVER_PDF_RENDERER', DEFAULT_PDF_RENDERER)
+        )
+
+    return _renderer
+
+
+@receiver(setting_changed)
+def reset_pdf_renderer(setting, **kwargs):
+    global _renderer
+
+    if setting == 'SILVER_PDF_RENDERER' and _renderer is not None:
+        _renderer.close()
+        _renderer = None
+
+
+if __name__ == '__main__':
+    stdout = sys.stdout.buffer
+    # Keep anything printed by the rendering engine out of the protocol's stream
+    sys.stdout = sys.stderr
+
+    serve(PisaPDFRenderer(), sys.stdin.buffer, stdout)
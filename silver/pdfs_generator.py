@@ -0,0 +1,154 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import logging
+import multiprocessing
+import signal
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from django.db import connections
+
+from silver.models import BillingDocumentBase
+
+
+logger = logging.getLogger(__name__)
+
+
+class PDFGenerationTimeLimitExceeded(Exception):
+    pass
+
+
+def _raise_time_limit_exceeded(signum, frame):
+    raise PDFGenerationTimeLimitExceeded()
+
+
+def generate_document_pdf(document_id, document_kind, time_limit=None):
+    """
+    Generates the PDF of a single billing document. When `time_limit` (seconds) is given, the
+    generation is interrupted by a SIGALRM once the limit is exceeded, so it must only be used
+    from the main thread of a process.
+    """
+
+    if time_limit:
+        signal.signal(signal.SIGALRM, _raise_time_limit_exceeded)
+        signal.alarm(time_limit)
+
+    try:
+        document = BillingDocumentBase.objects.get(id=document_id, kind=document_kind)
+        document.generate_pdf()
+    finally:
+        if time_limit:
+            signal.alarm(0)
+
+
+def dirty_documents_ids_chunks(chunk_size):
+    """
+    Yields lists of at most `chunk_size` ids of the documents having a dirty PDF. The documents
+    are paged by id (keyset pagination), so each chunk is fetched with an index range scan.
+    """
+
+    last_document_id = 0
+    while True:
+        document_ids = list(
+            BillingDocumentBase.objects.filter(
+                pdf__dirty__gt=0, id__gt=last_document_id
+            ).order_by('id').values_list('id', flat=True)[:chunk_size]
+        )
+        if not document_ids:
+            return
+
+        yield document_ids
+
+        last_document_id = document_ids[-1]
+
+
+def generate_documents_pdfs(document_ids):
+    """
+    Generates the PDFs of the given documents, loading the documents, their PDF objects, their
+    providers and customers (used by the templates) and their entries in bulk.
+    """
+
+    documents = BillingDocumentBase.objects.filter(
+        id__in=document_ids, pdf__dirty__gt=0
+    ).select_related(
+        'pdf', 'provider', 'customer'
+    ).prefetch_related('invoice_entries', 'proforma_entries')
+
+    for document in documents:
+        try:
+            document.generate_pdf()
+        except Exception:
+            logger.error('Encountered exception while generating PDF for document '
+                         'with id=%s.', document.id, exc_info=True)
+
+
+def generate_pdfs_in_process_pool(documents, workers, time_limit=None, max_in_flight=None):
+    """
+    Generates the PDFs of the given documents using a pool of `workers` processes.
+
+    :param documents: an iterable of (document_id, document_kind) tuples. It is consumed lazily,
+        so at most `max_in_flight` documents are submitted to the pool at a time. It must not
+        rely on an open database cursor, since the connections are closed before forking.
+    :param workers: the number of processes in the pool.
+    :param time_limit: the maximum number of seconds spent generating a single PDF.
+    :param max_in_flight: defaults to twice the number of workers.
+    :returns: a tuple consisting of the number of generated PDFs and the list of ids of the
+        documents whose PDF couldn't be generated.
+    """
+
+    max_in_flight = max_in_flight or workers * 2
+
+    generated_count = 0
+    failed_document_ids = []
+
+    documents = iter(documents)
+    in_flight = {}
+
+    # The forked workers must open their own database connections
+    connections.close_all()
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('fork')) as executor:
+        while True:
+            for document_id, document_kind in documents:
+                future = executor.submit(generate_document_pdf,
+                                         document_id, document_kind, time_limit)
+                in_flight[future] = document_id
+
+                if len(in_flight) >= max_in_flight:
+                    break
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                document_id = in_flight.pop(future)
+                try:
+                    future.result()
+                except PDFGenerationTimeLimitExceeded:
+                    failed_document_ids.append(document_id)
+                    logger.error('PDF generation time limit exceeded for document with id=%s.',
+                                 document_id)
+                except Exception:
+                    failed_document_ids.append(document_id)
+                    logger.error('Encountered exception while generating PDF for document '
+                                 'with id=%s.', document_id, exc_info=True)
+                else:
+                    generated_count += 1
+
+    return generated_count, failed_document_ids
@@ -14,8 +14,6 @@
 
 from __future__ import absolute_import
 
-from itertools import chain
-
 from celery import group, shared_task
 from celery_once import QueueOnce
 from redis.exceptions import LockError
@@ -24,8 +22,15 @@ from django.conf import settings
 from django.utils import timezone
 
 from silver.documents_generator import DocumentsGenerator
-from silver.models import Invoice, Proforma, Transaction, BillingDocumentBase, Customer
+from silver.models import (
+    Transaction, BillingDocumentBase, Customer, Subscription, DocumentsExport
+)
 from silver.payment_processors.mixins import PaymentProcessorTypes
+from silver.pdfs_generator import dirty_documents_ids_chunks, generate_documents_pdfs
+from silver.transactions_executor import (
+    executable_transactions_by_processor, execute_processor_transactions,
+    pending_transactions_by_processor, fetch_processor_transactions_status, split_in_task_chunks
+)
 from silver.vendors.redis_server import redis
 
 
@@ -41,14 +46,36 @@ def generate_pdf(document_id, document_type):
     document.generate_pdf()
 
 
+PDF_GENERATION_CHUNK_SIZE = getattr(settings, 'PDF_GENERATION_CHUNK_SIZE', 50)
+
+
+@shared_task(base=QueueOnce, once={'graceful': True},
+             time_limit=PDF_GENERATION_TIME_LIMIT * PDF_GENERATION_CHUNK_SIZE)
+def generate_pdfs_chunk(document_ids):
+    generate_documents_pdfs(document_ids)
+
+
 @shared_task(ignore_result=True)
 def generate_pdfs():
-    dirty_documents = chain(Invoice.objects.filter(pdf__dirty__gt=0),
-                            Proforma.objects.filter(pdf__dirty__gt=0))
+    # Generate PDFs in parallel, in chunks of documents
+    group(generate_pdfs_chunk.s(document_ids)
+          for document_ids in dirty_documents_ids_chunks(PDF_GENERATION_CHUNK_SIZE))()
 
-    # Generate PDFs in parallel
-    group(generate_pdf.s(document.id, document.kind)
-          for document in dirty_documents)()
+
+DOCUMENTS_EXPORT_TIME_LIMIT = getattr(settings, 'DOCUMENTS_EXPORT_TIME_LIMIT',
+                                      60 * 30)  # default 30m
+
+
+@shared_task(base=QueueOnce, once={'graceful': True},
+             time_limit=DOCUMENTS_EXPORT_TIME_LIMIT, ignore_result=True)
+def export_documents(export_id):
+    export = DocumentsExport.objects.filter(
+        pk=export_id, state=DocumentsExport.STATES.PENDING
+    ).first()
+    if not export:
+        return
+
+    export.export()
 
 
 DOCS_GENERATION_TIME_LIMIT = getattr(settings, 'DOCS_GENERATION_TIME_LIMIT',
@@ -70,6 +97,33 @@ def generate_billing_documents(billing_date=None, customers_ids=None):
     DocumentsGenerator().generate(**generate_kwargs)
 
 
+COMPACT_MF_LOG_ENTRIES_TIME_LIMIT = getattr(settings, 'COMPACT_MF_LOG_ENTRIES_TIME_LIMIT',
+                                            60 * 10)  # default 10m
+
+
+@shared_task(base=QueueOnce, once={'graceful': True},
+             time_limit=COMPACT_MF_LOG_ENTRIES_TIME_LIMIT, ignore_result=True)
+def compact_subscription_mf_log_entries(subscription_id):
+    subscription = Subscription.objects.filter(pk=subscription_id).first()
+    if not subscription:
+        return
+
+    subscription.compact_mf_log_entries()
+
+
+@shared_task(ignore_result=True)
+def compact_mf_log_entries(subscription_ids=None):
+    billed_subscriptions = Subscription.objects.filter(billing_logs__isnull=False)
+
+    if subscription_ids:
+        billed_subscriptions = billed_subscriptions.filter(pk__in=subscription_ids)
+
+    subscription_ids = billed_subscriptions.values_list('id', flat=True).distinct()
+
+    group(compact_subscription_mf_log_entries.s(subscription_id)
+          for subscription_id in subscription_ids)()
+
+
 FETCH_TRANSACTION_STATUS_TIME_LIMIT = getattr(settings, 'FETCH_TRANSACTION_STATUS_TIME_LIMIT',
                                               60)  # default 60s
 
@@ -88,14 +142,35 @@ def fetch_transaction_status(transaction_id):
     payment_processor.fetch_transaction_status(transaction)
 
 
-@shared_task(ignore_result=True)
-def fetch_transactions_status(transaction_ids=None):
-    eligible_transactions = Transaction.objects.filter(state=Transaction.States.Pending)
+FETCH_TRANSACTIONS_STATUS_BATCH_TIME_LIMIT = getattr(
+    settings, 'FETCH_TRANSACTIONS_STATUS_BATCH_TIME_LIMIT', 60 * 30
+)  # default 30m
+
+
+@shared_task(base=QueueOnce, once={'graceful': True},
+             time_limit=FETCH_TRANSACTIONS_STATUS_BATCH_TIME_LIMIT, ignore_result=True)
+def fetch_payment_processor_transactions_status(payment_processor_name, transaction_ids):
+    transactions = pending_transactions_by_processor(transaction_ids).get(
+        payment_processor_name, []
+    )
+
+    fetch_processor_transactions_status(payment_processor_name, transactions)
 
-    if transaction_ids:
-        eligible_transactions = eligible_transactions.filter(pk__in=transaction_ids)
 
-    group(fetch_transaction_status.s(transaction.id) for transaction in eligible_transactions)()
+@shared_task(ignore_result=True)
+def fetch_transactions_status(transaction_ids=None):
+    # Fetch the status of each payment processor's transactions in chunks, in separate tasks,
+    # each made of batches, so processors offering bulk status endpoints are called once for
+    # many transactions, while the chunks can be spread over the workers
+    group(
+        fetch_payment_processor_transactions_status.s(payment_processor_name,
+                                                      transaction_ids_chunk)
+        for payment_processor_name, transactions in pending_transactions_by_processor(
+            transaction_ids
+        ).items()
+        for transaction_ids_chunk in split_in_task_chunks(payment_processor_name, transactions,
+                                                          'transactions_status_batch_size')
+    )()
 
 
 EXECUTE_TRANSACTION_TIME_LIMIT = getattr(settings, 'EXECUTE_TRANSACTION_TIME_LIMIT',
@@ -119,11 +194,30 @@ def execute_transaction(transaction_id):
     payment_processor.process_transaction(transaction)
 
 
-@shared_task(ignore_result=True)
-def execute_transactions(transaction_ids=None):
-    executable_transactions = Transaction.objects.filter(state=Transaction.States.Initial)
+EXECUTE_TRANSACTIONS_BATCH_TIME_LIMIT = getattr(settings, 'EXECUTE_TRANSACTIONS_BATCH_TIME_LIMIT',
+                                                60 * 30)  # default 30m
+
+
+@shared_task(base=QueueOnce, once={'graceful': True},
+             time_limit=EXECUTE_TRANSACTIONS_BATCH_TIME_LIMIT, ignore_result=True)
+def execute_payment_processor_transactions(payment_processor_name, transaction_ids):
+    transactions = executable_transactions_by_processor(transaction_ids).get(
+        payment_processor_name, []
+    )
+
+    execute_processor_transactions(payment_processor_name, transactions)
 
-    if transaction_ids:
-        executable_transactions = executable_transactions.filter(pk__in=transaction_ids)
 
-    group(execute_transaction.s(transaction.id) for transaction in executable_transactions)()
+@shared_task(ignore_result=True)
+def execute_transactions(transaction_ids=None):
+    # Execute the transactions of each payment processor in chunks, in separate tasks, so that
+    # they can be spread over the workers and a task hitting its time limit leaves at most a
+    # chunk of transactions behind
+    group(
+        execute_payment_processor_transactions.s(payment_processor_name, transaction_ids_chunk)
+        for payment_processor_name, transactions in executable_transactions_by_processor(
+            transaction_ids
+        ).items()
+        for transaction_ids_chunk in split_in_task_chunks(payment_processor_name, transactions,
+                                                          'transactions_batch_size')
+    )()
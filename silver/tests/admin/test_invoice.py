@@ -27,6 +27,7 @@ from django.test import TestCase, Client
 from django.utils.encoding import force_str
 
 from silver.fixtures.factories import InvoiceFactory
+from silver.models import DocumentsExport
 
 
 class InvoiceAdminTestCase(TestCase):
@@ -119,3 +120,43 @@ class InvoiceAdminTestCase(TestCase):
                 })
 
                 assert not mock_log_action.call_count
+
+    def test_export_selected_documents_action(self):
+        invoices = InvoiceFactory.create_batch(2)
+        for invoice in invoices:
+            invoice.issue()
+
+        draft_invoice = InvoiceFactory.create()
+
+        url = reverse('admin:silver_invoice_changelist')
+
+        with patch('silver.tasks.export_documents.delay') as delay_mock, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.admin.post(url, {
+                'action': 'export_selected_documents_as_zip',
+                '_selected_action': [str(invoice.pk) for invoice in invoices + [draft_invoice]]
+            })
+
+        export = DocumentsExport.objects.get()
+        assert export.export_format == DocumentsExport.FORMATS.ZIP
+        assert export.document_ids == sorted(invoice.pk for invoice in invoices)
+
+        delay_mock.assert_called_once_with(export.id)
+
+    def test_export_selected_documents_as_pdf_max_documents(self):
+        invoices = InvoiceFactory.create_batch(2)
+        for invoice in invoices:
+            invoice.issue()
+
+        url = reverse('admin:silver_invoice_changelist')
+
+        with patch('silver.admin.MAX_PDF_EXPORT_DOCUMENTS', 1), \
+                patch('silver.tasks.export_documents.delay') as delay_mock:
+            response = self.admin.post(url, {
+                'action': 'export_selected_documents_as_pdf',
+                '_selected_action': [str(invoice.pk) for invoice in invoices]
+            }, follow=True)
+
+        assert not DocumentsExport.objects.exists()
+        assert not delay_mock.called
+        assert 'Export them as ZIP instead.' in force_str(response.content)
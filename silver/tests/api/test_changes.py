@@ -0,0 +1,161 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+from datetime import timedelta
+
+from freezegun import freeze_time
+
+from django.db import transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITransactionTestCase
+
+from silver.fixtures.factories import (AdminUserFactory, InvoiceFactory,
+                                       PaymentMethodFactory, SubscriptionFactory, TransactionFactory)
+from silver.fixtures.test_fixtures import PAYMENT_PROCESSORS
+from silver.models import Change
+from silver.tests.api.utils.client import JSONApiClient
+
+
+# the changes are logged once the transactions making them commit
+@override_settings(PAYMENT_PROCESSORS=PAYMENT_PROCESSORS, SILVER_CHANGES_FEED_LAG=0)
+class TestChanges(APITransactionTestCase):
+    client_class = JSONApiClient
+
+    def setUp(self):
+        admin_user = AdminUserFactory.create()
+        self.client.force_authenticate(user=admin_user)
+
+    def test_changes_are_logged(self):
+        invoice = InvoiceFactory.create(invoice_entries=[])
+        self.assertEqual(
+            Change.objects.filter(resource='invoice').values_list('object_id', 'action')[0],
+            (str(invoice.pk), 'created')
+        )
+
+        Change.objects.all().delete()
+        url = reverse('invoice-entry-create', kwargs={'document_pk': invoice.pk})
+        response = self.client.post(url, format='json', data={
+            'description': 'Page views', 'unit_price': 10.0, 'quantity': '20.0'
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # the invoice is touched once for the request, not by the entry itself
+        invoice_change = Change.objects.get(resource='invoice')
+        self.assertEqual(invoice_change.action, Change.ACTIONS.updated)
+        self.assertEqual(invoice_change.path,
+                         reverse('invoice-detail', kwargs={'pk': invoice.pk}))
+
+        subscription = SubscriptionFactory.create()
+        subscription_pk = subscription.pk
+        subscription.delete()
+
+        self.assertEqual(
+            Change.objects.filter(resource='subscription').values_list('object_id',
+                                                                       'action').last(),
+            (str(subscription_pk), 'deleted')
+        )
+
+    def test_changes_feed(self):
+        invoice = InvoiceFactory.create()
+        invoice.issue()
+        invoice.save()
+        payment_method = PaymentMethodFactory.create(customer=invoice.customer)
+        Change.objects.all().delete()
+
+        transaction = TransactionFactory.create(payment_method=payment_method, invoice=invoice)
+        url = reverse('change-list')
+
+        response = self.client.get(url, {'resource': 'transaction,invoice'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        changes = response.data
+        self.assertEqual([(change['resource'], change['action']) for change in changes][-2:],
+                         [('transaction', 'created'), ('invoice', 'updated')])
+
+        transaction_change = changes[-2]
+        self.assertEqual(transaction_change['object_id'], str(transaction.uuid))
+        self.assertTrue(transaction_change['url'].endswith(reverse('transaction-detail', kwargs={
+            'customer_pk': transaction.customer.pk, 'transaction_uuid': transaction.uuid
+        })))
+
+        next_url = 'since=%s' % changes[-1]['id']
+        self.assertIn(next_url, response['Link'])
+
+        # the clients resume from the last change they went through
+        response = self.client.get(url, {'since': transaction_change['id'],
+                                         'resource': 'transaction,invoice'})
+        self.assertEqual([change['id'] for change in response.data], [changes[-1]['id']])
+
+        response = self.client.get(url, {'since': changes[-1]['id'],
+                                         'resource': 'transaction,invoice'})
+        self.assertEqual(response.data, [])
+        self.assertIn(next_url, response['Link'])
+
+        transaction.fail()
+
+        response = self.client.get(url, {'since': changes[-1]['id'],
+                                         'resource': 'transaction,invoice'})
+        self.assertEqual([(change['resource'], change['action']) for change in response.data],
+                         [('transaction', 'updated'), ('invoice', 'updated')])
+
+    def test_changes_feed_pages(self):
+        InvoiceFactory.create_batch(3, invoice_entries=[])
+        url = reverse('change-list')
+
+        response = self.client.get(url, {'page_size': 2})
+        self.assertEqual(len(response.data), 2)
+
+        response = self.client.get(url, {'page_size': 2, 'since': response.data[-1]['id']})
+        self.assertEqual(len(response.data), 2)
+
+    def test_changes_are_logged_on_commit(self):
+        with transaction.atomic():
+            invoice = InvoiceFactory.create(invoice_entries=[])
+            self.assertFalse(Change.objects.exists())
+
+        self.assertEqual(set(Change.objects.values_list('object_id', flat=True)),
+                         {str(invoice.pk)})
+        changes_count = Change.objects.count()
+
+        with self.assertRaises(ValueError), transaction.atomic():
+            InvoiceFactory.create(invoice_entries=[])
+            raise ValueError
+
+        self.assertEqual(Change.objects.count(), changes_count)
+
+    def test_changes_feed_holds_back_the_recent_changes(self):
+        InvoiceFactory.create(invoice_entries=[])
+        url = reverse('change-list')
+
+        with override_settings(SILVER_CHANGES_FEED_LAG=60):
+            response = self.client.get(url)
+            self.assertEqual(response.data, [])
+            self.assertIn('since=0', response['Link'])
+
+            with freeze_time(timezone.now() + timedelta(seconds=61)):
+                response = self.client.get(url)
+
+        self.assertIn(('invoice', 'created'),
+                      [(change['resource'], change['action']) for change in response.data])
+
+    def test_changes_feed_invalid_cursor(self):
+        response = self.client.get(reverse('change-list'), {'since': 'abc'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,156 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from silver.fixtures.factories import (AdminUserFactory, CustomerFactory, InvoiceFactory,
+                                       PaymentMethodFactory, SubscriptionFactory,
+                                       TransactionFactory)
+from silver.fixtures.test_fixtures import PAYMENT_PROCESSORS
+from silver.tests.api.utils.client import JSONApiClient
+
+
+@override_settings(PAYMENT_PROCESSORS=PAYMENT_PROCESSORS)
+class TestConditionalRequests(APITestCase):
+    client_class = JSONApiClient
+
+    def setUp(self):
+        admin_user = AdminUserFactory.create()
+        self.client.force_authenticate(user=admin_user)
+
+    def assertNotModified(self, url, queries_count=1, **headers):
+        with CaptureQueriesContext(connection) as captured_queries:
+            response = self.client.get(url, **headers)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        # only the validators were queried, nothing was serialized
+        self.assertEqual(len(captured_queries), queries_count)
+
+        return response
+
+    def test_invoice_detail(self):
+        invoice = InvoiceFactory.create(invoice_entries=[])
+        url = reverse('invoice-detail', kwargs={'pk': invoice.pk})
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        last_modified = response['Last-Modified']
+
+        response = self.assertNotModified(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response['ETag'], etag)
+        self.assertNotModified(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        # the selected fields are part of the representation
+        response = self.client.get(url + '?fields=id', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        entries_url = reverse('invoice-entry-create', kwargs={'document_pk': invoice.pk})
+        self.client.post(entries_url, data={'description': 'Page views', 'unit_price': 10.0,
+                                            'quantity': '20.0'}, format='json')
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['invoice_entries']), 1)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_invoice_detail_changes_with_its_expanded_customer(self):
+        invoice = InvoiceFactory.create()
+        url = reverse('invoice-detail', kwargs={'pk': invoice.pk}) + '?expand=customer'
+
+        response = self.client.get(url)
+        etag = response['ETag']
+        # computed from the content, since the customer's changes don't update the invoice
+        self.assertNotIn('Last-Modified', response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        invoice.customer.first_name = 'Changed'
+        invoice.customer.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['customer']['first_name'], 'Changed')
+
+    def test_invoice_detail_changes_with_its_transactions(self):
+        invoice = InvoiceFactory.create()
+        invoice.issue()
+        url = reverse('invoice-detail', kwargs={'pk': invoice.pk})
+
+        etag = self.client.get(url)['ETag']
+
+        payment_method = PaymentMethodFactory.create(customer=invoice.customer)
+        TransactionFactory.create(payment_method=payment_method, invoice=invoice)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['transactions']), 1)
+
+    def test_invoices_list(self):
+        InvoiceFactory.create_batch(2)
+        url = reverse('invoice-list')
+
+        etag = self.client.get(url)['ETag']
+
+        # the page's versions, along with the count of the pagination
+        response = self.assertNotModified(url, queries_count=2, HTTP_IF_NONE_MATCH=etag)
+        self.assertNotIn('Last-Modified', response)
+
+        InvoiceFactory.create()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+
+    def test_customer_detail_changes_with_its_subscriptions(self):
+        customer = CustomerFactory.create()
+        url = reverse('customer-detail', kwargs={'customer_pk': customer.pk})
+
+        etag = self.client.get(url)['ETag']
+        self.assertNotModified(url, HTTP_IF_NONE_MATCH=etag)
+
+        SubscriptionFactory.create(customer=customer)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['subscriptions']), 1)
+
+    def test_subscription_detail_content_etag(self):
+        subscription = SubscriptionFactory.create()
+        url = reverse('subscription-detail', kwargs={'customer_pk': subscription.customer.pk,
+                                                     'subscription_pk': subscription.pk})
+
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertNotIn('Last-Modified', response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+        subscription.reference = 'changed'
+        subscription.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -15,11 +15,14 @@
 from __future__ import absolute_import
 
 import json
+import re
 
 from mock import patch
 from freezegun import freeze_time
 
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils.encoding import force_str
 
 from rest_framework import status
@@ -158,3 +161,72 @@ class TestDocumentEndpoints(APITestCase):
         self.assertIn(self._get_expected_data(invoice1), response_data)
 
         self.assertIn(self._get_expected_data(invoice2), response_data)
+
+    def test_documents_list_cursor_pagination(self):
+        proformas = ProformaFactory.create_batch(4)
+        invoices = InvoiceFactory.create_batch(4)
+        document_ids = sorted([document.id for document in proformas + invoices], reverse=True)
+
+        url = reverse('document-list') + '?pagination=cursor&ordering=due_date'
+
+        listed_ids = []
+        while url:
+            with CaptureQueriesContext(connection) as captured_queries:
+                response = self.client.get(url)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('X-Total-Count', response)
+            self.assertFalse([query for query in captured_queries
+                              if 'COUNT(' in query['sql']])
+
+            listed_ids += [document['id'] for document in response.data]
+
+            next_link = re.search(r'<([^>]+)>; rel="next"', response.get('Link', ''))
+            url = next_link.group(1) if next_link else None
+
+        self.assertEqual(listed_ids, document_ids)
+
+    def test_documents_list_cursor_pagination_count(self):
+        ProformaFactory.create_batch(3)
+        InvoiceFactory.create_batch(4)
+
+        url = reverse('document-list')
+        response = self.client.get(url, {'pagination': 'cursor', 'count': 'true'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Total-Count'], '7')
+        self.assertIn('rel="next"', response['Link'])
+        self.assertNotIn('rel="last"', response['Link'])
+
+    def test_documents_list_queries_count_is_constant(self):
+        def create_documents():
+            for _ in range(2):
+                invoice = InvoiceFactory.create(invoice_entries=[DocumentEntryFactory()])
+                invoice.issue()
+                payment_method = PaymentMethodFactory.create(customer=invoice.customer)
+                TransactionFactory.create(payment_method=payment_method, invoice=invoice)
+
+                ProformaFactory.create(proforma_entries=[DocumentEntryFactory()])
+
+        url = reverse('document-list')
+
+        create_documents()
+        with CaptureQueriesContext(connection) as captured_queries:
+            self.client.get(url)
+        queries_count = len(captured_queries)
+
+        create_documents()
+        with CaptureQueriesContext(connection) as captured_queries:
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(len(captured_queries), queries_count)
+
+        # the invoices' and the proformas' transactions are fetched through a single query
+        self.assertEqual(len([query for query in captured_queries
+                              if query['sql'].startswith('SELECT "silver_transaction"')]), 1)
+
+        documents_query = next(query['sql'] for query in captured_queries
+                               if query['sql'].startswith('SELECT "silver_billingdocumentbase"'))
+        # the related documents aren't joined
+        self.assertNotIn('JOIN "silver_billingdocumentbase"', documents_query)
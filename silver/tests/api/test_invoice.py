@@ -27,11 +27,13 @@ from freezegun import freeze_time
 from rest_framework import status
 from rest_framework.reverse import reverse
 
+from django.core.exceptions import ValidationError
 from django.db.models.signals import pre_save
 from django.utils import timezone
 from django.conf import settings
 
 from silver.models import Invoice, Transaction, DocumentEntry
+from silver.models.documents.base import BillingDocumentQuerySet
 from silver.tests.api.specs.document_entry import spec_document_entry, document_entry_definition
 from silver.tests.api.specs.invoice import spec_invoice, invoice_definition
 from silver.fixtures.factories import (
@@ -220,6 +222,98 @@ def test_add_single_invoice_entry(authenticated_api_client, invoice):
     assert invoice_entries == [spec_document_entry(entry)]
 
 
+def test_bulk_update_invoice_entries(authenticated_api_client):
+    invoice = InvoiceFactory.create(invoice_entries=[])
+    replaced_entry, deleted_entry, kept_entry = DocumentEntryFactory.create_batch(
+        3, invoice=invoice
+    )
+
+    url = reverse('invoice-entries-bulk', kwargs={'document_pk': invoice.pk})
+    request_data = {
+        'entries': [
+            {'description': 'Page views', 'unit_price': '10.1234', 'quantity': 20},
+            {'description': 'Storage', 'unit_price': '2.5', 'quantity': 4},
+            {'id': replaced_entry.pk, 'description': 'Bandwidth', 'unit_price': 1,
+             'quantity': 3},
+        ],
+        'delete': [deleted_entry.pk],
+    }
+    response = authenticated_api_client.post(url, data=json.dumps(request_data),
+                                             content_type='application/json')
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    assert [entry['description'] for entry in response.data] == [
+        'Bandwidth', kept_entry.description, 'Page views', 'Storage'
+    ]
+
+    entries = DocumentEntry.objects.filter(invoice=invoice).order_by('pk')
+    assert [entry.description for entry in entries] == [
+        'Bandwidth', kept_entry.description, 'Page views', 'Storage'
+    ]
+    assert entries[0].pk == replaced_entry.pk
+    assert entries[2].unit_price == Decimal('10.1234')
+
+
+def test_bulk_delete_invoice_entries_touches_the_invoice_once(authenticated_api_client,
+                                                              monkeypatch):
+    invoice = InvoiceFactory.create(invoice_entries=[])
+    entries = DocumentEntryFactory.create_batch(3, invoice=invoice)
+
+    touched_documents = []
+    touch = BillingDocumentQuerySet.touch
+
+    def recording_touch(queryset, documents=None):
+        touched_documents.append(documents)
+        return touch(queryset, documents)
+
+    monkeypatch.setattr(BillingDocumentQuerySet, 'touch', recording_touch)
+
+    url = reverse('invoice-entries-bulk', kwargs={'document_pk': invoice.pk})
+    request_data = {'delete': [entry.pk for entry in entries]}
+    response = authenticated_api_client.post(url, data=json.dumps(request_data),
+                                             content_type='application/json')
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    assert response.data == []
+    assert not DocumentEntry.objects.filter(invoice=invoice).exists()
+    assert touched_documents == [[invoice]]
+
+
+@pytest.mark.parametrize('request_data, errors', [
+    ({'entries': [{'description': 'Page views', 'unit_price': 10, 'quantity': 20},
+                  {'description': 'Storage', 'quantity': -1}]},
+     {'entries': [{}, {'unit_price': ['This field is required.'],
+                       'quantity': ['Ensure this value is greater than or equal to 0.0.']}]}),
+    ({'delete': [9999]},
+     {'non_field_errors': ['The invoice has no entries with the ids: 9999.']}),
+])
+def test_bulk_update_invoice_entries_is_validated_first(authenticated_api_client,
+                                                        request_data, errors):
+    invoice = InvoiceFactory.create(invoice_entries=[])
+
+    url = reverse('invoice-entries-bulk', kwargs={'document_pk': invoice.pk})
+    response = authenticated_api_client.post(url, data=json.dumps(request_data),
+                                             content_type='application/json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == errors
+    assert not DocumentEntry.objects.filter(invoice=invoice).exists()
+
+
+def test_bulk_update_issued_invoice_entries(authenticated_api_client):
+    invoice = InvoiceFactory.create()
+    invoice.issue()
+
+    url = reverse('invoice-entries-bulk', kwargs={'document_pk': invoice.pk})
+    response = authenticated_api_client.post(url, data=json.dumps({'delete': []}),
+                                             content_type='application/json')
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.data == {
+        'detail': 'Invoice entries can be changed only when the invoice is in draft state.'
+    }
+
+
 def test_try_to_get_invoice_entries(authenticated_api_client, invoice):
     url = reverse('invoice-entry-create', kwargs={'document_pk': invoice.pk})
 
@@ -738,3 +832,92 @@ def test_illegal_state_change_when_in_paid_state(authenticated_api_client):
 
     assert response.status_code == status.HTTP_403_FORBIDDEN
     assert response.data == {'detail': 'Illegal state value.'}
+
+
+def test_issue_invoices_in_bulk(authenticated_api_client):
+    invoices = InvoiceFactory.create_batch(3)
+    issued_invoice = InvoiceFactory.create()
+    issued_invoice.issue()
+
+    url = reverse('invoices-state')
+    data = {
+        'state': 'issued',
+        'issue_date': '2014-01-01',
+        'ids': [invoice.pk for invoice in reversed(invoices)] + [issued_invoice.pk, 9999]
+    }
+    response = authenticated_api_client.put(url, data=json.dumps(data),
+                                            content_type='application/json')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['results'] == [
+        {'id': invoice.pk, 'success': True, 'state': 'issued'} for invoice in invoices
+    ] + [
+        {'id': issued_invoice.pk, 'success': False, 'state': 'issued',
+         'detail': 'Invoice can be issued only if it is in draft state.'},
+        {'id': 9999, 'success': False, 'detail': 'Invoice not found'},
+    ]
+
+    for invoice in invoices:
+        invoice.refresh_from_db()
+        assert invoice.state == Invoice.STATES.ISSUED
+        assert invoice.issue_date.strftime('%Y-%m-%d') == '2014-01-01'
+
+
+def test_pay_invoices_in_bulk_in_chunks(authenticated_api_client, monkeypatch):
+    monkeypatch.setattr('silver.api.views.documents_views.DocumentsStateHandler.chunk_size', 2)
+    invoices = InvoiceFactory.create_batch(3)
+    for invoice in invoices:
+        invoice.issue()
+
+    url = reverse('invoices-state')
+    data = {'state': 'paid', 'ids': [invoice.pk for invoice in invoices]}
+    response = authenticated_api_client.put(url, data=json.dumps(data),
+                                            content_type='application/json')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [result['state'] for result in response.data['results']] == ['paid'] * 3
+
+
+def test_issue_invoices_in_bulk_reports_the_failed_saves(authenticated_api_client, monkeypatch):
+    invoices = InvoiceFactory.create_batch(3)
+    errors = {invoices[0].pk: ValidationError('Invalid invoice.'),
+              invoices[1].pk: RuntimeError('Unexpected error.')}
+    save = Invoice.save
+
+    def failing_save(invoice, *args, **kwargs):
+        if invoice.pk in errors:
+            raise errors[invoice.pk]
+
+        return save(invoice, *args, **kwargs)
+
+    monkeypatch.setattr(Invoice, 'save', failing_save)
+
+    url = reverse('invoices-state')
+    data = {'state': 'issued', 'ids': [invoice.pk for invoice in invoices]}
+    response = authenticated_api_client.put(url, data=json.dumps(data),
+                                            content_type='application/json')
+
+    assert response.status_code == status.HTTP_200_OK
+    # the failed invoices are reported in the state they were left in
+    assert response.data['results'] == [
+        {'id': invoices[0].pk, 'success': False, 'state': 'draft',
+         'detail': 'Invalid invoice.'},
+        {'id': invoices[1].pk, 'success': False, 'state': 'draft',
+         'detail': "Invoice couldn't be issued."},
+        {'id': invoices[2].pk, 'success': True, 'state': 'issued'},
+    ]
+
+
+@pytest.mark.parametrize('data, detail', [
+    ({'ids': [1]}, 'You have to provide a value for the state field.'),
+    ({'ids': [1], 'state': 'draft'}, 'Illegal state value.'),
+    ({'state': 'issued'}, 'You have to provide a list of invoice ids.'),
+    ({'state': 'issued', 'ids': ['one']}, 'You have to provide a list of invoice ids.'),
+])
+def test_bulk_invoices_state_invalid_data(authenticated_api_client, data, detail):
+    url = reverse('invoices-state')
+    response = authenticated_api_client.put(url, data=json.dumps(data),
+                                            content_type='application/json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == {'detail': detail}
@@ -727,3 +727,24 @@ class TestProformaEndpoints(APITestCase):
         assert response.status_code == status.HTTP_403_FORBIDDEN
         assert response.data == {'detail': 'Illegal state value.'}
         assert Invoice.objects.count() == 1
+
+    def test_pay_proformas_in_bulk(self):
+        proformas = ProformaFactory.create_batch(2)
+        for proforma in proformas:
+            proforma.issue()
+
+        url = reverse('proformas-state')
+        data = {'state': 'paid', 'paid_date': '2014-05-05',
+                'ids': [proforma.pk for proforma in proformas]}
+        response = self.client.put(url, data=json.dumps(data), content_type='application/json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == [
+            {'id': proforma.pk, 'success': True, 'state': 'paid'} for proforma in proformas
+        ]
+
+        for proforma in proformas:
+            proforma.refresh_from_db()
+            assert proforma.paid_date.strftime('%Y-%m-%d') == '2014-05-05'
+            # paying a proforma issues its invoice
+            assert proforma.related_document.state == Invoice.STATES.PAID
@@ -0,0 +1,134 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+from django.conf import settings
+from django.test import override_settings
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from silver.fixtures.factories import (AdminUserFactory, CustomerFactory, MeteredFeatureFactory,
+                                       PlanFactory, ProviderFactory)
+from silver.fixtures.test_fixtures import PAYMENT_PROCESSORS
+from silver.tests.api.utils.client import JSONApiClient
+
+
+@override_settings(SILVER_RESPONSE_CACHE='default')
+class TestResponseCache(APITestCase):
+    client_class = JSONApiClient
+
+    def setUp(self):
+        admin_user = AdminUserFactory.create()
+        self.client.force_authenticate(user=admin_user)
+
+    def assertCachedResponse(self, url, data):
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), data)
+
+    def test_plans_list_is_cached(self):
+        plan = PlanFactory.create()
+        url = reverse('plan-list')
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCachedResponse(url, response.json())
+
+        plan.name = 'Renamed'
+        plan.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response.data[0]['name'], 'Renamed')
+        self.assertCachedResponse(url, response.json())
+
+    def test_plan_detail_is_invalidated_by_its_metered_features(self):
+        metered_feature = MeteredFeatureFactory.create()
+        plan = PlanFactory.create(metered_features=[metered_feature])
+        url = reverse('plan-detail', kwargs={'pk': plan.pk})
+
+        self.client.get(url)
+
+        metered_feature.name = 'Renamed'
+        metered_feature.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['metered_features'][0]['name'], 'Renamed')
+
+        plan.metered_features.clear()
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['metered_features'], [])
+
+    def test_providers_list_is_invalidated_by_deletes(self):
+        providers = ProviderFactory.create_batch(2)
+        url = reverse('provider-list')
+
+        self.assertEqual(len(self.client.get(url).data), 2)
+
+        providers[0].delete()
+
+        self.assertEqual(len(self.client.get(url).data), 1)
+
+    def test_plans_list_is_not_invalidated_by_other_models(self):
+        PlanFactory.create()
+        url = reverse('plan-list')
+
+        response = self.client.get(url)
+        CustomerFactory.create()
+
+        self.assertCachedResponse(url, response.json())
+
+    def test_responses_depend_on_the_query_params(self):
+        PlanFactory.create(name='First')
+        PlanFactory.create(name='Second')
+        url = reverse('plan-list')
+
+        self.assertEqual(len(self.client.get(url).data), 2)
+        self.assertEqual(len(self.client.get(url, {'name': 'First'}).data), 1)
+
+    def test_payment_processors_are_cached(self):
+        url = reverse('payment-processor-list')
+
+        with override_settings(PAYMENT_PROCESSORS=PAYMENT_PROCESSORS):
+            response = self.client.get(url)
+            self.assertEqual(len(response.data), len(PAYMENT_PROCESSORS))
+            self.assertCachedResponse(url, response.json())
+
+        with override_settings(PAYMENT_PROCESSORS={}):
+            self.assertEqual(self.client.get(url).data, [])
+
+    @override_settings(SILVER_RESPONSE_CACHE=None)
+    def test_response_cache_can_be_disabled(self):
+        PlanFactory.create()
+        url = reverse('plan-list')
+
+        self.client.get(url)
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+    def test_response_cache_is_disabled_by_default(self):
+        PlanFactory.create()
+        url = reverse('plan-list')
+
+        with self.settings():
+            del settings.SILVER_RESPONSE_CACHE
+
+            self.client.get(url)
+            with self.assertNumQueries(3):
+                self.client.get(url)
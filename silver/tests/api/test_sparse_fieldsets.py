@@ -0,0 +1,102 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from silver.fixtures.factories import (AdminUserFactory, DocumentEntryFactory, InvoiceFactory,
+                                       TransactionFactory)
+from silver.fixtures.test_fixtures import PAYMENT_PROCESSORS
+from silver.tests.api.utils.client import JSONApiClient
+
+
+@override_settings(PAYMENT_PROCESSORS=PAYMENT_PROCESSORS)
+class TestSparseFieldsets(APITestCase):
+    client_class = JSONApiClient
+
+    def setUp(self):
+        admin_user = AdminUserFactory.create()
+        self.client.force_authenticate(user=admin_user)
+
+    def _get(self, url, params):
+        with CaptureQueriesContext(connection) as captured_queries:
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return response, [query['sql'] for query in captured_queries]
+
+    def test_selected_fields_drop_their_queries(self):
+        for _ in range(3):
+            transaction = TransactionFactory.create()
+            DocumentEntryFactory.create(invoice=transaction.invoice)
+
+        url = reverse('invoice-list')
+
+        response, all_fields_queries = self._get(url, {})
+        self.assertIn('invoice_entries', response.data[0])
+
+        response, queries = self._get(url, {'fields': 'id,state,total'})
+
+        self.assertEqual([set(invoice) for invoice in response.data],
+                         [{'id', 'state', 'total'}] * 3)
+        self.assertLess(len(queries), len(all_fields_queries))
+
+        invoices_query = next(query for query in queries
+                              if query.startswith('SELECT "silver_billingdocumentbase"'))
+        self.assertNotIn('archived_customer', invoices_query)
+        self.assertNotIn('silver_customer', invoices_query)
+        self.assertFalse([query for query in queries if 'silver_transaction' in query])
+
+    def test_transactions_selected_fields(self):
+        transaction = TransactionFactory.create()
+
+        url = reverse('transaction-list', kwargs={'customer_pk': transaction.customer.pk})
+        response, queries = self._get(url, {'fields': 'id, state'})
+
+        self.assertEqual(response.data, [{'id': str(transaction.uuid),
+                                          'state': transaction.state}])
+
+        transactions_query = next(query for query in queries
+                                  if query.startswith('SELECT "silver_transaction"'))
+        self.assertNotIn('JOIN "silver_customer"', transactions_query)
+
+    def test_expand_related_resource(self):
+        invoice = InvoiceFactory.create()
+
+        url = reverse('invoice-detail', kwargs={'pk': invoice.pk})
+        response, _ = self._get(url, {'fields': 'id,customer,provider', 'expand': 'customer'})
+
+        self.assertEqual(response.data['customer']['id'], invoice.customer.id)
+        self.assertEqual(response.data['customer']['email'], invoice.customer.email)
+        # not expanded
+        self.assertTrue(response.data['provider'].endswith(
+            reverse('provider-detail', kwargs={'pk': invoice.provider.pk})
+        ))
+
+    def test_selected_fields_are_ignored_on_writes(self):
+        invoice = InvoiceFactory.create()
+
+        url = reverse('invoice-detail', kwargs={'pk': invoice.pk})
+        response = self.client.patch(url + '?fields=id', {'sales_tax_name': 'VAT'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['sales_tax_name'], 'VAT')
@@ -17,8 +17,11 @@ from __future__ import absolute_import
 import datetime
 import json
 from collections import OrderedDict
+from decimal import Decimal
 
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from freezegun import freeze_time
@@ -31,7 +34,8 @@ from silver.models import Subscription
 from silver.tests.api.specs.subscription import spec_subscription
 from silver.fixtures.factories import (AdminUserFactory, CustomerFactory,
                                        PlanFactory, SubscriptionFactory,
-                                       MeteredFeatureFactory, DiscountFactory, BonusFactory)
+                                       MeteredFeatureFactory, DiscountFactory, BonusFactory,
+                                       MeteredFeatureUnitsLogFactory)
 from silver.tests.api.utils.client import JSONApiClient
 
 
@@ -348,6 +352,59 @@ class TestSubscriptionEndpoint(APITestCase):
             subscription = Subscription.objects.get(id=subscription_data['id'])
             assert subscription_data == spec_subscription(subscription)
 
+    def test_get_subscription_list_discounts_and_bonuses(self):
+        customer = CustomerFactory.create()
+        plan = PlanFactory.create(metered_features=MeteredFeatureFactory.create_batch(2))
+        subscriptions = SubscriptionFactory.create_batch(3, customer=customer, plan=plan)
+        other_subscription = SubscriptionFactory.create(customer=customer)
+
+        DiscountFactory.create()
+        DiscountFactory.create().filter_customers.add(customer)
+        DiscountFactory.create().filter_subscriptions.add(subscriptions[0])
+        DiscountFactory.create().filter_plans.add(plan)
+        DiscountFactory.create().filter_product_codes.add(
+            plan.metered_features.first().product_code
+        )
+        DiscountFactory.create().filter_customers.add(CustomerFactory.create())
+
+        BonusFactory.create(amount=1234).filter_subscriptions.add(subscriptions[1],
+                                                                 other_subscription)
+        BonusFactory.create(amount=1234).filter_product_codes.add(plan.product_code)
+
+        url = reverse('subscription-list', kwargs={'customer_pk': customer.pk})
+
+        response = self.client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert len(response.data) == 4
+        for subscription_data in response.data:
+            subscription = Subscription.objects.get(id=subscription_data['id'])
+            assert subscription_data == spec_subscription(subscription)
+
+    def test_get_subscription_list_queries_count(self):
+        customer = CustomerFactory.create()
+        plans = PlanFactory.create_batch(2, metered_features=MeteredFeatureFactory.create_batch(2))
+        DiscountFactory.create().filter_customers.add(customer)
+        BonusFactory.create(amount=1234).filter_plans.add(plans[0])
+
+        url = reverse('subscription-list', kwargs={'customer_pk': customer.pk})
+
+        queries_counts = []
+        for subscriptions_count in (1, settings.API_PAGE_SIZE):
+            while Subscription.objects.count() < subscriptions_count:
+                SubscriptionFactory.create(customer=customer,
+                                           plan=plans[Subscription.objects.count() % 2])
+
+            with CaptureQueriesContext(connection) as captured_queries:
+                response = self.client.get(url)
+
+            assert response.status_code == status.HTTP_200_OK, response.data
+            assert len(response.data) == subscriptions_count
+            queries_counts.append(len(captured_queries))
+
+        # the related objects, discounts and bonuses are fetched for the whole page at once
+        assert queries_counts[0] == queries_counts[1]
+
     def test_get_subscription_detail(self):
         subscription = SubscriptionFactory.create()
         discount = DiscountFactory.create()
@@ -503,16 +560,16 @@ class TestSubscriptionEndpoint(APITestCase):
             'end_datetime': '2022-05-31T23:59:59Z',
         }
 
-        # A fifth GET request for all buckets
+        # A fifth GET request for all buckets, listed in the order they were logged in
         response = self.client.get(url)
 
         assert response.status_code == status.HTTP_200_OK, response.data
         assert response.data == [
             OrderedDict([
-                ('consumed_units', '99.0000'),
+                ('consumed_units', '179.0000'),
                 ('start_datetime', '2022-05-02T00:00:00Z'),
                 ('end_datetime', '2022-05-31T23:59:59Z'),
-                ('annotation', None)
+                ('annotation', 'test')
             ]),
             OrderedDict([
                 ('consumed_units', '42.0000'),
@@ -521,13 +578,112 @@ class TestSubscriptionEndpoint(APITestCase):
                 ('annotation', 'different')
             ]),
             OrderedDict([
-                ('consumed_units', '179.0000'),
+                ('consumed_units', '99.0000'),
                 ('start_datetime', '2022-05-02T00:00:00Z'),
                 ('end_datetime', '2022-05-31T23:59:59Z'),
-                ('annotation', 'test')
+                ('annotation', None)
             ]),
         ]
 
+    def _create_daily_mf_units_logs(self):
+        subscription = SubscriptionFactory.create(
+            start_date=datetime.date(2022, 4, 1), state=Subscription.STATES.ACTIVE,
+            plan__interval='month', plan__interval_count=1, plan__trial_period_days=None
+        )
+        metered_feature = MeteredFeatureFactory.create()
+        subscription.plan.metered_features.add(metered_feature)
+
+        for month in (4, 5):
+            for day in (10, 20, 30):
+                start_datetime = datetime.datetime(2022, month, day, tzinfo=timezone.utc)
+                MeteredFeatureUnitsLogFactory.create(
+                    subscription=subscription, metered_feature=metered_feature,
+                    start_datetime=start_datetime,
+                    end_datetime=start_datetime + datetime.timedelta(hours=1),
+                    consumed_units=Decimal(day), annotation='day-%s' % day
+                )
+
+        url = reverse('mf-log-units',
+                      kwargs={'subscription_pk': subscription.pk,
+                              'customer_pk': subscription.customer.pk,
+                              'mf_product_code': metered_feature.product_code})
+
+        return url
+
+    def test_get_subscription_mf_units_logs_pagination(self):
+        url = self._create_daily_mf_units_logs()
+
+        response = self.client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert len(response.data) == settings.API_PAGE_SIZE
+        assert [log['start_datetime'] for log in response.data] == [
+            '2022-04-10T00:00:00Z', '2022-04-20T00:00:00Z', '2022-04-30T00:00:00Z',
+            '2022-05-10T00:00:00Z', '2022-05-20T00:00:00Z',
+        ]
+        assert 'rel="next"' in response['link']
+
+        next_url = response['link'].split(';')[0].strip('<>')
+        response = self.client.get(next_url)
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert [log['start_datetime'] for log in response.data] == ['2022-05-30T00:00:00Z']
+        assert 'rel="next"' not in response['link']
+        assert 'rel="prev"' in response['link']
+
+    def test_get_subscription_mf_units_logs_filtering(self):
+        url = self._create_daily_mf_units_logs()
+
+        response = self.client.get(url, {
+            'start_datetime': '2022-04-15T00:00:00Z',
+            'end_datetime': '2022-05-15T00:00:00Z',
+            'annotation': 'day-20,day-30',
+        })
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert [(log['start_datetime'], log['annotation']) for log in response.data] == [
+            ('2022-04-20T00:00:00Z', 'day-20'),
+            ('2022-04-30T00:00:00Z', 'day-30'),
+        ]
+
+        response = self.client.get(url, {'start_datetime': 'yesterday'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @freeze_time('2022-06-15')
+    def test_get_subscription_mf_units_logs_aggregated_per_bucket(self):
+        url = self._create_daily_mf_units_logs()
+
+        response = self.client.get(url, {'aggregate': 'buckets'})
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert response.data == [
+            {
+                'start_datetime': '2022-04-01T00:00:00Z',
+                'end_datetime': '2022-04-30T23:59:59Z',
+                'consumed_units': '60.0000',
+                'logs_count': 3,
+            },
+            {
+                'start_datetime': '2022-05-01T00:00:00Z',
+                'end_datetime': '2022-05-31T23:59:59Z',
+                'consumed_units': '60.0000',
+                'logs_count': 3,
+            },
+            {
+                'start_datetime': '2022-06-01T00:00:00Z',
+                'end_datetime': '2022-06-30T23:59:59Z',
+                'consumed_units': '0.0000',
+                'logs_count': 0,
+            },
+        ]
+
+        response = self.client.get(url, {'aggregate': 'buckets', 'annotation': 'day-10',
+                                         'end_datetime': '2022-05-31T23:59:59Z'})
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert [bucket['consumed_units'] for bucket in response.data] == ['10.0000', '10.0000']
+
     @freeze_time('2022-05-15')
     def test_create_subscription_mf_units_log_with_end_log(self):
         subscription = SubscriptionFactory.create(
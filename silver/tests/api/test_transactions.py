@@ -20,8 +20,10 @@ from decimal import Decimal
 
 from mock import patch
 
+from django.db import connection
 from django.utils import timezone
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils.encoding import force_str
 
 from rest_framework import status
@@ -86,6 +88,26 @@ class TestTransactionEndpoint(APITestCase):
             self.assertEqual(response.data[1], expected_t1)
             self.assertEqual(response.data[0], expected_t2)
 
+    def test_list_transactions_queries_count_is_constant(self):
+        customer = CustomerFactory.create()
+        payment_method = PaymentMethodFactory.create(customer=customer)
+
+        url = reverse('transaction-list', kwargs={'customer_pk': customer.pk})
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as captured_queries:
+                response = self.client.get(url, {'page_size': 100}, format='json')
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            return len(captured_queries)
+
+        TransactionFactory.create_batch(2, payment_method=payment_method)
+        queries_count = count_queries()
+
+        TransactionFactory.create_batch(8, payment_method=payment_method)
+        self.assertEqual(count_queries(), queries_count)
+
     def test_add_transaction(self):
         customer = CustomerFactory.create()
         payment_method = PaymentMethodFactory.create(customer=customer)
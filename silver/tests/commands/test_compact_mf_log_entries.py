@@ -0,0 +1,106 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import datetime
+
+from decimal import Decimal
+from fractions import Fraction
+
+from freezegun import freeze_time
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from silver.models import Plan, Subscription, MeteredFeatureUnitsLog, MeteredFeatureUnitsLogArchive
+from silver.fixtures.factories import (SubscriptionFactory, MeteredFeatureFactory, PlanFactory,
+                                       MeteredFeatureUnitsLogFactory, BillingLogFactory)
+
+
+@freeze_time('2015-03-15')
+class TestCompactMFLogEntriesCommand(TestCase):
+    def setUp(self):
+        self.metered_feature = MeteredFeatureFactory.create(included_units=Decimal('10.00'))
+        plan = PlanFactory.create(interval=Plan.INTERVALS.MONTH, interval_count=1,
+                                  generate_after=0, trial_period_days=None,
+                                  metered_features=[self.metered_feature])
+        self.subscription = SubscriptionFactory.create(
+            plan=plan, state=Subscription.STATES.ACTIVE,
+            start_date=datetime.date(2015, 1, 1)
+        )
+        BillingLogFactory.create(subscription=self.subscription,
+                                 billing_date=datetime.date(2015, 2, 1),
+                                 plan_billed_up_to=datetime.date(2015, 2, 28),
+                                 metered_features_billed_up_to=datetime.date(2015, 1, 31))
+
+        for day in range(1, 31):
+            for annotation in ('a', None):
+                start_datetime = datetime.datetime(2015, 1, day, tzinfo=timezone.utc)
+                MeteredFeatureUnitsLogFactory.create(
+                    subscription=self.subscription, metered_feature=self.metered_feature,
+                    start_datetime=start_datetime,
+                    end_datetime=start_datetime + datetime.timedelta(hours=23),
+                    consumed_units=Decimal('1.50'), annotation=annotation
+                )
+
+        # February has not been billed yet
+        for day in (1, 2):
+            MeteredFeatureUnitsLogFactory.create(
+                subscription=self.subscription, metered_feature=self.metered_feature,
+                start_datetime=datetime.datetime(2015, 2, day, tzinfo=timezone.utc),
+                end_datetime=datetime.datetime(2015, 2, day, 23, tzinfo=timezone.utc),
+            )
+
+    def _january_overage(self):
+        return self.subscription._get_extra_consumed_units(
+            self.metered_feature, Fraction(1),
+            datetime.datetime(2015, 1, 1, tzinfo=timezone.utc),
+            datetime.datetime(2015, 1, 31, 23, 59, 59, tzinfo=timezone.utc),
+            bonuses=[]
+        )
+
+    def test_compact_billed_buckets(self):
+        overage_before = self._january_overage()
+
+        call_command('compact_mf_log_entries')
+
+        assert MeteredFeatureUnitsLogArchive.objects.count() == 60
+
+        rollups = MeteredFeatureUnitsLog.objects.filter(
+            subscription=self.subscription,
+            end_datetime__lt=datetime.datetime(2015, 2, 1, tzinfo=timezone.utc)
+        )
+        assert rollups.count() == 2
+        for rollup in rollups:
+            assert rollup.consumed_units == Decimal('45.00')
+            assert rollup.start_datetime == datetime.datetime(2015, 1, 1, tzinfo=timezone.utc)
+            assert rollup.end_datetime == datetime.datetime(2015, 1, 30, 23, tzinfo=timezone.utc)
+
+        overage_after = self._january_overage()
+        assert overage_after.extra_consumed_units == overage_before.extra_consumed_units
+        assert set(overage_after.annotations) == set(overage_before.annotations)
+
+        # The unbilled bucket is left untouched
+        assert MeteredFeatureUnitsLog.objects.filter(
+            start_datetime__gte=datetime.datetime(2015, 2, 1, tzinfo=timezone.utc)
+        ).count() == 2
+
+    def test_compact_is_idempotent(self):
+        call_command('compact_mf_log_entries')
+        call_command('compact_mf_log_entries', '--subscription=%s' % self.subscription.id)
+
+        assert MeteredFeatureUnitsLogArchive.objects.count() == 60
+        assert MeteredFeatureUnitsLog.objects.count() == 4
@@ -74,7 +74,7 @@ class TestExecuteTransactionsCommand(TestCase):
 
             self.assertEqual(mock_execute.call_count, len(filtered_transactions))
 
-    @patch('silver.management.commands.execute_transactions.logger.error')
+    @patch('silver.transactions_executor.logger.error')
     def test_exception_logging(self, mock_logger):
         payment_method = PaymentMethodFactory.create(
             payment_processor=triggered_processor,
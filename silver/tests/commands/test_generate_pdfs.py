@@ -0,0 +1,85 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import os
+import time
+
+from io import StringIO
+
+import pytest
+
+from mock import MagicMock
+
+from django.core.management import call_command
+
+from silver.fixtures.factories import InvoiceFactory, ProformaFactory
+
+
+# The pool's processes use their own database connections, so they only see the committed
+# fixtures.
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generate_pdfs_with_process_pool(settings, tmpdir, monkeypatch):
+    settings.MEDIA_ROOT = tmpdir.strpath
+
+    invoice = InvoiceFactory.create()
+    invoice.issue()
+
+    proforma = ProformaFactory.create()
+    proforma.issue()
+
+    monkeypatch.setattr('silver.pdf_renderers.pisa.pisaDocument',
+                        MagicMock(return_value=MagicMock(err=False)))
+
+    output = StringIO()
+    call_command('generate_pdfs', '--workers=2', stdout=output)
+
+    assert output.getvalue().strip() == 'Generated 2 PDFs, 0 failed.'
+
+    # The PDFs have been uploaded by the pool's processes
+    for document in (invoice, proforma):
+        assert os.path.exists(os.path.join(tmpdir.strpath, document.get_pdf_upload_path()))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generate_pdfs_with_process_pool_time_limit(monkeypatch):
+    invoice = InvoiceFactory.create()
+    invoice.issue()
+
+    monkeypatch.setattr('silver.models.documents.base.BillingDocumentBase.generate_pdf',
+                        lambda document: time.sleep(5))
+
+    output = StringIO()
+    call_command('generate_pdfs', '--workers=2', '--time-limit=1', stdout=output)
+
+    assert output.getvalue().strip() == 'Generated 0 PDFs, 1 failed.'
+
+
+@pytest.mark.django_db
+def test_generate_pdfs_discard_content_hashes(monkeypatch):
+    invoice = InvoiceFactory.create()
+    invoice.issue()
+    invoice.pdf.content_hash = '0' * 64
+    invoice.pdf.save()
+
+    monkeypatch.setattr('silver.models.documents.base.BillingDocumentBase.generate_pdf',
+                        MagicMock())
+
+    call_command('generate_pdfs', '--discard-content-hashes', stdout=StringIO())
+
+    invoice.pdf.refresh_from_db()
+    assert invoice.pdf.content_hash is None
@@ -77,7 +77,7 @@ class TestUpdateTransactionsStatusCommand(TestCase):
             self.assertEqual(mock_fetch_status.call_count,
                              len(filtered_transactions))
 
-    @patch('silver.management.commands.fetch_transactions_status.logger.error')
+    @patch('silver.transactions_executor.logger.error')
     def test_transaction_update_status_exception_logging(self, mock_logger):
         payment_method = PaymentMethodFactory.create(
             payment_processor=triggered_processor
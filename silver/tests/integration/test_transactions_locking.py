@@ -0,0 +1,112 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import threading
+from decimal import Decimal
+
+import pytest
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from silver.fixtures.factories import (
+    DocumentEntryFactory, InvoiceFactory, PaymentMethodFactory, TransactionFactory
+)
+from silver.fixtures.test_fixtures import PAYMENT_PROCESSORS, triggered_processor
+from silver.models import Transaction
+
+
+@pytest.fixture
+def issued_invoice(settings):
+    settings.PAYMENT_PROCESSORS = PAYMENT_PROCESSORS
+    settings.SILVER_AUTOMATICALLY_CREATE_TRANSACTIONS = False
+
+    invoice = InvoiceFactory.create(
+        invoice_entries=[DocumentEntryFactory(quantity=1, unit_price=100)]
+    )
+    invoice.issue()
+
+    return invoice
+
+
+@pytest.fixture
+def payment_method(issued_invoice):
+    return PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                       customer=issued_invoice.customer)
+
+
+@pytest.mark.django_db
+def test_transaction_creation_locks_the_documents_once(issued_invoice, payment_method):
+    with CaptureQueriesContext(connection) as captured_queries:
+        Transaction.objects.create(invoice=issued_invoice, payment_method=payment_method)
+
+    documents_queries = [query['sql'] for query in captured_queries
+                         if 'FROM "silver_billingdocumentbase"' in query['sql']]
+    amount_queries = [query['sql'] for query in captured_queries
+                      if 'SUM("silver_transaction"."amount")' in query['sql']]
+
+    # the lock, plus fetching the invoice's related proforma
+    assert len(documents_queries) == 2
+    assert len(amount_queries) == 1
+
+
+@pytest.mark.django_db
+def test_transaction_amount_is_validated_again_under_lock(issued_invoice, payment_method):
+    amount = issued_invoice.total_in_transaction_currency
+
+    transaction = Transaction(invoice=issued_invoice, payment_method=payment_method,
+                              amount=amount)
+    transaction.full_clean()
+
+    # the document is charged after the transaction was validated, but before it's saved
+    TransactionFactory.create(invoice=issued_invoice, payment_method=payment_method,
+                              amount=amount)
+
+    with pytest.raises(ValidationError):
+        transaction.save()
+
+    assert Transaction.objects.filter(invoice=issued_invoice).count() == 1
+
+
+@pytest.mark.skipif(not connection.features.has_select_for_update,
+                    reason='The database backend does not support row locks.')
+@pytest.mark.django_db(transaction=True)
+def test_parallel_transaction_creation_does_not_overcharge(issued_invoice, payment_method):
+    threads_count = 4
+    amount = issued_invoice.total_in_transaction_currency
+    barrier = threading.Barrier(threads_count)
+    errors = []
+
+    def create_transaction():
+        try:
+            transaction = Transaction(invoice=issued_invoice, payment_method=payment_method,
+                                      amount=amount)
+            barrier.wait()
+            transaction.save()
+        except ValidationError as error:
+            errors.append(error)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=create_transaction) for _ in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == threads_count - 1
+    assert issued_invoice.amount_to_be_charged_in_transaction_currency == Decimal('0.00')
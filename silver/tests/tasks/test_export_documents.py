@@ -0,0 +1,149 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import zipfile
+from io import BytesIO
+
+import pytest
+
+from PyPDF2 import PdfFileReader
+
+from silver.fixtures.factories import InvoiceFactory
+from silver.models import DocumentsExport
+from silver.models.documents import export as export_module
+from silver.pdf_renderers import PisaPDFRenderer
+from silver.tasks import export_documents
+
+
+@pytest.fixture
+def issued_invoices(settings, tmpdir):
+    settings.MEDIA_ROOT = tmpdir.strpath
+
+    pdf_file_object = BytesIO()
+    PisaPDFRenderer().render(b'<html><body><p>Invoice</p></body></html>', pdf_file_object)
+
+    invoices = InvoiceFactory.create_batch(3)
+    for invoice in invoices:
+        invoice.issue()
+        invoice.pdf.upload(BytesIO(pdf_file_object.getvalue()), invoice.get_pdf_filename())
+
+    # a document without a PDF file fails to be exported
+    draft_invoice = InvoiceFactory.create()
+
+    return invoices + [draft_invoice]
+
+
+@pytest.mark.django_db
+def test_export_documents_as_zip(issued_invoices):
+    export = DocumentsExport.objects.create(
+        export_format=DocumentsExport.FORMATS.ZIP,
+        document_ids=[invoice.id for invoice in issued_invoices]
+    )
+
+    export_documents(export.id)
+
+    export.refresh_from_db()
+    assert export.state == DocumentsExport.STATES.DONE
+    assert export.exported_count == 3
+    assert export.failed_count == 1
+    assert export.finished_at
+
+    with export.export_file.open('rb') as export_file:
+        archive = zipfile.ZipFile(export_file)
+
+        assert sorted(archive.namelist()) == sorted(
+            invoice.pdf.pdf_file.name for invoice in issued_invoices[:3]
+        )
+
+
+@pytest.mark.django_db
+def test_export_documents_as_merged_pdf(issued_invoices):
+    export = DocumentsExport.objects.create(
+        export_format=DocumentsExport.FORMATS.PDF,
+        document_ids=[invoice.id for invoice in issued_invoices]
+    )
+
+    export_documents(export.id)
+
+    export.refresh_from_db()
+    assert export.state == DocumentsExport.STATES.DONE
+    assert export.exported_count == 3
+    assert export.failed_count == 1
+    assert export.url.endswith('.pdf')
+
+    with export.export_file.open('rb') as export_file:
+        assert PdfFileReader(export_file).getNumPages() == 3
+
+
+@pytest.mark.django_db
+def test_export_documents_as_merged_pdf_in_chunks(issued_invoices, monkeypatch):
+    monkeypatch.setattr('silver.models.documents.export.PDF_EXPORT_CHUNK_SIZE', 2)
+
+    opened_files = []
+    original_temporary_file = export_module.TemporaryFile
+
+    def temporary_file():
+        opened_files.append(original_temporary_file())
+        return opened_files[-1]
+
+    monkeypatch.setattr('silver.models.documents.export.TemporaryFile', temporary_file)
+
+    export = DocumentsExport.objects.create(
+        export_format=DocumentsExport.FORMATS.PDF,
+        document_ids=[invoice.id for invoice in issued_invoices]
+    )
+
+    export_documents(export.id)
+
+    export.refresh_from_db()
+    assert export.state == DocumentsExport.STATES.DONE
+    assert (export.exported_count, export.failed_count) == (3, 1)
+
+    with export.export_file.open('rb') as export_file:
+        assert PdfFileReader(export_file).getNumPages() == 3
+
+    # 3 PDF copies and a merged file for each of the 2 chunks, all of them closed
+    assert len(opened_files) == 5
+    assert all(opened_file.closed for opened_file in opened_files)
+
+
+@pytest.mark.django_db
+def test_export_documents_as_merged_pdf_max_documents(issued_invoices, monkeypatch):
+    monkeypatch.setattr('silver.models.documents.export.MAX_PDF_EXPORT_DOCUMENTS', 2)
+
+    export = DocumentsExport.objects.create(
+        export_format=DocumentsExport.FORMATS.PDF,
+        document_ids=[invoice.id for invoice in issued_invoices]
+    )
+
+    export_documents(export.id)
+
+    export.refresh_from_db()
+    assert export.state == DocumentsExport.STATES.FAILED
+    assert not export.export_file
+
+
+@pytest.mark.django_db
+def test_export_documents_skips_finished_exports(issued_invoices):
+    export = DocumentsExport.objects.create(
+        state=DocumentsExport.STATES.DONE,
+        document_ids=[invoice.id for invoice in issued_invoices]
+    )
+
+    export_documents(export.id)
+
+    export.refresh_from_db()
+    assert not export.export_file
@@ -18,7 +18,10 @@ import pytest
 
 from mock import patch, MagicMock
 
-from silver.tasks import generate_pdfs, generate_pdf
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from silver.tasks import generate_pdfs, generate_pdf, generate_pdfs_chunk
 from silver.fixtures.factories import InvoiceFactory, ProformaFactory
 from silver.utils.pdf import fetch_resources
 
@@ -75,7 +78,7 @@ def test_generate_pdf_task(settings, tmpdir, monkeypatch):
 
     pisa_document_mock = MagicMock(return_value=MagicMock(err=False))
 
-    monkeypatch.setattr('silver.models.documents.pdf.pisa.pisaDocument',
+    monkeypatch.setattr('silver.pdf_renderers.pisa.pisaDocument',
                         pisa_document_mock)
 
     generate_pdf(invoice.id, invoice.kind)
@@ -91,3 +94,63 @@ def test_generate_pdf_task(settings, tmpdir, monkeypatch):
     assert pisa_document_mock.call_count == 1
 
     assert len(pisa_document_mock.mock_calls) == 1
+
+
+@pytest.mark.django_db
+def test_generate_pdfs_task_chunks(monkeypatch):
+    dirty_documents = []
+    for _ in range(3):
+        invoice = InvoiceFactory.create()
+        invoice.issue()
+        dirty_documents.append(invoice)
+
+        proforma = ProformaFactory.create()
+        proforma.issue()
+        dirty_documents.append(proforma)
+
+    clean_invoice = InvoiceFactory.create()
+    clean_invoice.issue()
+    clean_invoice.pdf.dirty = 0
+    clean_invoice.pdf.save()
+
+    monkeypatch.setattr('silver.tasks.PDF_GENERATION_CHUNK_SIZE', 4)
+
+    with patch('silver.tasks.group') as group_mock:
+        generate_pdfs()
+
+    signatures = list(group_mock.call_args[0][0])
+    assert [signature.args for signature in signatures] == [
+        ([document.id for document in dirty_documents[:4]], ),
+        ([document.id for document in dirty_documents[4:]], ),
+    ]
+
+
+@pytest.mark.django_db
+def test_generate_pdfs_chunk_task(settings, tmpdir, monkeypatch):
+    settings.MEDIA_ROOT = tmpdir.strpath
+
+    invoices = InvoiceFactory.create_batch(3)
+    for invoice in invoices:
+        invoice.issue()
+
+    monkeypatch.setattr('silver.pdf_renderers.pisa.pisaDocument',
+                        MagicMock(return_value=MagicMock(err=False)))
+
+    with CaptureQueriesContext(connection) as queries:
+        generate_pdfs_chunk([invoice.id for invoice in invoices[:2]])
+
+    entries_queries = [query for query in queries.captured_queries
+                       if 'silver_documententry' in query['sql']]
+    # The entries of both invoices are prefetched
+    assert len(entries_queries) == 2
+
+    # The providers and customers are selected along with the invoices
+    assert not [query for query in queries.captured_queries
+                if query['sql'].startswith(('SELECT "silver_provider"', 'SELECT "silver_customer"'))]
+
+    for invoice in invoices:
+        invoice.pdf.refresh_from_db()
+
+    assert not invoices[0].pdf.dirty
+    assert not invoices[1].pdf.dirty
+    assert invoices[2].pdf.dirty
@@ -0,0 +1,45 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import pytest
+
+from mock import patch
+
+from silver.fixtures.factories import PaymentMethodFactory, TransactionFactory
+from silver.fixtures.test_fixtures import PAYMENT_PROCESSORS, triggered_processor
+from silver.models import Transaction
+from silver.tasks import fetch_transactions_status
+
+
+@pytest.mark.django_db
+def test_fetch_transactions_status_in_chunks(settings):
+    settings.PAYMENT_PROCESSORS = PAYMENT_PROCESSORS
+    settings.TRANSACTIONS_EXECUTION_OPTIONS = {'rounds_per_task': 2}
+
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                 verified=True)
+    transactions = TransactionFactory.create_batch(3, payment_method=payment_method,
+                                                   state=Transaction.States.Pending)
+    transaction_ids = [transaction.id for transaction in transactions]
+
+    with patch('silver.tasks.group') as group_mock:
+        fetch_transactions_status()
+
+    signatures = list(group_mock.call_args[0][0])
+    assert [signature.args for signature in signatures] == [
+        (triggered_processor, transaction_ids[:2]),
+        (triggered_processor, transaction_ids[2:]),
+    ]
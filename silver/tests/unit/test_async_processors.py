@@ -0,0 +1,259 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from asgiref.sync import sync_to_async
+from mock import patch
+
+from silver.fixtures.factories import TransactionFactory, PaymentMethodFactory
+from silver.fixtures.test_fixtures import TriggeredProcessor, triggered_processor
+from silver.models import Transaction
+from silver.payment_processors.adapters import SyncProcessorAdapter, as_async_processor
+from silver.payment_processors.mixins import AsyncProcessorMixin
+from silver.transactions_executor import (
+    execute_transactions_in_batches, fetch_transactions_status_in_batches
+)
+
+
+GATEWAY_DELAY = 0.2
+
+
+class FakeGatewayHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        gateway = self.server
+
+        with gateway.lock:
+            gateway.in_flight += 1
+            gateway.max_in_flight = max(gateway.max_in_flight, gateway.in_flight)
+            gateway.requests.append(self.path)
+
+        time.sleep(GATEWAY_DELAY)
+
+        with gateway.lock:
+            gateway.in_flight -= 1
+
+        # the transactions whose reference ends in "declined" are refused
+        status = 'failed' if self.path.endswith('declined') else 'settled'
+        body = json.dumps({'status': status}).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def gateway():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGatewayHandler)
+    server.daemon_threads = True
+    server.request_queue_size = 128
+    server.lock = threading.Lock()
+    server.in_flight = server.max_in_flight = 0
+    server.requests = []
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+class FakeGatewayProcessor(TriggeredProcessor, AsyncProcessorMixin):
+    def __init__(self, name, gateway_address):
+        super(FakeGatewayProcessor, self).__init__(name)
+
+        self.gateway_address = gateway_address
+
+    async def _request(self, path):
+        reader, writer = await asyncio.open_connection(*self.gateway_address)
+        try:
+            writer.write('POST {} HTTP/1.0\r\nContent-Length: 0\r\n\r\n'.format(path).encode())
+            await writer.drain()
+
+            response = await reader.read()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+        return json.loads(response.split(b'\r\n\r\n', 1)[1])
+
+    def _update_transaction(self, transaction, status):
+        if status == 'settled':
+            transaction.settle()
+        else:
+            transaction.fail()
+
+        transaction.save()
+
+    async def execute_transaction_async(self, transaction):
+        response = await self._request('/transactions/{}/{}'.format(
+            transaction.uuid, transaction.external_reference or ''
+        ))
+
+        await sync_to_async(self._update_transaction)(transaction, response['status'])
+
+        return response['status'] == 'settled'
+
+    async def fetch_transaction_status_async(self, transaction):
+        response = await self._request('/transactions/{}/status'.format(transaction.uuid))
+
+        await sync_to_async(self._update_transaction)(transaction, response['status'])
+
+        return True
+
+
+@pytest.fixture
+def fake_gateway_processor(gateway):
+    payment_processor = FakeGatewayProcessor(triggered_processor, gateway.server_address)
+
+    with patch('silver.transactions_executor.get_instance', return_value=payment_processor):
+        yield payment_processor
+
+
+@pytest.mark.django_db
+def test_async_processor_executes_transactions_concurrently(gateway, fake_gateway_processor):
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                 verified=True)
+    transactions = TransactionFactory.create_batch(20, payment_method=payment_method)
+    declined_transaction = transactions[-1]
+    declined_transaction.external_reference = 'declined'
+    declined_transaction.save()
+
+    executed_count, failed_transaction_ids = execute_transactions_in_batches()
+
+    assert (executed_count, failed_transaction_ids) == (19, [declined_transaction.id])
+    assert len(gateway.requests) == 20
+    # the requests were in flight at the same time, instead of waiting for each other
+    assert gateway.max_in_flight > 1
+
+    for transaction in transactions[:-1]:
+        transaction.refresh_from_db()
+        assert transaction.state == Transaction.States.Settled
+
+    declined_transaction.refresh_from_db()
+    assert declined_transaction.state == Transaction.States.Failed
+
+
+@pytest.mark.django_db
+def test_async_processor_fetches_transactions_status(settings, gateway, fake_gateway_processor):
+    settings.TRANSACTIONS_EXECUTION_OPTIONS = {'max_in_flight': 5}
+
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor)
+    transactions = TransactionFactory.create_batch(10, payment_method=payment_method,
+                                                   state=Transaction.States.Pending)
+
+    assert fetch_transactions_status_in_batches() == (10, [])
+    assert gateway.max_in_flight == 5
+
+    for transaction in transactions:
+        transaction.refresh_from_db()
+        assert transaction.state == Transaction.States.Settled
+        assert transaction.status_polls_count == 1
+
+
+class ConcurrentCallsCounter(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = self.max_in_flight = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def __exit__(self, *args):
+        with self.lock:
+            self.in_flight -= 1
+
+
+@pytest.mark.django_db
+def test_blocking_processor_runs_through_the_sync_adapter(settings):
+    settings.TRANSACTIONS_EXECUTION_OPTIONS = {'async': True}
+
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                 verified=True)
+    transactions = TransactionFactory.create_batch(3, payment_method=payment_method)
+
+    # the calls only get past the barrier if they're all running at the same time
+    barrier = threading.Barrier(3, timeout=10)
+    calls_counter = ConcurrentCallsCounter()
+
+    def execute_transaction(transaction):
+        with calls_counter:
+            barrier.wait()
+
+        return transaction != transactions[0]
+
+    with patch.object(TriggeredProcessor, 'execute_transaction',
+                      side_effect=execute_transaction) as execute_transaction_mock:
+        executed_count, failed_transaction_ids = execute_transactions_in_batches()
+
+    assert execute_transaction_mock.call_count == 3
+    assert (executed_count, failed_transaction_ids) == (2, [transactions[0].id])
+    assert calls_counter.max_in_flight == 3
+
+    for transaction in transactions:
+        transaction.refresh_from_db()
+        assert transaction.state == Transaction.States.Pending
+
+
+@pytest.mark.django_db
+def test_sync_adapter_threads_are_limited_by_max_in_flight(settings):
+    settings.TRANSACTIONS_EXECUTION_OPTIONS = {'async': True, 'max_in_flight': 2}
+
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                 verified=True)
+    TransactionFactory.create_batch(6, payment_method=payment_method)
+
+    calls_counter = ConcurrentCallsCounter()
+    threads = set()
+
+    def execute_transaction(transaction):
+        with calls_counter:
+            threads.add(threading.get_ident())
+            time.sleep(GATEWAY_DELAY / 4)
+
+        return True
+
+    with patch.object(TriggeredProcessor, 'execute_transaction',
+                      side_effect=execute_transaction):
+        assert execute_transactions_in_batches() == (6, [])
+
+    assert calls_counter.max_in_flight <= 2
+    assert len(threads) <= 2
+
+
+def test_as_async_processor():
+    payment_processor = TriggeredProcessor(triggered_processor)
+    async_payment_processor = as_async_processor(payment_processor)
+
+    assert isinstance(async_payment_processor, SyncProcessorAdapter)
+    assert async_payment_processor.name == triggered_processor
+    assert as_async_processor(async_payment_processor) is async_payment_processor
@@ -16,11 +16,14 @@ from __future__ import absolute_import
 
 import pytest
 
-from mock import patch
+from mock import patch, MagicMock
 
 from django.template.loader import get_template
 
+from silver.fixtures.factories import InvoiceFactory, ProviderFactory
 from silver.models import PDF
+from silver.models.documents import base
+from silver.utils.pdf import fetch_resources, resolve_resource_path
 
 
 @pytest.mark.django_db
@@ -97,3 +100,134 @@ def test_pdf_mark_as_clean_min_value():
     pdf.refresh_from_db()
 
     assert pdf.dirty == 0
+
+
+@pytest.mark.django_db
+def test_generate_pdf_stores_content_hash():
+    pdf = PDF.objects.create(dirty=1)
+
+    with patch('django.db.models.fields.files.FieldFile.save', autospec=True):
+        pdf.generate(template=get_template('billing_documents/invoice_pdf.html'),
+                     context={'filename': 'filename'})
+
+    assert len(pdf.content_hash) == 64
+
+
+@pytest.mark.django_db
+def test_generate_pdf_skips_unchanged_html():
+    pdf = PDF.objects.create(dirty=1)
+    template = get_template('billing_documents/invoice_pdf.html')
+    context = {'filename': 'filename'}
+
+    with patch('django.db.models.fields.files.FieldFile.save', autospec=True):
+        pdf.generate(template=template, context=context)
+
+    pdf.pdf_file.name = 'filename'
+    pdf.save()
+    pdf.mark_as_dirty()
+
+    with patch('silver.pdf_renderers.pisa.pisaDocument') as mock_pisa_document, \
+            patch('django.db.models.fields.files.FieldFile.save',
+                  autospec=True) as mock_pdf_save:
+        assert pdf.generate(template=template, context=context) is None
+
+    assert not mock_pisa_document.called
+    assert not mock_pdf_save.called
+
+    pdf.refresh_from_db()
+
+    assert pdf.dirty == 0
+    assert pdf.skipped_generations == 1
+
+
+@pytest.mark.django_db
+def test_generate_pdf_does_not_skip_changed_html():
+    pdf = PDF.objects.create(dirty=1, content_hash='0' * 64)
+    pdf.pdf_file.name = 'filename'
+    pdf.save()
+
+    with patch('django.db.models.fields.files.FieldFile.save', autospec=True) as mock_pdf_save:
+        pdf.generate(template=get_template('billing_documents/invoice_pdf.html'),
+                     context={'filename': 'filename'})
+
+    assert mock_pdf_save.call_count == 1
+    assert pdf.content_hash != '0' * 64
+    assert pdf.skipped_generations == 0
+
+
+@pytest.mark.django_db
+def test_generate_pdf_does_not_skip_changed_renderer_or_content_version(settings):
+    pdf = PDF.objects.create(dirty=1)
+    template = get_template('billing_documents/invoice_pdf.html')
+    context = {'filename': 'filename'}
+
+    with patch('django.db.models.fields.files.FieldFile.save', autospec=True):
+        pdf.generate(template=template, context=context)
+
+    pdf.pdf_file.name = 'filename'
+    pdf.save()
+    content_hash = pdf.content_hash
+
+    settings.SILVER_PDF_CONTENT_VERSION = '2'
+    with patch('django.db.models.fields.files.FieldFile.save', autospec=True) as mock_pdf_save:
+        pdf.generate(template=template, context=context)
+
+    assert mock_pdf_save.call_count == 1
+    assert pdf.content_hash != content_hash
+    content_hash = pdf.content_hash
+
+    renderer_mock = MagicMock(identifier='other renderer')
+    with patch('silver.models.documents.pdf.get_pdf_renderer', return_value=renderer_mock), \
+            patch('django.db.models.fields.files.FieldFile.save',
+                  autospec=True) as mock_pdf_save:
+        pdf.generate(template=template, context=context)
+
+    assert renderer_mock.render.call_count == 1
+    assert mock_pdf_save.call_count == 1
+    assert pdf.content_hash != content_hash
+    assert pdf.skipped_generations == 0
+
+
+@pytest.mark.django_db
+def test_generate_pdf_spools_large_pdfs_to_disk():
+    pdf = PDF.objects.create(dirty=1)
+
+    with patch('silver.models.documents.pdf.PDF_SPOOL_MAX_SIZE', 1024):
+        pdf_file_object = pdf.generate(template=get_template('billing_documents/invoice_pdf.html'),
+                                       context={}, upload=False)
+
+    assert pdf_file_object._rolled
+
+    pdf_file_object.seek(0)
+    assert pdf_file_object.read(4) == b'%PDF'
+
+
+@pytest.mark.django_db
+def test_pdf_template_selection_is_cached(monkeypatch):
+    monkeypatch.setattr(base, '_pdf_templates', {})
+
+    provider = ProviderFactory.create()
+    invoices = InvoiceFactory.create_batch(2, provider=provider)
+
+    with patch('silver.models.documents.base.select_template',
+               wraps=base.select_template) as select_template_mock:
+        templates = [invoice.get_template(state='issued') for invoice in invoices]
+        invoices[0].get_template(state='paid')
+
+    assert templates[0] is templates[1]
+    assert select_template_mock.call_count == 2
+
+
+def test_fetch_resources_caches_resolved_paths(settings):
+    resolve_resource_path.cache_clear()
+
+    with patch('silver.utils.pdf.os.path.exists', return_value=False) as exists_mock:
+        for _ in range(3):
+            path = fetch_resources(settings.STATIC_URL + 'font/OpenSans-Regular.ttf', None)
+
+    assert path.endswith('font/OpenSans-Regular.ttf')
+    assert exists_mock.call_count == 1 + len(settings.STATICFILES_DIRS)
+
+    settings.STATIC_ROOT = '/other_static/'
+
+    assert fetch_resources(settings.STATIC_URL + 'font/OpenSans-Regular.ttf', None) != path
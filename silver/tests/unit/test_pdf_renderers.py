@@ -0,0 +1,80 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import sys
+from io import BytesIO
+
+import pytest
+
+from django.test import override_settings
+
+from silver.pdf_renderers import (
+    get_pdf_renderer, PisaPDFRenderer, ProcessPDFRenderer, PDFRenderingError
+)
+
+
+HTML = b'<html><body><p>Invoice</p></body></html>'
+
+
+def test_pisa_pdf_renderer():
+    pdf_file_object = BytesIO()
+
+    PisaPDFRenderer().render(HTML, pdf_file_object)
+
+    assert pdf_file_object.getvalue().startswith(b'%PDF')
+
+
+def test_process_pdf_renderer_reuses_the_worker():
+    renderer = ProcessPDFRenderer(max_documents=2)
+
+    try:
+        pids = []
+        for _ in range(3):
+            pdf_file_object = BytesIO()
+            renderer.render(HTML, pdf_file_object)
+
+            assert pdf_file_object.getvalue().startswith(b'%PDF')
+            pids.append(renderer._process.pid)
+    finally:
+        renderer.close()
+
+    # the worker is restarted after rendering max_documents documents
+    assert pids[0] == pids[1] != pids[2]
+    assert renderer._process is None
+
+
+def test_process_pdf_renderer_worker_exiting_unexpectedly():
+    renderer = ProcessPDFRenderer(command=[sys.executable, '-c', 'pass'])
+
+    with pytest.raises(PDFRenderingError):
+        renderer.render(HTML, BytesIO())
+
+    assert renderer._process is None
+
+
+def test_get_pdf_renderer_from_settings():
+    assert isinstance(get_pdf_renderer(), PisaPDFRenderer)
+
+    with override_settings(SILVER_PDF_RENDERER=(
+        'silver.pdf_renderers.ProcessPDFRenderer', [], {'max_documents': 10}
+    )):
+        renderer = get_pdf_renderer()
+
+        assert isinstance(renderer, ProcessPDFRenderer)
+        assert renderer.max_documents == 10
+        assert get_pdf_renderer() is renderer
+
+    assert isinstance(get_pdf_renderer(), PisaPDFRenderer)
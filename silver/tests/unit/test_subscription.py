@@ -16,14 +16,20 @@ from __future__ import absolute_import
 
 import datetime
 
+from decimal import Decimal
+from fractions import Fraction
+from unittest import skipUnless
+
 from freezegun import freeze_time
 from mock import patch, PropertyMock, MagicMock
 
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
 
 from silver.models import Plan, Subscription, BillingLog
 from silver.fixtures.factories import (SubscriptionFactory, MeteredFeatureFactory,
-                                       PlanFactory)
+                                       PlanFactory, MeteredFeatureUnitsLogFactory)
 
 
 class TestSubscription(TestCase):
@@ -444,6 +450,51 @@ class TestSubscription(TestCase):
         assert end_date == subscription.cycle_end_date(reference_date)
 
 
+class TestSubscriptionMeteredFeatureUnitsLogs(TestCase):
+    def test_get_extra_consumed_units_sums_logs_within_interval(self):
+        subscription = SubscriptionFactory.create()
+        metered_feature = MeteredFeatureFactory.create(included_units=Decimal('10.00'))
+
+        start_datetime = datetime.datetime(2015, 1, 1, tzinfo=timezone.utc)
+        end_datetime = datetime.datetime(2015, 1, 31, 23, 59, 59, tzinfo=timezone.utc)
+
+        for day, annotation in ((1, 'a'), (10, 'b'), (20, None)):
+            MeteredFeatureUnitsLogFactory.create(
+                subscription=subscription, metered_feature=metered_feature,
+                start_datetime=start_datetime.replace(day=day),
+                end_datetime=start_datetime.replace(day=day + 1),
+                consumed_units=Decimal('5.00'), annotation=annotation
+            )
+
+        # outside of the interval
+        MeteredFeatureUnitsLogFactory.create(
+            subscription=subscription, metered_feature=metered_feature,
+            start_datetime=datetime.datetime(2015, 2, 1, tzinfo=timezone.utc),
+            end_datetime=datetime.datetime(2015, 2, 2, tzinfo=timezone.utc),
+            consumed_units=Decimal('100.00')
+        )
+
+        overage_info = subscription._get_extra_consumed_units(
+            metered_feature, Fraction(1), start_datetime, end_datetime, bonuses=[]
+        )
+
+        assert overage_info.extra_consumed_units == Decimal('5.00')
+        assert set(overage_info.annotations) == {'a', 'b', None}
+
+    @skipUnless(connection.vendor == 'sqlite', 'The query plan format is backend specific.')
+    def test_usage_range_lookup_is_index_only(self):
+        subscription = SubscriptionFactory.create()
+        metered_feature = MeteredFeatureFactory.create()
+
+        plan = subscription.mf_log_entries.filter(
+            metered_feature=metered_feature,
+            start_datetime__gte=timezone.now(),
+            end_datetime__lte=timezone.now()
+        ).values_list('consumed_units', 'annotation').explain()
+
+        assert 'USING COVERING INDEX mf_log_usage_range_idx' in plan
+
+
 class TestSubscriptionShouldBeBilled(TestCase):
     """
     NOTE (important abbreviations):
@@ -0,0 +1,332 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import time
+from datetime import timedelta
+
+import pytest
+
+from freezegun import freeze_time
+from mock import MagicMock, patch, call
+
+from django.core.cache import caches
+from django.utils import timezone
+
+from silver.fixtures.factories import TransactionFactory, PaymentMethodFactory
+from silver.fixtures.test_fixtures import (
+    TriggeredProcessor, PAYMENT_PROCESSORS, triggered_processor, manual_processor
+)
+from silver.models import Transaction
+from silver.payment_processors.mixins import TransientPaymentProcessorError
+from silver.transactions_executor import (
+    CacheRateLimiter, RateLimiter, execute_transactions_in_batches,
+    executable_transactions_by_processor, fetch_transactions_status_in_batches,
+    pending_transactions_by_processor, split_in_task_chunks
+)
+
+
+@pytest.fixture
+def payment_processors(settings):
+    settings.PAYMENT_PROCESSORS = dict(PAYMENT_PROCESSORS, **{
+        triggered_processor: dict(PAYMENT_PROCESSORS[triggered_processor], execution={
+            'max_retries': 2, 'retry_backoff': 3
+        })
+    })
+
+    # the processor accepts batches of 2 transactions
+    with patch.multiple(TriggeredProcessor, transactions_batch_size=2,
+                        transactions_status_batch_size=2):
+        yield
+
+
+@pytest.mark.django_db
+def test_executable_transactions_are_grouped_by_processor(payment_processors):
+    triggered_transactions = TransactionFactory.create_batch(
+        2, payment_method=PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                      verified=True)
+    )
+    manual_transaction = TransactionFactory.create(
+        payment_method=PaymentMethodFactory.create(payment_processor=manual_processor,
+                                                   verified=True)
+    )
+    # not executable, since its payment method is unverified
+    TransactionFactory.create(
+        payment_method=PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                   verified=False)
+    )
+
+    assert executable_transactions_by_processor() == {
+        triggered_processor: triggered_transactions,
+        manual_processor: [manual_transaction]
+    }
+
+
+@pytest.mark.django_db
+def test_execute_transactions_in_batches(payment_processors):
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                 verified=True)
+    transactions = TransactionFactory.create_batch(3, payment_method=payment_method)
+
+    def execute_transactions(batch):
+        # the first transaction of each batch fails
+        return {transaction: transaction != batch[0] for transaction in batch}
+
+    with patch.object(TriggeredProcessor, 'execute_transactions',
+                      side_effect=execute_transactions) as execute_transactions_mock:
+        executed_count, failed_transaction_ids = execute_transactions_in_batches()
+
+    assert execute_transactions_mock.call_args_list == [
+        call(transactions[:2]), call(transactions[2:])
+    ]
+    assert executed_count == 1
+    assert failed_transaction_ids == [transactions[0].id, transactions[2].id]
+
+    for transaction in transactions:
+        transaction.refresh_from_db()
+        assert transaction.state == Transaction.States.Pending
+
+
+@pytest.mark.django_db
+def test_execute_transactions_retries_transient_errors(payment_processors):
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                 verified=True)
+    transaction = TransactionFactory.create(payment_method=payment_method)
+
+    execute_transactions_mock = MagicMock(side_effect=[
+        TransientPaymentProcessorError('Rate limited.'),
+        TransientPaymentProcessorError('Rate limited.', retry_after=10),
+        {transaction: True}
+    ])
+
+    with patch.object(TriggeredProcessor, 'execute_transactions',
+                      execute_transactions_mock), \
+            patch('silver.transactions_executor.time.sleep') as sleep_mock:
+        executed_count, failed_transaction_ids = execute_transactions_in_batches()
+
+    assert execute_transactions_mock.call_count == 3
+    assert sleep_mock.call_args_list == [call(3), call(10)]
+    assert (executed_count, failed_transaction_ids) == (1, [])
+
+
+@pytest.mark.django_db
+def test_execute_transactions_gives_up_after_max_retries(payment_processors):
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                 verified=True)
+    transaction = TransactionFactory.create(payment_method=payment_method)
+
+    execute_transactions_mock = MagicMock(side_effect=TransientPaymentProcessorError())
+
+    with patch.object(TriggeredProcessor, 'execute_transactions',
+                      execute_transactions_mock), \
+            patch('silver.transactions_executor.time.sleep'):
+        executed_count, failed_transaction_ids = execute_transactions_in_batches()
+
+    assert execute_transactions_mock.call_count == 3
+    assert (executed_count, failed_transaction_ids) == (0, [transaction.id])
+
+    # the transaction never reached the gateway, so it's executed again next time
+    transaction.refresh_from_db()
+    assert transaction.state == Transaction.States.Initial
+
+
+@pytest.mark.django_db
+def test_execute_transactions_one_at_a_time_through_process_transaction(settings):
+    settings.PAYMENT_PROCESSORS = PAYMENT_PROCESSORS
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                 verified=True)
+    transaction = TransactionFactory.create(payment_method=payment_method)
+
+    processed_states = []
+
+    def process_transaction(transaction):
+        processed_states.append(transaction.state)
+        transaction.process()
+        if len(processed_states) == 1:
+            raise TransientPaymentProcessorError('Rate limited.')
+
+        return True
+
+    # the processors executing a transaction at a time may override process_transaction
+    with patch.object(TriggeredProcessor, 'process_transaction',
+                      side_effect=process_transaction) as process_transaction_mock, \
+            patch('silver.transactions_executor.time.sleep'):
+        executed_count, failed_transaction_ids = execute_transactions_in_batches()
+
+    assert process_transaction_mock.call_count == 2
+    # the transaction is reverted before being retried
+    assert processed_states == [Transaction.States.Initial] * 2
+    assert (executed_count, failed_transaction_ids) == (1, [])
+
+
+@pytest.mark.django_db
+def test_execute_transactions_retries_only_the_unexecuted_transactions(payment_processors):
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                 verified=True)
+    transactions = TransactionFactory.create_batch(2, payment_method=payment_method)
+
+    # the default execute_transactions executes the transactions one by one
+    execute_transaction_mock = MagicMock(side_effect=[
+        True, TransientPaymentProcessorError(), TransientPaymentProcessorError(),
+        TransientPaymentProcessorError()
+    ])
+
+    with patch.object(TriggeredProcessor, 'execute_transaction', execute_transaction_mock), \
+            patch('silver.transactions_executor.time.sleep'):
+        executed_count, failed_transaction_ids = execute_transactions_in_batches()
+
+    assert execute_transaction_mock.call_args_list == [
+        call(transactions[0]), call(transactions[1]), call(transactions[1]),
+        call(transactions[1])
+    ]
+    assert (executed_count, failed_transaction_ids) == (1, [transactions[1].id])
+
+    for transaction in transactions:
+        transaction.refresh_from_db()
+
+    assert transactions[0].state == Transaction.States.Pending
+    assert transactions[1].state == Transaction.States.Initial
+
+
+@pytest.mark.django_db
+def test_async_execution_gives_up_after_max_retries(settings):
+    settings.TRANSACTIONS_EXECUTION_OPTIONS = {'async': True, 'max_retries': 1}
+
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                 verified=True)
+    transaction = TransactionFactory.create(payment_method=payment_method)
+
+    with patch.object(TriggeredProcessor, 'execute_transaction',
+                      side_effect=TransientPaymentProcessorError()) as execute_transaction_mock, \
+            patch('silver.transactions_executor.asyncio.sleep'):
+        executed_count, failed_transaction_ids = execute_transactions_in_batches()
+
+    assert execute_transaction_mock.call_count == 2
+    assert (executed_count, failed_transaction_ids) == (0, [transaction.id])
+
+    transaction.refresh_from_db()
+    assert transaction.state == Transaction.States.Initial
+
+
+@pytest.mark.django_db
+def test_fetch_transactions_status_in_batches(payment_processors):
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor)
+    transactions = TransactionFactory.create_batch(3, payment_method=payment_method,
+                                                   state=Transaction.States.Pending)
+    # not pending, so its status isn't fetched
+    TransactionFactory.create(payment_method=payment_method)
+
+    fetch_transactions_status_mock = MagicMock(side_effect=[
+        TransientPaymentProcessorError(),
+        {transactions[0]: True, transactions[1]: False},
+        {transactions[2]: True}
+    ])
+
+    with patch.object(TriggeredProcessor, 'fetch_transactions_status',
+                      fetch_transactions_status_mock), \
+            patch('silver.transactions_executor.time.sleep'):
+        updated_count, failed_transaction_ids = fetch_transactions_status_in_batches()
+
+    assert fetch_transactions_status_mock.call_args_list == [
+        call(transactions[:2]), call(transactions[:2]), call(transactions[2:])
+    ]
+    assert (updated_count, failed_transaction_ids) == (2, [transactions[1].id])
+
+
+@pytest.mark.django_db
+def test_pending_transactions_are_selected_when_due(payment_processors):
+    now = timezone.now()
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor)
+
+    never_polled, due = TransactionFactory.create_batch(
+        2, payment_method=payment_method, state=Transaction.States.Pending
+    )
+    due.next_status_poll_at = now - timedelta(seconds=1)
+    due.save()
+
+    not_due = TransactionFactory.create(payment_method=payment_method,
+                                        state=Transaction.States.Pending,
+                                        next_status_poll_at=now + timedelta(minutes=1))
+    too_old = TransactionFactory.create(payment_method=payment_method,
+                                        state=Transaction.States.Pending,
+                                        created_at=now - timedelta(days=31))
+
+    assert pending_transactions_by_processor() == {triggered_processor: [never_polled, due]}
+    # explicitly requested transactions are selected even if they aren't due
+    assert pending_transactions_by_processor([not_due.id, too_old.id]) == {
+        triggered_processor: [not_due, too_old]
+    }
+
+
+@pytest.mark.django_db
+def test_fetch_transactions_status_backs_off(settings):
+    settings.TRANSACTIONS_STATUS_POLLING_OPTIONS = {'initial_interval': 10, 'max_interval': 30}
+
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor)
+    transaction = TransactionFactory.create(payment_method=payment_method,
+                                            state=Transaction.States.Pending)
+
+    polls_at = []
+    with freeze_time() as frozen_time:
+        for _ in range(4):
+            fetch_transactions_status_in_batches()
+            # a second status fetch doesn't select the transaction again until it's due
+            assert fetch_transactions_status_in_batches() == (0, [])
+
+            transaction.refresh_from_db()
+            polls_at.append(transaction.next_status_poll_at)
+            frozen_time.move_to(transaction.next_status_poll_at)
+
+    assert transaction.status_polls_count == 4
+    assert [(next_poll_at - poll_at).total_seconds()
+            for poll_at, next_poll_at in zip(polls_at, polls_at[1:])] == [20, 30, 30]
+
+
+def test_rate_limiter():
+    rate_limiter = RateLimiter(rate=50)
+
+    started_at = time.monotonic()
+    for _ in range(5):
+        rate_limiter.wait()
+
+    assert time.monotonic() - started_at >= 4 / 50.0
+
+
+def test_cache_rate_limiter():
+    # the limiters share the counts of the calls made through the same cache key
+    rate_limiters = [CacheRateLimiter(caches['default'], 'test-rate-limit', rate=2)
+                     for _ in range(2)]
+
+    with freeze_time('2022-01-01 00:00:00.25'):
+        assert rate_limiters[0].get_delay() == 0
+        assert rate_limiters[1].get_delay() == 0
+        assert rate_limiters[0].get_delay() == pytest.approx(0.75)
+
+    with freeze_time('2022-01-01 00:00:01'):
+        assert rate_limiters[1].get_delay() == 0
+
+
+@pytest.mark.django_db
+def test_split_in_task_chunks(payment_processors, settings):
+    settings.TRANSACTIONS_EXECUTION_OPTIONS = {'rounds_per_task': 2}
+    payment_method = PaymentMethodFactory.create(payment_processor=triggered_processor,
+                                                 verified=True)
+    transactions = TransactionFactory.create_batch(5, payment_method=payment_method)
+    transaction_ids = [transaction.id for transaction in transactions]
+
+    # 2 rounds of a batch of 2 transactions
+    assert split_in_task_chunks(triggered_processor, transactions,
+                                'transactions_batch_size') == [transaction_ids[:4],
+                                                               transaction_ids[4:]]
@@ -0,0 +1,715 @@
+# Copyright (c) 2026 Pressinfra SRL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Executes the initial transactions and fetches the status of the pending ones in batches,
+grouped by payment processor.
+
+The requests made to each payment processor can be tuned through the optional
+`execution` key of its PAYMENT_PROCESSORS entry, falling back to the
+TRANSACTIONS_EXECUTION_OPTIONS setting:
+
+    - concurrency: the number of threads executing the transactions (defaults to 1).
+    - rate_limit: the maximum number of requests per second made to the payment gateway.
+    - max_retries: how many times a request failing with TransientPaymentProcessorError is
+      retried (defaults to 3).
+    - retry_backoff: the number of seconds waited before the first retry, doubled for each
+      of the following ones (defaults to 1).
+    - async: whether to use the asyncio runner, which keeps up to `max_in_flight` gateway
+      requests in flight from a single thread (defaults to False). It's always used for the
+      processors implementing AsyncProcessorMixin, while the blocking processors are run
+      through SyncProcessorAdapter.
+    - max_in_flight: the maximum number of concurrent gateway requests made by the asyncio
+      runner (defaults to 100).
+    - rounds_per_task: the tasks handle a processor's transactions in chunks, each made of
+      this many rounds of the requests made at once (a batch per `concurrency` thread, or
+      `max_in_flight` requests for the asyncio runner), so that the chunks can be spread over
+      the workers and each task's duration stays bounded (defaults to 10).
+
+The `rate_limit` only holds within a process, unless the TRANSACTIONS_RATE_LIMIT_CACHE setting
+names a cache (from CACHES) shared by the workers, through which the requests made by all of
+them are counted.
+
+The status of a pending transaction is fetched again after an interval which starts at
+`initial_interval` seconds and doubles after each fetch, up to `max_interval` seconds. The
+status of the transactions older than `max_age` seconds isn't fetched anymore. These can be set
+through the TRANSACTIONS_STATUS_POLLING_OPTIONS setting (defaulting to a minute, a day and
+30 days).
+"""
+
+from __future__ import absolute_import
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from django_fsm import TransitionNotAllowed
+
+from silver.models import Transaction
+from silver.payment_processors import get_instance
+from silver.payment_processors.adapters import as_async_processor
+from silver.payment_processors.mixins import (
+    AsyncProcessorMixin, PaymentProcessorTypes, TransientPaymentProcessorError
+)
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXECUTION_OPTIONS = {
+    'concurrency': 1,
+    'rate_limit': None,
+    'max_retries': 3,
+    'retry_backoff': 1,
+    'async': False,
+    'max_in_flight': 100,
+    'rounds_per_task': 10,
+}
+
+DEFAULT_STATUS_POLLING_OPTIONS = {
+    'initial_interval': 60,
+    'max_interval': 60 * 60 * 24,
+    'max_age': 60 * 60 * 24 * 30,
+}
+
+
+class RateLimiter(object):
+    """
+    Spaces out the calls to `wait`, so that at most `rate` calls per second get through.
+    It can be shared between threads.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+
+        self._lock = threading.Lock()
+        self._next_call_at = time.monotonic()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            call_at = max(now, self._next_call_at)
+            self._next_call_at = call_at + self.interval
+
+        if call_at > now:
+            time.sleep(call_at - now)
+
+
+class AsyncRateLimiter(object):
+    """
+    The RateLimiter counterpart for coroutines running in the same event loop.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+
+        self._next_call_at = time.monotonic()
+
+    async def wait(self):
+        now = time.monotonic()
+        call_at = max(now, self._next_call_at)
+        self._next_call_at = call_at + self.interval
+
+        if call_at > now:
+            await asyncio.sleep(call_at - now)
+
+
+class CacheRateLimiter(object):
+    """
+    Lets at most `rate` calls per second get through, across all the processes sharing the
+    `cache`. The calls are counted in fixed windows of (at least) a second.
+    """
+
+    def __init__(self, cache, key, rate):
+        self.cache = cache
+        self.key = key
+        self.window = max(1.0, 1.0 / rate)
+        self.limit = max(1, int(rate * self.window))
+
+    def get_delay(self):
+        """
+        Counts a call in the current window. Returns 0 if the call can be made right away, or the
+        number of seconds left until the next window otherwise.
+        """
+
+        now = time.time()
+        window_index = int(now // self.window)
+        key = '%s:%d' % (self.key, window_index)
+
+        if self.cache.add(key, 1, timeout=int(self.window) + 1):
+            calls_count = 1
+        else:
+            try:
+                calls_count = self.cache.incr(key)
+            except ValueError:
+                # the window's counter has just expired
+                calls_count = 1
+
+        if calls_count <= self.limit:
+            return 0
+
+        return (window_index + 1) * self.window - now
+
+    def wait(self):
+        delay = self.get_delay()
+        while delay:
+            time.sleep(delay)
+            delay = self.get_delay()
+
+
+class AsyncCacheRateLimiter(CacheRateLimiter):
+    """
+    The CacheRateLimiter counterpart for coroutines.
+    """
+
+    async def wait(self):
+        get_delay = sync_to_async(self.get_delay)
+
+        delay = await get_delay()
+        while delay:
+            await asyncio.sleep(delay)
+            delay = await get_delay()
+
+
+def get_rate_limiter(payment_processor_name, options, asynchronous=False):
+    if not options['rate_limit']:
+        return None
+
+    cache_alias = getattr(settings, 'TRANSACTIONS_RATE_LIMIT_CACHE', None)
+    if cache_alias:
+        rate_limiter_class = AsyncCacheRateLimiter if asynchronous else CacheRateLimiter
+        return rate_limiter_class(caches[cache_alias],
+                                  'silver:rate-limit:%s' % payment_processor_name,
+                                  options['rate_limit'])
+
+    rate_limiter_class = AsyncRateLimiter if asynchronous else RateLimiter
+    return rate_limiter_class(options['rate_limit'])
+
+
+def get_execution_options(payment_processor_name):
+    options = dict(DEFAULT_EXECUTION_OPTIONS)
+    options.update(getattr(settings, 'TRANSACTIONS_EXECUTION_OPTIONS', {}))
+    options.update(settings.PAYMENT_PROCESSORS.get(payment_processor_name, {}).get('execution', {}))
+
+    return options
+
+
+def executable_transactions_by_processor(transaction_ids=None):
+    """
+    :returns: an OrderedDict mapping the payment processors names to the lists of initial
+        transactions that can be executed through them.
+    """
+
+    executable_transactions = Transaction.objects.filter(
+        state=Transaction.States.Initial,
+        payment_method__verified=True,
+        payment_method__canceled=False
+    ).select_related('payment_method').order_by('id')
+
+    if transaction_ids:
+        executable_transactions = executable_transactions.filter(pk__in=transaction_ids)
+
+    return _group_by_processor(executable_transactions)
+
+
+def get_status_polling_options():
+    options = dict(DEFAULT_STATUS_POLLING_OPTIONS)
+    options.update(getattr(settings, 'TRANSACTIONS_STATUS_POLLING_OPTIONS', {}))
+
+    return options
+
+
+def pending_transactions_by_processor(transaction_ids=None):
+    """
+    :param transaction_ids: when given, the status of these transactions is fetched even if
+        it's not due yet.
+    :returns: an OrderedDict mapping the payment processors names to the lists of pending
+        transactions whose status can be fetched through them.
+    """
+
+    pending_transactions = Transaction.objects.filter(
+        state=Transaction.States.Pending
+    ).select_related('payment_method').order_by('id')
+
+    if transaction_ids:
+        pending_transactions = pending_transactions.filter(pk__in=transaction_ids)
+    else:
+        now = timezone.now()
+        pending_transactions = pending_transactions.filter(
+            Q(next_status_poll_at__isnull=True) | Q(next_status_poll_at__lte=now),
+            created_at__gte=now - timedelta(seconds=get_status_polling_options()['max_age'])
+        )
+
+    return _group_by_processor(pending_transactions)
+
+
+def schedule_next_status_polls(transactions):
+    """
+    Postpones the next status fetch of the given transactions, with an exponential backoff:
+    the longer a transaction has been pending, the less often its status is fetched.
+    """
+
+    options = get_status_polling_options()
+    now = timezone.now()
+
+    for transaction in transactions:
+        interval = min(options['initial_interval'] * 2 ** transaction.status_polls_count,
+                       options['max_interval'])
+
+        transaction.next_status_poll_at = now + timedelta(seconds=interval)
+        transaction.status_polls_count += 1
+
+    Transaction.objects.bulk_update(transactions, ['next_status_poll_at', 'status_polls_count'])
+
+
+def _group_by_processor(transactions):
+    transactions_by_processor = OrderedDict()
+    for transaction in transactions:
+        transactions_by_processor.setdefault(
+            transaction.payment_method.payment_processor, []
+        ).append(transaction)
+
+    return transactions_by_processor
+
+
+def _split_in_batches(transactions, batch_size):
+    return [transactions[index:index + batch_size]
+            for index in range(0, len(transactions), batch_size)]
+
+
+def split_in_task_chunks(payment_processor_name, transactions, batch_size_attribute):
+    """
+    Splits the transactions of a payment processor in the chunks handled by separate tasks,
+    according to the processor's `rounds_per_task` execution option.
+
+    :param batch_size_attribute: the processor's attribute holding the number of transactions
+        passed at once to its batch method (e.g. `transactions_batch_size`).
+    :returns: the lists of ids of the chunks' transactions.
+    """
+
+    payment_processor = get_instance(payment_processor_name)
+    options = get_execution_options(payment_processor_name)
+
+    if _uses_async_runner(payment_processor, options):
+        requests_at_once = options['max_in_flight']
+    else:
+        requests_at_once = (getattr(payment_processor, batch_size_attribute) *
+                            options['concurrency'])
+
+    return _split_in_batches([transaction.id for transaction in transactions],
+                             requests_at_once * options['rounds_per_task'])
+
+
+def _call_with_retries(method, transactions, rate_limiter, max_retries, retry_backoff):
+    """
+    Calls the batch `method` of a payment processor, retrying it with an exponential backoff
+    as long as it fails with TransientPaymentProcessorError, at most `max_retries` times.
+
+    Only the transactions missing from the error's `results` are retried. When giving up, the
+    error is raised with the `results` of all the attempts.
+    """
+
+    results = {}
+    for attempt in range(max_retries + 1):
+        if rate_limiter:
+            rate_limiter.wait()
+
+        try:
+            results.update(method(transactions))
+            return results
+        except TransientPaymentProcessorError as error:
+            results.update(error.results)
+            transactions = [transaction for transaction in transactions
+                            if transaction not in results]
+            if not transactions:
+                return results
+
+            if attempt == max_retries:
+                error.results = results
+                raise
+
+            time.sleep(max(error.retry_after or 0, retry_backoff * 2 ** attempt))
+
+
+async def _call_with_retries_async(coroutine_function, transaction, rate_limiter, max_retries,
+                                   retry_backoff):
+    for attempt in range(max_retries + 1):
+        if rate_limiter:
+            await rate_limiter.wait()
+
+        try:
+            return await coroutine_function(transaction)
+        except TransientPaymentProcessorError as error:
+            if attempt == max_retries:
+                raise
+
+            await asyncio.sleep(max(error.retry_after or 0, retry_backoff * 2 ** attempt))
+
+
+def _uses_async_runner(payment_processor, options):
+    return options['async'] or isinstance(payment_processor, AsyncProcessorMixin)
+
+
+def _run_concurrently(coroutine_function, payment_processor_name, payment_processor,
+                      transactions, options):
+    """
+    Awaits `coroutine_function` for each transaction, keeping at most `max_in_flight` of them
+    running at once, in an event loop started in the calling thread.
+
+    The database is accessed by the coroutines through sync_to_async, which runs the queries
+    in the calling thread, one at a time. The methods of blocking processors are run in a pool
+    of `max_in_flight` threads.
+
+    :returns: the list of the results, in the order of the transactions.
+    """
+
+    async_payment_processor = as_async_processor(payment_processor,
+                                                 max_workers=options['max_in_flight'])
+
+    async def run():
+        semaphore = asyncio.Semaphore(options['max_in_flight'])
+        rate_limiter = get_rate_limiter(payment_processor_name, options, asynchronous=True)
+
+        async def run_one(transaction):
+            async with semaphore:
+                return await coroutine_function(async_payment_processor, transaction,
+                                                rate_limiter, options['max_retries'],
+                                                options['retry_backoff'])
+
+        return await asyncio.gather(*[run_one(transaction) for transaction in transactions])
+
+    try:
+        return async_to_sync(run)()
+    finally:
+        if async_payment_processor is not payment_processor:
+            async_payment_processor.close()
+
+
+async def _execute_transaction_async(payment_processor, transaction, rate_limiter, max_retries,
+                                     retry_backoff):
+    try:
+        await sync_to_async(transaction.process)()
+    except TransitionNotAllowed:
+        logger.exception("Couldn't process transaction with pk %d." % transaction.pk)
+        return False
+
+    try:
+        return await _call_with_retries_async(payment_processor.execute_transaction_async,
+                                              transaction, rate_limiter,
+                                              max_retries, retry_backoff)
+    except TransientPaymentProcessorError:
+        logger.error('Giving up executing transaction with id=%s after %d retries.',
+                     transaction.id, max_retries, exc_info=True)
+        await sync_to_async(_revert_processing)([transaction])
+    except Exception:
+        logger.error('Encountered exception while executing transaction '
+                     'with id=%s.', transaction.id, exc_info=True)
+
+    return False
+
+
+async def _fetch_transaction_status_async(payment_processor, transaction, rate_limiter,
+                                          max_retries, retry_backoff):
+    try:
+        return await _call_with_retries_async(payment_processor.fetch_transaction_status_async,
+                                              transaction, rate_limiter,
+                                              max_retries, retry_backoff)
+    except TransientPaymentProcessorError:
+        logger.error('Giving up updating transaction with id=%s after %d retries.',
+                     transaction.id, max_retries, exc_info=True)
+    except Exception:
+        logger.error('Encountered exception while updating transaction '
+                     'with id=%s.', transaction.id, exc_info=True)
+
+    return False
+
+
+def _count_results(transactions, results):
+    succeeded_count = 0
+    failed_transaction_ids = []
+    for transaction, result in zip(transactions, results):
+        if result is False:
+            failed_transaction_ids.append(transaction.id)
+        else:
+            succeeded_count += 1
+
+    return succeeded_count, failed_transaction_ids
+
+
+def _revert_processing(transactions):
+    """
+    Reverts the given transactions, which were processed but never reached the payment
+    gateway, to the initial state, so that they get executed again.
+    """
+
+    for transaction in transactions:
+        try:
+            transaction.revert_processing()
+        except TransitionNotAllowed:
+            logger.exception("Couldn't revert the processing of transaction with pk %d." %
+                             transaction.pk)
+
+
+def _process_transaction(payment_processor, transaction, rate_limiter, max_retries,
+                         retry_backoff):
+    """
+    Executes a single transaction through `process_transaction`, which the payment processors
+    may override. It's retried as long as it fails with TransientPaymentProcessorError, after
+    the transaction's processing is reverted.
+    """
+
+    for attempt in range(max_retries + 1):
+        if rate_limiter:
+            rate_limiter.wait()
+
+        try:
+            return payment_processor.process_transaction(transaction)
+        except TransientPaymentProcessorError as error:
+            if transaction.state == Transaction.States.Pending:
+                _revert_processing([transaction])
+
+            if attempt == max_retries:
+                logger.error('Giving up executing transaction with id=%s after %d retries.',
+                             transaction.id, max_retries, exc_info=True)
+                return False
+
+            time.sleep(max(error.retry_after or 0, retry_backoff * 2 ** attempt))
+        except Exception:
+            logger.error('Encountered exception while executing transaction '
+                         'with id=%s.', transaction.id, exc_info=True)
+            return False
+
+
+def _execute_batch(payment_processor, transactions, rate_limiter, max_retries, retry_backoff):
+    if payment_processor.transactions_batch_size == 1:
+        return {
+            transaction: _process_transaction(payment_processor, transaction, rate_limiter,
+                                              max_retries, retry_backoff)
+            for transaction in transactions
+        }
+
+    processed_transactions = []
+    for transaction in transactions:
+        try:
+            transaction.process()
+        except TransitionNotAllowed:
+            logger.exception("Couldn't process transaction with pk %d." % transaction.pk)
+        else:
+            processed_transactions.append(transaction)
+
+    results = {transaction: False for transaction in transactions}
+    if not processed_transactions:
+        return results
+
+    try:
+        results.update(_call_with_retries(payment_processor.execute_transactions,
+                                          processed_transactions, rate_limiter,
+                                          max_retries, retry_backoff))
+    except TransientPaymentProcessorError as error:
+        results.update(error.results)
+
+        unexecuted_transactions = [transaction for transaction in processed_transactions
+                                   if transaction not in error.results]
+        logger.error('Giving up executing transactions with ids=%s after %d retries.',
+                     [transaction.id for transaction in unexecuted_transactions],
+                     max_retries, exc_info=True)
+        _revert_processing(unexecuted_transactions)
+    except Exception:
+        for transaction in processed_transactions:
+            logger.error('Encountered exception while executing transaction '
+                         'with id=%s.', transaction.id, exc_info=True)
+
+    return results
+
+
+def _execute_batch_in_thread(*args, **kwargs):
+    try:
+        return _execute_batch(*args, **kwargs)
+    finally:
+        # Each thread uses its own database connection
+        connection.close()
+
+
+def execute_processor_transactions(payment_processor_name, transactions):
+    """
+    Executes the given initial transactions of a payment processor, in batches of at most
+    `transactions_batch_size` transactions, using the processor's execution options.
+
+    :returns: a tuple consisting of the number of successfully executed transactions and the
+        list of ids of the transactions that failed.
+    """
+
+    payment_processor = get_instance(payment_processor_name)
+    if payment_processor.type != PaymentProcessorTypes.Triggered:
+        return 0, []
+
+    options = get_execution_options(payment_processor_name)
+    if _uses_async_runner(payment_processor, options):
+        results = _run_concurrently(_execute_transaction_async, payment_processor_name,
+                                    payment_processor, transactions, options)
+
+        return _count_results(transactions, results)
+
+    batches = _split_in_batches(transactions, payment_processor.transactions_batch_size)
+
+    rate_limiter = get_rate_limiter(payment_processor_name, options)
+    execute_batch_kwargs = {
+        'rate_limiter': rate_limiter,
+        'max_retries': options['max_retries'],
+        'retry_backoff': options['retry_backoff']
+    }
+
+    if options['concurrency'] > 1:
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            batches_results = list(executor.map(
+                partial(_execute_batch_in_thread, payment_processor, **execute_batch_kwargs),
+                batches
+            ))
+    else:
+        batches_results = [_execute_batch(payment_processor, batch, **execute_batch_kwargs)
+                           for batch in batches]
+
+    executed_count = 0
+    failed_transaction_ids = []
+    for results in batches_results:
+        for transaction, result in results.items():
+            if result is False:
+                failed_transaction_ids.append(transaction.id)
+            else:
+                executed_count += 1
+
+    return executed_count, failed_transaction_ids
+
+
+def execute_transactions_in_batches(transaction_ids=None):
+    """
+    Executes the executable initial transactions, one payment processor after another.
+
+    :returns: the same kind of tuple as execute_processor_transactions, for all processors.
+    """
+
+    executed_count = 0
+    failed_transaction_ids = []
+
+    for payment_processor_name, transactions in executable_transactions_by_processor(
+        transaction_ids
+    ).items():
+        try:
+            processor_executed_count, processor_failed_ids = execute_processor_transactions(
+                payment_processor_name, transactions
+            )
+        except Exception:
+            logger.error('Encountered exception while executing the transactions of payment '
+                         'processor %s.', payment_processor_name, exc_info=True)
+            failed_transaction_ids.extend(transaction.id for transaction in transactions)
+            continue
+
+        executed_count += processor_executed_count
+        failed_transaction_ids.extend(processor_failed_ids)
+
+    return executed_count, failed_transaction_ids
+
+
+def fetch_processor_transactions_status(payment_processor_name, transactions):
+    """
+    Fetches the status of the given pending transactions of a payment processor, in batches of
+    at most `transactions_status_batch_size` transactions, using the processor's rate limit and
+    retry options.
+
+    :returns: a tuple consisting of the number of successfully updated transactions and the
+        list of ids of the transactions whose status couldn't be fetched.
+    """
+
+    payment_processor = get_instance(payment_processor_name)
+    if payment_processor.type != PaymentProcessorTypes.Triggered:
+        return 0, []
+
+    options = get_execution_options(payment_processor_name)
+    if _uses_async_runner(payment_processor, options):
+        results = _run_concurrently(_fetch_transaction_status_async, payment_processor_name,
+                                    payment_processor, transactions, options)
+        schedule_next_status_polls(transactions)
+
+        return _count_results(transactions, results)
+
+    rate_limiter = get_rate_limiter(payment_processor_name, options)
+
+    updated_count = 0
+    failed_transaction_ids = []
+    for batch in _split_in_batches(transactions, payment_processor.transactions_status_batch_size):
+        try:
+            results = _call_with_retries(payment_processor.fetch_transactions_status, batch,
+                                         rate_limiter, options['max_retries'],
+                                         options['retry_backoff'])
+        except TransientPaymentProcessorError as error:
+            logger.error('Giving up updating transactions with ids=%s after %d retries.',
+                         [transaction.id for transaction in batch
+                          if transaction not in error.results],
+                         options['max_retries'], exc_info=True)
+            results = error.results
+        except Exception:
+            for transaction in batch:
+                logger.error('Encountered exception while updating transaction '
+                             'with id=%s.', transaction.id, exc_info=True)
+            results = {}
+
+        schedule_next_status_polls(batch)
+
+        for transaction in batch:
+            if results.get(transaction, False) is False:
+                failed_transaction_ids.append(transaction.id)
+            else:
+                updated_count += 1
+
+    return updated_count, failed_transaction_ids
+
+
+def fetch_transactions_status_in_batches(transaction_ids=None):
+    """
+    Fetches the status of the pending transactions, one payment processor after another.
+
+    :returns: the same kind of tuple as fetch_processor_transactions_status, for all processors.
+    """
+
+    updated_count = 0
+    failed_transaction_ids = []
+
+    for payment_processor_name, transactions in pending_transactions_by_processor(
+        transaction_ids
+    ).items():
+        try:
+            processor_updated_count, processor_failed_ids = fetch_processor_transactions_status(
+                payment_processor_name, transactions
+            )
+        except Exception:
+            logger.error('Encountered exception while updating the transactions of payment '
+                         'processor %s.', payment_processor_name, exc_info=True)
+            failed_transaction_ids.extend(transaction.id for transaction in transactions)
+            continue
+
+        updated_count += processor_updated_count
+        failed_transaction_ids.extend(processor_failed_ids)
+
+    return updated_count, failed_transaction_ids
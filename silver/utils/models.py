@@ -15,6 +15,7 @@
 from __future__ import absolute_import
 
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
 
@@ -106,3 +107,64 @@ class AutoCleanModelMixin:
         super().full_clean(*args, **kwargs)
 
         self.is_cleaned = True
+
+
+class SubscriptionFiltersMixin:
+    """
+    For the models (discounts, bonuses) applying to the subscriptions matched by their
+    `filter_customers`, `filter_subscriptions`, `filter_plans` and `filter_product_codes`.
+    """
+
+    @classmethod
+    def for_subscriptions(cls, subscriptions):
+        """
+        Same as `for_subscription`, for many subscriptions at once: the objects which may apply
+        to any of them are fetched along with their filters, and then matched against each
+        subscription. The subscriptions' plans should come with their metered features.
+
+        Returns a dict mapping the subscriptions' ids to their (distinct) objects.
+        """
+        subscriptions = list(subscriptions)
+        if not subscriptions:
+            return {}
+
+        subscriptions_product_codes = {
+            subscription.pk: {subscription.plan.product_code_id}.union(
+                metered_feature.product_code_id
+                for metered_feature in subscription.plan.metered_features.all()
+            )
+            for subscription in subscriptions
+        }
+
+        objects = cls.objects.filter(
+            Q(filter_customers__in={subscription.customer_id for subscription in subscriptions}) |
+            Q(filter_customers=None),
+            Q(filter_subscriptions__in=subscriptions) | Q(filter_subscriptions=None),
+            Q(filter_plans__in={subscription.plan_id for subscription in subscriptions}) |
+            Q(filter_plans=None),
+            Q(filter_product_codes__in=set.union(*subscriptions_product_codes.values())) |
+            Q(filter_product_codes=None),
+        ).distinct().order_by('pk').select_related('product_code').prefetch_related(
+            'filter_customers', 'filter_subscriptions', 'filter_plans', 'filter_product_codes'
+        )
+
+        objects_filters = [
+            (obj, [
+                {related.pk for related in related_objects.all()}
+                for related_objects in (obj.filter_customers, obj.filter_subscriptions,
+                                        obj.filter_plans, obj.filter_product_codes)
+            ])
+            for obj in objects
+        ]
+
+        return {
+            subscription.pk: [
+                obj for obj, filters in objects_filters
+                if all(not filter_ids or not filter_ids.isdisjoint(ids)
+                       for filter_ids, ids in zip(filters, (
+                           {subscription.customer_id}, {subscription.pk}, {subscription.plan_id},
+                           subscriptions_product_codes[subscription.pk]
+                       )))
+            ]
+            for subscription in subscriptions
+        }
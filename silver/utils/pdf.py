@@ -15,8 +15,11 @@
 from __future__ import absolute_import
 
 import os
+from functools import lru_cache
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 
 class UnsupportedMediaPathException(Exception):
@@ -29,6 +32,15 @@ def fetch_resources(uri, rel):
     `uri` is the href attribute from the html link element.
     `rel` gives a relative path, but it's not used here.
     """
+    return resolve_resource_path(uri)
+
+
+@lru_cache(maxsize=256)
+def resolve_resource_path(uri):
+    """
+    Translates a resource uri to the path it's served from. The results are cached, so the
+    STATICFILES_DIRS aren't probed again for every document.
+    """
     if settings.MEDIA_URL and uri.startswith(settings.MEDIA_URL):
         path = os.path.join(settings.MEDIA_ROOT,
                             uri.replace(settings.MEDIA_URL, ""))
@@ -47,3 +59,9 @@ def fetch_resources(uri, rel):
             settings.MEDIA_URL, settings.STATIC_URL))
 
     return path
+
+
+@receiver(setting_changed)
+def clear_resource_paths_cache(setting, **kwargs):
+    if setting in ('MEDIA_URL', 'MEDIA_ROOT', 'STATIC_URL', 'STATIC_ROOT', 'STATICFILES_DIRS'):
+        resolve_resource_path.cache_clear()